@@ -1,7 +1,14 @@
-import camelot
-import pandas as pd
-import re
+import argparse
+import functools
+import hashlib
+import importlib.metadata
+import json
 import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
@@ -32,6 +39,18 @@ ESCRITORIOS_EMATER_DF = sorted([
     "TAQUARA", "VARGEM BONITA", "DISTRITO FEDERAL",
 ])
 
+# Páginas das tabelas de cada seção no RIA 2024 (outros anos podem usar outras páginas)
+SECOES_RIA = {"Olericultura": "8-9", "Fruticultura": "11-13"}
+
+# Parâmetros do camelot por flavor (fazem parte da chave do cache)
+PARAMETROS_CAMELOT = {
+    "lattice": {"line_scale": 30, "strip_text": "\n"},
+    "stream": {"edge_tol": 500, "row_tol": 10},
+}
+
+# Tabelas já extraídas (JSON por PDF, página e flavor)
+DIRETORIO_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache_camelot")
+
 def limpar_valor(valor):
     """Converte string de valor para float, tratando formatos brasileiros."""
     if valor is None or str(valor).strip() in ("", "-"):
@@ -49,37 +68,125 @@ def normalizar_nome_cultura(nome):
     nome = re.sub(r"\s*\(.*\)", "", nome).strip().capitalize()
     return nome
 
-def processar_tabelas_emater(pdf_path, paginas_str, tipo_dados):
-    """Extrai dados das tabelas da EMATER-DF para Olericultura ou Fruticultura."""
-    dados_secao = {esc: {} for esc in ESCRITORIOS_EMATER_DF if esc != "DISTRITO FEDERAL"}
-    dados_secao["TOTAL_DF"] = {}
+def paginas_do_intervalo(paginas_str):
+    """Lista de páginas de um intervalo no formato do camelot (ex: "8-9,11" -> [8, 9, 11])."""
+    paginas = []
+    for parte in paginas_str.split(","):
+        inicio, _, fim = parte.strip().partition("-")
+        paginas.extend(range(int(inicio), int(fim or inicio) + 1))
+    return paginas
+
+def hash_arquivo(caminho):
+    """SHA-256 do conteúdo do arquivo (a chave do cache não depende do nome nem da data do PDF)."""
+    h = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+@functools.lru_cache(maxsize=None)
+def versao_camelot():
+    """Versão instalada do camelot (parte da chave do cache: outra versão lê as páginas de novo)."""
+    try:
+        return importlib.metadata.version("camelot-py")
+    except importlib.metadata.PackageNotFoundError:
+        return "ausente"
+
+def _caminho_cache(diretorio_cache, hash_pdf, pagina, flavor):
+    parametros = hashlib.sha256(json.dumps(PARAMETROS_CAMELOT[flavor], sort_keys=True).encode()).hexdigest()[:8]
+    return os.path.join(diretorio_cache, f"{hash_pdf[:16]}_p{pagina}_{flavor}_{parametros}_camelot{versao_camelot()}.json")
+
+def _ler_cache(diretorio_cache, hash_pdf, pagina, flavor):
+    if not diretorio_cache:
+        return None
     try:
-        tables = camelot.read_pdf(pdf_path, pages=paginas_str, flavor="lattice", line_scale=30, strip_text="\n")
-    except Exception as e:
-        logging.warning(f"Erro ao ler PDF (lattice): {e}. Tentando 'stream'.")
+        with open(_caminho_cache(diretorio_cache, hash_pdf, pagina, flavor), encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+def _gravar_cache(diretorio_cache, hash_pdf, pagina, flavor, entrada):
+    if not diretorio_cache:
+        return
+    os.makedirs(diretorio_cache, exist_ok=True)
+    caminho = _caminho_cache(diretorio_cache, hash_pdf, pagina, flavor)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(entrada, arquivo, ensure_ascii=False)
+    os.replace(temporario, caminho)  # gravação atômica: processos paralelos nunca leem um arquivo pela metade
+
+def _ler_tabelas_camelot(pdf_path, pagina, flavor):
+    import camelot  # importado no processo que faz a leitura
+    tabelas = camelot.read_pdf(pdf_path, pages=str(pagina), flavor=flavor, **PARAMETROS_CAMELOT[flavor])
+    return [tabela.df.values.tolist() for tabela in tabelas]
+
+def extrair_pagina(pdf_path, hash_pdf, pagina, diretorio_cache=DIRETORIO_CACHE):
+    """
+    Tabelas de uma página como listas de linhas (listas de textos): 'lattice' ou, se ele
+    falhar, 'stream'. Cada resultado (inclusive a falha do lattice) fica em cache, indexado
+    pelo hash do PDF, página, flavor e versão do camelot; páginas já lidas não são processadas
+    de novo. Erros do ambiente (camelot ausente, Ghostscript, leitura do arquivo: ImportError
+    e OSError) não são do PDF: são propagados e nunca vão para o cache.
+    """
+    entrada = _ler_cache(diretorio_cache, hash_pdf, pagina, "lattice")
+    if entrada is None:
         try:
-            tables = camelot.read_pdf(pdf_path, pages=paginas_str, flavor="stream", edge_tol=500, row_tol=10)
+            entrada = {"tabelas": _ler_tabelas_camelot(pdf_path, pagina, "lattice"), "erro": None}
+        except (ImportError, OSError):
+            raise
+        except Exception as e:
+            entrada = {"tabelas": None, "erro": str(e)}
+        _gravar_cache(diretorio_cache, hash_pdf, pagina, "lattice", entrada)
+    if entrada["erro"] is None:
+        return entrada["tabelas"]
+
+    logging.warning(f"Erro ao ler a página {pagina} de {pdf_path} (lattice): {entrada['erro']}. Tentando 'stream'.")
+    entrada = _ler_cache(diretorio_cache, hash_pdf, pagina, "stream")
+    if entrada is None:
+        try:
+            entrada = {"tabelas": _ler_tabelas_camelot(pdf_path, pagina, "stream"), "erro": None}
+        except (ImportError, OSError):
+            raise
         except Exception as e2:
-            logging.error(f"Erro ao ler PDF (stream): {e2}")
-            return dados_secao
+            # Falhas do stream não vão para o cache: a próxima execução tenta de novo
+            logging.error(f"Erro ao ler a página {pagina} de {pdf_path} (stream): {e2}")
+            return []
+        _gravar_cache(diretorio_cache, hash_pdf, pagina, "stream", entrada)
+    return entrada["tabelas"]
 
+def extrair_paginas(tarefas, executor=None, diretorio_cache=DIRETORIO_CACHE):
+    """
+    Executa `extrair_pagina` para cada (pdf_path, hash_pdf, pagina) de `tarefas`, em paralelo
+    no `executor` (um pool de processos) se informado. Retorna {(pdf_path, pagina): tabelas}.
+    """
+    tarefas = list(tarefas)
+    if executor is None:
+        resultados = [extrair_pagina(pdf, h, pagina, diretorio_cache) for pdf, h, pagina in tarefas]
+    else:
+        futuros = [executor.submit(extrair_pagina, pdf, h, pagina, diretorio_cache) for pdf, h, pagina in tarefas]
+        resultados = [futuro.result() for futuro in futuros]
+    return {(pdf, pagina): tabelas for (pdf, _, pagina), tabelas in zip(tarefas, resultados)}
+
+def agregar_tabelas_emater(tabelas):
+    """Agrega as linhas das tabelas (na ordem das páginas) por escritório e cultura."""
+    dados_secao = {esc: {} for esc in ESCRITORIOS_EMATER_DF if esc != "DISTRITO FEDERAL"}
+    dados_secao["TOTAL_DF"] = {}
     escritorio_atual = None
-    for table in tables:
-        df = table.df
-        for _, row in df.iterrows():
-            primeira_coluna = str(row.iloc[0]).strip().upper()
+    for linhas in tabelas:
+        for row in linhas:
+            primeira_coluna = str(row[0]).strip().upper()
             if primeira_coluna in ESCRITORIOS_EMATER_DF:
                 escritorio_atual = primeira_coluna
                 continue
             if not escritorio_atual:
                 continue
-            nome_cultura = row.iloc[0] or row.iloc[1] if len(row) > 1 else ""
+            nome_cultura = row[0] or row[1] if len(row) > 1 else ""
             nome_cultura = normalizar_nome_cultura(str(nome_cultura))
             if nome_cultura not in CULTURAS_ALVO_PROJETO:
                 continue
             if len(row) > 5:
-                area_ha = limpar_valor(row.iloc[3])
-                producao_t = limpar_valor(row.iloc[5])
+                area_ha = limpar_valor(row[3])
+                producao_t = limpar_valor(row[5])
                 destino = dados_secao["TOTAL_DF"] if escritorio_atual == "DISTRITO FEDERAL" else dados_secao[escritorio_atual]
                 if nome_cultura not in destino:
                     destino[nome_cultura] = {"producao_t": 0.0, "area_ha": 0.0}
@@ -87,6 +194,38 @@ def processar_tabelas_emater(pdf_path, paginas_str, tipo_dados):
                 destino[nome_cultura]["area_ha"] += area_ha
     return dados_secao
 
+def processar_tabelas_emater(pdf_path, paginas_str, tipo_dados, executor=None, diretorio_cache=DIRETORIO_CACHE):
+    """Extrai dados das tabelas da EMATER-DF para Olericultura ou Fruticultura."""
+    hash_pdf = hash_arquivo(pdf_path)
+    paginas = paginas_do_intervalo(paginas_str)
+    tabelas_por_pagina = extrair_paginas([(pdf_path, hash_pdf, p) for p in paginas], executor, diretorio_cache)
+    logging.info(f"{tipo_dados}: páginas {paginas_str} de {pdf_path} lidas.")
+    return agregar_tabelas_emater(tabela for p in paginas for tabela in tabelas_por_pagina[(pdf_path, p)])
+
+def processar_relatorios(relatorios, executor=None, diretorio_cache=DIRETORIO_CACHE):
+    """
+    Modo multi-ano: `relatorios` = {ano: (pdf_path, secoes)}, com `secoes` = {tipo_dados: paginas_str}.
+    As páginas de todos os relatórios são lidas ao mesmo tempo no `executor`.
+    Retorna {ano: dados combinados no formato de `combinar_dados`}.
+    """
+    hashes = {pdf_path: hash_arquivo(pdf_path) for pdf_path, _ in relatorios.values()}
+    paginas = {
+        ano: {tipo: paginas_do_intervalo(paginas_str) for tipo, paginas_str in secoes.items()}
+        for ano, (_, secoes) in relatorios.items()
+    }
+    tarefas = {
+        (pdf_path, hashes[pdf_path], p)
+        for ano, (pdf_path, _) in relatorios.items() for paginas_secao in paginas[ano].values() for p in paginas_secao
+    }
+    tabelas_por_pagina = extrair_paginas(sorted(tarefas), executor, diretorio_cache)
+    return {
+        ano: combinar_dados(*[
+            agregar_tabelas_emater(tabela for p in paginas_secao for tabela in tabelas_por_pagina[(pdf_path, p)])
+            for paginas_secao in paginas[ano].values()
+        ])
+        for ano, (pdf_path, _) in relatorios.items()
+    }
+
 def combinar_dados(*secoes):
     """Combina os dados de várias seções em um único dicionário."""
     emater_data_final = {esc: {} for esc in ESCRITORIOS_EMATER_DF if esc != "DISTRITO FEDERAL"}
@@ -118,12 +257,53 @@ def exportar_para_csv(emater_data_final, filename="emater_data_final.csv"):
     logging.info(f"Arquivo '{filename}' salvo com sucesso!")
     return df
 
-if __name__ == "__main__":
-    pdf_path = "2024_Relatorio_Informacoes_Agropecuaria_RIA____DF.pdf"
-    dados_olericultura = processar_tabelas_emater(pdf_path, "8-9", "Olericultura")
-    dados_fruticultura = processar_tabelas_emater(pdf_path, "11-13", "Fruticultura")
-    emater_data_final = combinar_dados(dados_olericultura, dados_fruticultura)
-    df_final = exportar_para_csv(emater_data_final)
+def exportar_anos_para_csv(dados_por_ano, filename="emater_producao_anos.csv"):
+    """Exporta o modo multi-ano em uma única tabela no formato de `producao_emater` (com o ano)."""
+    registros = [
+        {"ano": ano, "regiao": esc, "produto": cultura, "area_ha": valores["area_ha"], "producao_t": valores["producao_t"]}
+        for ano, dados in dados_por_ano.items()
+        for esc, culturas in dados.items()
+        for cultura, valores in culturas.items()
+    ]
+    df = pd.DataFrame(registros, columns=["ano", "regiao", "produto", "area_ha", "producao_t"])
+    df = df.sort_values(by=["ano", "regiao", "produto"])
+    df.to_csv(filename, index=False, encoding="utf-8-sig")
+    logging.info(f"Arquivo '{filename}' salvo com sucesso!")
+    return df
+
+def ler_especificacao_relatorio(especificacao):
+    """
+    "relatorio.pdf" (páginas de SECOES_RIA) ou "relatorio.pdf@8-9@11-13" (páginas de
+    Olericultura e Fruticultura desse relatório). O ano vem do nome do arquivo.
+    """
+    pdf_path, *paginas = especificacao.split("@")
+    secoes = dict(zip(SECOES_RIA, paginas)) if paginas else dict(SECOES_RIA)
+    ano = re.search(r"(19|20)\d{2}", os.path.basename(pdf_path))
+    return (int(ano.group()) if ano else os.path.splitext(os.path.basename(pdf_path))[0]), (pdf_path, secoes)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extrai as tabelas de produção dos relatórios RIA da EMATER-DF.")
+    parser.add_argument("--relatorios", nargs="+",
+                        help="Modo multi-ano: relatórios RIA (\"arquivo.pdf\" ou \"arquivo.pdf@8-9@11-13\")")
+    parser.add_argument("--trabalhadores", type=int, default=os.cpu_count(), help="Processos para ler as páginas")
+    parser.add_argument("--cache", default=DIRETORIO_CACHE, help="Diretório do cache de tabelas")
+    parser.add_argument("--sem-cache", action="store_true", help="Não lê nem grava o cache")
+    parser.add_argument("--saida", help="Arquivo CSV de saída")
+    args = parser.parse_args(argv)
+    diretorio_cache = None if args.sem_cache else args.cache
+
+    with ProcessPoolExecutor(max_workers=args.trabalhadores) as executor:
+        if args.relatorios:
+            relatorios = dict(ler_especificacao_relatorio(especificacao) for especificacao in args.relatorios)
+            dados_por_ano = processar_relatorios(relatorios, executor, diretorio_cache)
+            df_anos = exportar_anos_para_csv(dados_por_ano, args.saida or "emater_producao_anos.csv")
+            print(df_anos.groupby("ano").size().to_string())
+            return
+
+        # As páginas de Olericultura e Fruticultura são lidas ao mesmo tempo
+        pdf_path = "2024_Relatorio_Informacoes_Agropecuaria_RIA____DF.pdf"
+        emater_data_final = processar_relatorios({2024: (pdf_path, SECOES_RIA)}, executor, diretorio_cache)[2024]
+    df_final = exportar_para_csv(emater_data_final, args.saida or "emater_data_final.csv")
     print(df_final.head(20).to_string(index=False))
     print("\n--- Culturas em Brazlândia ---")
     print(df_final[df_final["escritorio"].str.upper() == "BRAZLÂNDIA"].to_string(index=False))
@@ -132,3 +312,6 @@ if __name__ == "__main__":
         print("\nTomate no TOTAL_DF:", tomate_total_df.to_string(index=False))
     else:
         print("\nDados de Tomate no TOTAL_DF não encontrados.")
+
+if __name__ == "__main__":
+    main()
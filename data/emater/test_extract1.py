@@ -0,0 +1,99 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import extract1
+from extract1 import (
+    agregar_tabelas_emater, combinar_dados, extrair_pagina, extrair_paginas, ler_especificacao_relatorio,
+    limpar_valor, normalizar_nome_cultura, paginas_do_intervalo,
+)
+
+TABELA = [
+    ["BRAZLÂNDIA", "", "", "", "", ""],
+    ["TOMATE (MESA)", "", "", "1.234,5", "", "10,0"],
+    ["Alface (crespa)", "", "", "2", "", "3"],
+    ["Soja", "", "", "9", "", "9"],
+    ["DISTRITO FEDERAL", "", "", "", "", ""],
+    ["Tomate", "", "", "-", "", "7"],
+]
+
+
+def test_valores_nomes_e_paginas():
+    assert limpar_valor("1.234,5") == 1234.5
+    assert limpar_valor("-") == limpar_valor(None) == limpar_valor("n/d") == 0.0
+    assert normalizar_nome_cultura(" banana prata ") == "Banana"
+    assert normalizar_nome_cultura("Quiabo (verde)") == "Quiabo"
+    assert paginas_do_intervalo("8-9, 11") == [8, 9, 11]
+    assert ler_especificacao_relatorio("dir/RIA_2023.pdf@5-6@7") == (2023, ("dir/RIA_2023.pdf", {"Olericultura": "5-6", "Fruticultura": "7"}))
+
+
+def test_agregacao_por_escritorio():
+    dados = agregar_tabelas_emater([TABELA, [["Tomate", "", "", "1", "", "2"]]])
+    assert dados["BRAZLÂNDIA"] == {"Tomate": {"producao_t": 10.0, "area_ha": 1234.5},
+                                   "Alface": {"producao_t": 3.0, "area_ha": 2.0}}
+    # O escritório atual (DISTRITO FEDERAL) continua na tabela seguinte
+    assert dados["TOTAL_DF"] == {"Tomate": {"producao_t": 9.0, "area_ha": 1.0}}
+    combinados = combinar_dados(dados, dados)
+    assert combinados["TOTAL_DF"]["Tomate"]["producao_t"] == 18.0 and "GAMA" not in combinados
+
+
+def test_cache_e_fallback_para_stream(tmp_path, monkeypatch):
+    chamadas = []
+
+    def ler_tabelas(pdf_path, pagina, flavor):
+        chamadas.append((pagina, flavor))
+        if flavor == "lattice" and pagina == 2:
+            raise RuntimeError("sem linhas")
+        return [[[f"{flavor}-{pagina}"]]]
+
+    monkeypatch.setattr(extract1, "_ler_tabelas_camelot", ler_tabelas)
+    assert extrair_pagina("a.pdf", "h" * 64, 1, tmp_path) == [[["lattice-1"]]]
+    assert extrair_pagina("a.pdf", "h" * 64, 2, tmp_path) == [[["stream-2"]]]
+    assert chamadas == [(1, "lattice"), (2, "lattice"), (2, "stream")]
+
+    # Segunda execução: tudo vem do cache (inclusive a falha do lattice)
+    tarefas = [("a.pdf", "h" * 64, pagina) for pagina in (1, 2, 3)]
+    with ThreadPoolExecutor(2) as executor:
+        paralelo = extrair_paginas(tarefas, executor, tmp_path)
+    assert chamadas[3:] == [(3, "lattice")]
+    assert paralelo == extrair_paginas(tarefas, None, tmp_path) == {
+        ("a.pdf", 1): [[["lattice-1"]]], ("a.pdf", 2): [[["stream-2"]]], ("a.pdf", 3): [[["lattice-3"]]],
+    }
+    # Sem diretório de cache, as páginas são lidas de novo
+    extrair_pagina("a.pdf", "h" * 64, 1, None)
+    assert chamadas[-1] == (1, "lattice")
+
+
+def test_erros_do_ambiente_nao_vao_para_o_cache(tmp_path, monkeypatch):
+    def sem_camelot(pdf_path, pagina, flavor):
+        raise ImportError("No module named 'camelot'")
+
+    monkeypatch.setattr(extract1, "_ler_tabelas_camelot", sem_camelot)
+    with pytest.raises(ImportError):
+        extrair_pagina("a.pdf", "h" * 64, 1, tmp_path)
+    assert not any(tmp_path.iterdir())
+
+    # Lattice falhou no PDF (em cache), mas o stream encontra um erro do ambiente: nada dele é gravado
+    def stream_sem_ghostscript(pdf_path, pagina, flavor):
+        if flavor == "lattice":
+            raise RuntimeError("sem linhas")
+        raise OSError("Ghostscript não encontrado")
+
+    monkeypatch.setattr(extract1, "_ler_tabelas_camelot", stream_sem_ghostscript)
+    with pytest.raises(OSError):
+        extrair_pagina("a.pdf", "h" * 64, 1, tmp_path)
+    assert [caminho.name.split("_")[2] for caminho in tmp_path.iterdir()] == ["lattice"]
+
+    # Com o camelot instalado, a página é lida de novo
+    monkeypatch.setattr(extract1, "_ler_tabelas_camelot", lambda pdf_path, pagina, flavor: [[[flavor]]])
+    assert extrair_pagina("a.pdf", "h" * 64, 2, tmp_path) == [[["lattice"]]]
+
+
+def test_versao_do_camelot_na_chave_do_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(extract1, "_ler_tabelas_camelot", lambda pdf_path, pagina, flavor: [[[flavor]]])
+    monkeypatch.setattr(extract1, "versao_camelot", lambda: "0.11.0")
+    extrair_pagina("a.pdf", "h" * 64, 1, tmp_path)
+    monkeypatch.setattr(extract1, "versao_camelot", lambda: "1.0.0")
+    monkeypatch.setattr(extract1, "_ler_tabelas_camelot", lambda pdf_path, pagina, flavor: [[["nova"]]])
+    assert extrair_pagina("a.pdf", "h" * 64, 1, tmp_path) == [[["nova"]]]
+    assert sorted(caminho.name.rsplit("_", 1)[1] for caminho in tmp_path.iterdir()) == ["camelot0.11.0.json", "camelot1.0.0.json"]
@@ -0,0 +1,116 @@
+"""
+Extração do Calendário de Comercialização da CEASA-DF (`sazonalidade.pdf`) para uma tabela
+produto x mês.
+
+No PDF, a intensidade da comercialização de cada mês não é texto: é a cor de fundo das
+células (uma faixa colorida pode cobrir vários meses). As cores são lidas da legenda
+(retângulo ao lado de FORTE, REGULAR e FRACA); cada mês de um produto recebe a intensidade
+do retângulo colorido, na altura da linha do produto, que contém o centro da coluna do mês.
+O resultado tem `produto` (nome do calendário, com as abreviações expandidas) e uma coluna
+por mês (`jan` ... `dez`) com 'forte', 'regular' ou 'fraca'.
+
+Uso: python extrair_sazonalidade.py [--pdf sazonalidade.pdf] [--saida sazonalidade.csv]
+"""
+import argparse
+import logging
+import os
+
+import pandas as pd
+import pdfplumber
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+ARQUIVO_PDF = "sazonalidade.pdf"
+ARQUIVO_SAIDA = "sazonalidade.csv"
+
+MESES = ["jan", "fev", "mar", "abr", "mai", "jun", "jul", "ago", "set", "out", "nov", "dez"]
+INTENSIDADES_LEGENDA = {"FORTE": "forte", "REGULAR": "regular", "FRACA": "fraca"}
+
+# Nomes do calendário reescritos como nos demais documentos (ver MAPEAMENTO_PRODUTOS em recomendador.dados)
+NOMES_PRODUTOS = {
+    "Ab. Japonesa": "Abóbora Japonesa",
+    "Ab. Italiana": "Abobrinha Italiana",
+    "Couve-flor": "Couve-Flor",
+    "Milho verde": "Milho Verde",
+    "Batata doce": "Batata Doce",
+    "Laranja Pera": "Laranja Pera",
+    "Mamão formosa": "Mamão",
+}
+
+
+def _cor(retangulo):
+    cor = retangulo.get("non_stroking_color")
+    if isinstance(cor, (list, tuple)):
+        return tuple(round(float(componente), 3) for componente in cor)
+    return cor
+
+
+def _linhas_palavras(palavras):
+    """Agrupa palavras com o mesmo `top` (arredondado) em linhas: [(top, bottom, texto, x0)]."""
+    linhas = {}
+    for palavra in palavras:
+        linhas.setdefault(round(palavra["top"]), []).append(palavra)
+    return [
+        (min(p["top"] for p in ps), max(p["bottom"] for p in ps), " ".join(p["text"] for p in sorted(ps, key=lambda p: p["x0"])),
+         min(p["x0"] for p in ps))
+        for _, ps in sorted(linhas.items())
+    ]
+
+
+def extrair_calendario(pdf_path):
+    """Lê o calendário do PDF e retorna o DataFrame produto x mês (ver a descrição do módulo)."""
+    with pdfplumber.open(pdf_path) as pdf:
+        pagina = pdf.pages[0]
+        palavras = pagina.extract_words()
+        retangulos = [r for r in pagina.rects if r.get("fill")]
+
+    # Cabeçalho: centro horizontal de cada mês; as linhas dos produtos ficam entre ele e a legenda
+    cabecalho = next(p for p in palavras if p["text"] == "PRODUTO")
+    meses = {p["text"]: (p["x0"] + p["x1"]) / 2 for p in palavras if p["text"] in MESES and abs(p["top"] - cabecalho["top"]) < 5}
+    centros_meses = [meses[mes] for mes in MESES]
+    inicio_meses = min(p["x0"] for p in palavras if p["text"] == MESES[0] and abs(p["top"] - cabecalho["top"]) < 5)
+    topo_legenda = next(p for p in palavras if p["text"] == "INTENSIDADE")["top"]
+
+    # Legenda: cor do retângulo na altura de cada intensidade
+    cores = {}
+    for palavra in palavras:
+        if palavra["text"] in INTENSIDADES_LEGENDA and palavra["top"] > topo_legenda:
+            meio = (palavra["top"] + palavra["bottom"]) / 2
+            for retangulo in retangulos:
+                if retangulo["top"] <= meio <= retangulo["bottom"] and isinstance(_cor(retangulo), tuple):
+                    cores[_cor(retangulo)] = INTENSIDADES_LEGENDA[palavra["text"]]
+                    break
+
+    linhas = []
+    palavras_produtos = [p for p in palavras if cabecalho["bottom"] < p["top"] < topo_legenda and p["x1"] < inicio_meses]
+    for topo, base, produto, _ in _linhas_palavras(palavras_produtos):
+        meio = (topo + base) / 2
+        intensidades = [None] * len(MESES)
+        for retangulo in retangulos:
+            intensidade = cores.get(_cor(retangulo))
+            if intensidade is None or not retangulo["top"] <= meio <= retangulo["bottom"]:
+                continue
+            for i, centro in enumerate(centros_meses):
+                if retangulo["x0"] <= centro <= retangulo["x1"]:
+                    intensidades[i] = intensidade
+        linhas.append([NOMES_PRODUTOS.get(produto, produto), *intensidades])
+    return pd.DataFrame(linhas, columns=["produto", *MESES])
+
+
+def main(argv=None):
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Extrai o calendário de comercialização (sazonalidade) da CEASA-DF do PDF.")
+    parser.add_argument("--pdf", default=os.path.join(diretorio, ARQUIVO_PDF))
+    parser.add_argument("--saida", default=os.path.join(diretorio, ARQUIVO_SAIDA), help="CSV de saída")
+    args = parser.parse_args(argv)
+
+    calendario = extrair_calendario(args.pdf)
+    sem_intensidade = calendario[calendario[MESES].isna().any(axis=1)]["produto"].tolist()
+    if sem_intensidade:
+        logging.warning(f"Meses sem intensidade em: {sem_intensidade}")
+    calendario.to_csv(args.saida, index=False, encoding="utf-8")
+    logging.info(f"{len(calendario)} produtos -> {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Extração das tabelas de composição da TACO (4ª edição) direto do PDF, sem passar pelo
+dump bruto (`taco_nutritional_data.csv`, cheio de sequências "(cid:NN)").
+
+Cada tabela ocupa pares de páginas: a da esquerda traz número, descrição e as primeiras
+colunas; a da direita, o número e as colunas restantes. As páginas são lidas em paralelo
+(pool de processos, pdfplumber) e entregues em ordem por um gerador; os valores
+de cada linha são atribuídos à coluna cuja unidade no cabeçalho ("(g)", "(mg)", ...) está
+mais próxima na horizontal, o que preserva as células vazias. O resultado é uma tabela
+tipada por tabela da TACO: `numero` (int), `grupo`, `descricao` e colunas numéricas
+(float, com "Tr" = 0.0 e "NA"/"*"/vazio = NaN).
+
+Uso: python extrair_tabelas.py [--pdf taco.pdf] [--tabelas 1 2 3] [--trabalhadores N]
+"""
+import argparse
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+ARQUIVO_PDF = "taco_4_edicao_ampliada_e_revisada.pdf"
+
+# Colunas de cada tabela: (página da esquerda, página da direita), na ordem do cabeçalho
+COLUNAS_TABELAS = {
+    1: (
+        ["umidade", "energia_kcal", "energia_kj", "proteina_g", "lipidios_g", "colesterol_mg",
+         "carboidratos_g", "fibra_g", "cinzas_g", "calcio_mg", "magnesio_mg"],
+        ["manganes_mg", "fosforo_mg", "ferro_mg", "sodio_mg", "potassio_mg", "cobre_mg", "zinco_mg",
+         "retinol_ug", "re_ug", "rae_ug", "tiamina_mg", "riboflavina_mg", "piridoxina_mg", "niacina_mg",
+         "vitamina_c_mg"],
+    ),
+    2: (
+        ["saturados_g", "monoinsaturados_g", "poliinsaturados_g", "ag_12_0_g", "ag_14_0_g", "ag_16_0_g",
+         "ag_18_0_g", "ag_20_0_g", "ag_22_0_g", "ag_24_0_g"],
+        ["ag_14_1_g", "ag_16_1_g", "ag_18_1_g", "ag_20_1_g", "ag_18_2_n6_g", "ag_18_3_n3_g", "ag_20_4_g",
+         "ag_20_5_g", "ag_22_5_g", "ag_22_6_g", "ag_18_1t_g", "ag_18_2t_g"],
+    ),
+    3: (
+        ["triptofano_g", "treonina_g", "isoleucina_g", "leucina_g", "lisina_g", "metionina_g", "cistina_g",
+         "fenilalanina_g", "tirosina_g"],
+        ["valina_g", "arginina_g", "histidina_g", "alanina_g", "acido_aspartico_g", "acido_glutamico_g",
+         "glicina_g", "prolina_g", "serina_g"],
+    ),
+}
+
+ARQUIVOS_SAIDA = {
+    1: "taco_tabela1_composicao.csv",
+    2: "taco_tabela2_acidos_graxos.csv",
+    3: "taco_tabela3_aminoacidos.csv",
+}
+
+# Valores não numéricos das tabelas: traço (abaixo do limite de quantificação) e ausentes
+VALORES_ESPECIAIS = {"Tr": 0.0, "NA": float("nan"), "*": float("nan"), "-": float("nan")}
+
+RE_CID = re.compile(r"\(cid:(\d+)\)")
+RE_TITULO = re.compile(r"^Tabela (\d+)\.")
+RE_UNIDADE = re.compile(r"^\(.+\)$")
+# Chamadas de nota coladas aos valores ("74b": valor retirado de outra fonte)
+RE_NOTA = re.compile(r"(?<=\d)[a-z*†]+$")
+
+# Distância vertical (pt) até a qual palavras são consideradas da mesma linha
+TOLERANCIA_LINHA = 3.0
+
+
+def decodificar_cid(texto):
+    """Troca as sequências "(cid:NN)" pelo caractere de código NN ("(cid:84)(cid:97)" -> "Ta")."""
+    return RE_CID.sub(lambda m: chr(int(m.group(1))), texto)
+
+
+def converter_valor(texto):
+    """Valor numérico de uma célula: decimal brasileiro ("1.505,2" -> 1505.2), "Tr" -> 0.0, "NA" -> NaN."""
+    texto = RE_NOTA.sub("", texto.strip())
+    if texto in VALORES_ESPECIAIS:
+        return VALORES_ESPECIAIS[texto]
+    try:
+        return float(texto.replace(".", "").replace(",", "."))
+    except ValueError:
+        logging.warning(f"Valor não numérico na TACO: {texto!r}")
+        return float("nan")
+
+
+def agrupar_linhas(palavras):
+    """Agrupa as palavras (dicionários do pdfplumber) em linhas, de cima para baixo e da esquerda para a direita."""
+    linhas = []
+    for palavra in sorted(palavras, key=lambda p: (p["top"], p["x0"])):
+        if linhas and abs(palavra["top"] - linhas[-1][0]["top"]) <= TOLERANCIA_LINHA:
+            linhas[-1].append(palavra)
+        else:
+            linhas.append([palavra])
+    return [sorted(linha, key=lambda p: p["x0"]) for linha in linhas]
+
+
+def _centro(palavra):
+    return (palavra["x0"] + palavra["x1"]) / 2
+
+
+def interpretar_pagina(palavras, pagina):
+    """
+    Linhas de dados de uma página de tabela, a partir das palavras com posição. Retorna None se
+    a página não é de tabela; senão um dicionário com `tabela`, `lado` ('esquerda'/'direita'),
+    `pagina` e `linhas`: (número, grupo ou None, descrição ou None, valores por coluna).
+    """
+    linhas = agrupar_linhas([dict(p, text=decodificar_cid(p["text"])) for p in palavras])
+    if not linhas:
+        return None
+    titulo = RE_TITULO.match(" ".join(p["text"] for p in linhas[0]))
+    if titulo is None or int(titulo.group(1)) not in COLUNAS_TABELAS:
+        return None
+    tabela = int(titulo.group(1))
+
+    # Linha das unidades ("Alimento ... (g) (mg) ..."): âncoras horizontais das colunas numéricas
+    for i, linha in enumerate(linhas):
+        unidades = [p for p in linha if RE_UNIDADE.match(p["text"])]
+        if linha[0]["text"] == "Alimento" and unidades:
+            break
+    else:
+        logging.warning(f"Página {pagina}: cabeçalho da Tabela {tabela} não encontrado.")
+        return None
+    coluna_numero = linha[0]
+    cabecalho = " ".join(p["text"] for l in linhas[:i + 1] for p in l)
+    lado = "esquerda" if "Descrição" in cabecalho else "direita"
+    colunas = COLUNAS_TABELAS[tabela][0 if lado == "esquerda" else 1]
+    ancoras = [_centro(p) for p in unidades]
+    if len(ancoras) != len(colunas):
+        logging.warning(f"Página {pagina}: {len(ancoras)} colunas no cabeçalho, esperadas {len(colunas)}.")
+        return None
+    # Palavras à esquerda deste limite são número/descrição; à direita, valores
+    limite_valores = ancoras[0] - (ancoras[1] - ancoras[0]) / 2
+
+    grupo = None
+    dados = []
+    for linha in linhas[i + 1:]:
+        primeira = linha[0]
+        eh_numero = (
+            re.fullmatch(r"\d+", primeira["text"]) is not None
+            and coluna_numero["x0"] - 10 <= _centro(primeira) <= coluna_numero["x1"] + 10
+            and len(linha) > 1
+        )
+        if not eh_numero:
+            # Título de grupo ("Cereais e derivados"): texto na margem, sem valores
+            if lado == "esquerda" and all(p["x1"] < limite_valores for p in linha) and primeira["x0"] < coluna_numero["x0"]:
+                grupo = " ".join(p["text"] for p in linha)
+            continue
+        descricao = " ".join(p["text"] for p in linha[1:] if p["x1"] < limite_valores) or None
+        valores = [None] * len(colunas)
+        for p in linha[1:]:
+            if p["x1"] < limite_valores:
+                continue
+            coluna = min(range(len(ancoras)), key=lambda c: abs(ancoras[c] - _centro(p)))
+            if valores[coluna] is not None:
+                logging.warning(f"Página {pagina}, alimento {primeira['text']}: dois valores na coluna {colunas[coluna]}.")
+                continue
+            valores[coluna] = converter_valor(p["text"])
+        valores = [float("nan") if valor is None else valor for valor in valores]
+        dados.append((int(primeira["text"]), grupo, descricao, valores))
+    return {"tabela": tabela, "lado": lado, "pagina": pagina, "linhas": dados}
+
+
+# PDFs já abertos neste processo (abrir o arquivo custa mais que ler uma página de texto)
+_PDFS_ABERTOS = {}
+
+# Faixa do topo da página (pt) onde fica o título "Tabela N."
+ALTURA_TITULO = 100
+
+
+def _abrir_pdf(pdf_path):
+    import pdfplumber  # importado no processo que faz a leitura
+
+    if pdf_path not in _PDFS_ABERTOS:
+        _PDFS_ABERTOS[pdf_path] = pdfplumber.open(pdf_path)
+    return _PDFS_ABERTOS[pdf_path]
+
+
+def ler_pagina(pdf_path, pagina):
+    """Lê e interpreta uma página (1 = primeira) do PDF; roda em um processo do pool."""
+    pagina_pdf = _abrir_pdf(pdf_path).pages[pagina - 1]
+    # Só o topo é lido nas páginas que não são de tabela
+    topo = pagina_pdf.crop((0, 0, pagina_pdf.width, min(ALTURA_TITULO, pagina_pdf.height))).extract_text() or ""
+    if not RE_TITULO.match(decodificar_cid(topo).strip()):
+        pagina_pdf.close()
+        return None
+    palavras = pagina_pdf.extract_words()
+    pagina_pdf.close()
+    return interpretar_pagina(palavras, pagina)
+
+
+def numero_paginas(pdf_path):
+    return len(_abrir_pdf(pdf_path).pages)
+
+
+def ler_paginas(pdf_path, paginas, executor=None):
+    """
+    Gerador das páginas de tabela interpretadas, na ordem de `paginas`. Com `executor`
+    (um pool de processos), as páginas são lidas em paralelo e entregues conforme ficam prontas.
+    """
+    if executor is None:
+        resultados = map(ler_pagina, repeat(pdf_path), paginas)
+    else:
+        resultados = executor.map(ler_pagina, repeat(pdf_path), paginas, chunksize=4)
+    for resultado in resultados:
+        if resultado is not None:
+            yield resultado
+
+
+def montar_tabelas(paginas_lidas, tabelas=tuple(COLUNAS_TABELAS)):
+    """
+    Consome o gerador de páginas e junta, por número do alimento, as colunas das páginas da
+    esquerda e da direita. Retorna {tabela: DataFrame tipado}, ordenado por número.
+    """
+    esquerda = {tabela: {} for tabela in tabelas}
+    direita = {tabela: {} for tabela in tabelas}
+    grupo_atual = {tabela: None for tabela in tabelas}
+    for pagina in paginas_lidas:
+        tabela = pagina["tabela"]
+        if tabela not in esquerda:
+            continue
+        for numero, grupo, descricao, valores in pagina["linhas"]:
+            if pagina["lado"] == "esquerda":
+                # O grupo continua de uma página para a seguinte até o próximo título
+                grupo_atual[tabela] = grupo or grupo_atual[tabela]
+                esquerda[tabela][numero] = (grupo_atual[tabela], descricao, valores)
+            else:
+                direita[tabela][numero] = valores
+
+    resultado = {}
+    for tabela in tabelas:
+        colunas_esquerda, colunas_direita = COLUNAS_TABELAS[tabela]
+        sem_par = set(esquerda[tabela]) ^ set(direita[tabela])
+        if sem_par:
+            logging.warning(f"Tabela {tabela}: alimentos sem as duas páginas: {sorted(sem_par)[:10]}")
+        linhas = []
+        for numero in sorted(esquerda[tabela]):
+            grupo, descricao, valores = esquerda[tabela][numero]
+            valores_direita = direita[tabela].get(numero, [float("nan")] * len(colunas_direita))
+            linhas.append([numero, grupo, descricao, *valores, *valores_direita])
+        df = pd.DataFrame(linhas, columns=["numero", "grupo", "descricao", *colunas_esquerda, *colunas_direita])
+        resultado[tabela] = df.astype({coluna: "float64" for coluna in colunas_esquerda + colunas_direita})
+    return resultado
+
+
+def extrair_tabelas_taco(pdf_path, tabelas=tuple(COLUNAS_TABELAS), executor=None):
+    """Lê todas as páginas do PDF e retorna {tabela: DataFrame} (ver `montar_tabelas`)."""
+    paginas = range(1, numero_paginas(pdf_path) + 1)
+    return montar_tabelas(ler_paginas(pdf_path, paginas, executor), tabelas)
+
+
+def main(argv=None):
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Extrai as tabelas de composição da TACO do PDF.")
+    parser.add_argument("--pdf", default=os.path.join(diretorio, ARQUIVO_PDF), help="PDF da TACO (4ª edição)")
+    parser.add_argument("--tabelas", type=int, nargs="+", default=list(COLUNAS_TABELAS), choices=list(COLUNAS_TABELAS))
+    parser.add_argument("--trabalhadores", type=int, default=os.cpu_count(), help="Processos para ler as páginas")
+    parser.add_argument("--saida", default=diretorio, help="Diretório dos CSVs de saída")
+    args = parser.parse_args(argv)
+
+    with ProcessPoolExecutor(max_workers=args.trabalhadores) as executor:
+        tabelas = extrair_tabelas_taco(args.pdf, tuple(args.tabelas), executor)
+    for tabela, df in tabelas.items():
+        caminho = os.path.join(args.saida, ARQUIVOS_SAIDA[tabela])
+        df.to_csv(caminho, index=False, encoding="utf-8")
+        logging.info(f"Tabela {tabela}: {len(df)} alimentos, {df.shape[1]} colunas -> {caminho}")
+
+
+if __name__ == "__main__":
+    main()
@@ -37,7 +37,7 @@ alimentos_desejados = [
     "Banana, prata",
 ]
 
-arquivo_entrada_csv = "taco_nutritional_data.csv"
+arquivo_entrada_csv = "taco_tabela1_composicao.csv"  # gerado por extrair_tabelas.py
 arquivo_saida_csv = "valores_nutricionais_filtrados.csv"
 
 coluna_alimento_identificada = None
@@ -49,6 +49,7 @@ try:
         df = pd.read_csv(arquivo_entrada_csv, encoding="latin1")
 
     possiveis_colunas_alimento = [
+        "descricao",
         "Alimento",
         "Descrição do Alimento",
         "description",
@@ -0,0 +1,63 @@
+import math
+import os
+
+import pandas as pd
+
+from extrair_tabelas import (
+    ARQUIVO_PDF, ARQUIVOS_SAIDA, COLUNAS_TABELAS, converter_valor, decodificar_cid, interpretar_pagina, ler_paginas,
+    montar_tabelas,
+)
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+
+
+def palavra(texto, x0, top, largura=20):
+    return {"text": texto, "x0": x0, "x1": x0 + largura, "top": top}
+
+
+def pagina_sintetica(lado, linhas_dados):
+    """Palavras de uma página da Tabela 1 com o cabeçalho de unidades e as linhas dadas."""
+    colunas = COLUNAS_TABELAS[1][0 if lado == "esquerda" else 1]
+    palavras = [palavra("Tabela", 10, 0), palavra("1.", 40, 0)]
+    if lado == "esquerda":
+        palavras.append(palavra("Descrição", 60, 10))
+    palavras += [palavra("Alimento", 30, 20)] + [palavra("(g)", 200 + 40 * c, 20) for c in range(len(colunas))]
+    for i, (numero, descricao, valores) in enumerate(linhas_dados):
+        top = 40 + 10 * i
+        palavras.append(palavra(str(numero), 35, top, 10))
+        if descricao:
+            palavras.append(palavra(descricao, 60, top, 80))
+        palavras += [palavra(texto, 200 + 40 * c, top) for c, texto in valores.items()]
+    return palavras
+
+
+def test_decodificacao_e_valores():
+    assert decodificar_cid("(cid:84)(cid:97)(cid:98)ela") == "Tabela"
+    assert converter_valor("1.505,2") == 1505.2
+    assert converter_valor(" 74b ") == 74.0
+    assert converter_valor("Tr") == 0.0
+    assert math.isnan(converter_valor("NA")) and math.isnan(converter_valor("abc"))
+
+
+def test_paginas_sinteticas_juntam_esquerda_e_direita():
+    esquerda = pagina_sintetica("esquerda", [(1, "Arroz, cru", {0: "12,5", 2: "Tr"}), (2, "Milho, cru", {1: "NA"})])
+    esquerda.append(palavra("Cereais", 5, 35, 15))  # título de grupo na margem
+    direita = pagina_sintetica("direita", [(1, None, {0: "3,0"}), (2, None, {len(COLUNAS_TABELAS[1][1]) - 1: "7"})])
+    paginas = [interpretar_pagina(esquerda, 1), interpretar_pagina(direita, 2)]
+    assert [pagina["lado"] for pagina in paginas] == ["esquerda", "direita"]
+    assert interpretar_pagina([palavra("Sumário", 10, 0)], 3) is None
+
+    tabela = montar_tabelas(paginas, tabelas=(1,))[1]
+    assert tabela["numero"].tolist() == [1, 2] and tabela["grupo"].tolist() == ["Cereais", "Cereais"]
+    assert tabela["descricao"].tolist() == ["Arroz, cru", "Milho, cru"]
+    assert tabela.loc[0, "umidade"] == 12.5 and tabela.loc[0, "energia_kj"] == 0.0 and math.isnan(tabela.loc[1, "energia_kcal"])
+    assert tabela.loc[0, "manganes_mg"] == 3.0 and tabela.loc[1, "vitamina_c_mg"] == 7.0
+
+
+def test_paginas_do_pdf_iguais_ao_csv_gerado():
+    pdf = os.path.join(DIRETORIO, ARQUIVO_PDF)
+    lidas = montar_tabelas(ler_paginas(pdf, range(29, 35)), tabelas=(1,))[1]
+    gerado = pd.read_csv(os.path.join(DIRETORIO, ARQUIVOS_SAIDA[1]))
+    esperado = gerado[gerado["numero"].isin(lidas["numero"])].reset_index(drop=True)
+    assert len(lidas) > 90
+    pd.testing.assert_frame_equal(lidas, esperado, check_dtype=False)
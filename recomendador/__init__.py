@@ -0,0 +1,25 @@
+"""
+Módulos do Sistema de Recomendação de Produtos Agrícolas do DF.
+
+- `sistema`: a classe `SistemaRecomendacaoDF`;
+- `dados`: dados de entrada e preparação dos DataFrames;
+- `simulacao`: gerador vetorizado de avaliações simuladas, em blocos (`python -m recomendador.simulacao <diretório>`);
+- `construir`: etapa de build que grava o artefato `.npz` (`python -m recomendador.construir <arquivo.npz>`);
+- `cesta`: planejamento da cesta (associações a visitar, percurso e compras por parada) de `planejar_cesta`;
+- `perfil_nutricional`: matriz produtos x nutrientes normalizada e objetivos nutricionais ponderados;
+- `sazonalidade`: meses em que cada produto está na época (calendário da CEASA-DF) e a preferência `mes`;
+- `instrumentacao`: tempos por etapa e contadores opcionais de `recomendar`/`recomendar_lote`;
+- `cache`: cache LRU com validade dos resultados de `recomendar`;
+- `tabelas`: formato colunar (`.npy` por coluna, memory-map) das tabelas de `tabelas/` (`python -m recomendador.tabelas`);
+- `artefato`: leitura/gravação do artefato;
+- `avaliacao`: avaliação offline (precisão@k, revocação@k, NDCG@k, cobertura) e grade de pesos (`python -m recomendador.avaliacao`);
+- `benchmark`: benchmark de inicialização, `recomendar` e `recomendar_lote` em mundos sintéticos (`python -m recomendador.benchmark --saida bench.json`);
+- `servico`: serviço HTTP local (asyncio) com pool de trabalho, lotes e `/metrics` (`python -m recomendador.servico --artefato <arquivo.npz>`);
+- `taco`: índice invertido das descrições da TACO para casar nomes de produtos com linhas da tabela;
+- `mapa`: mapas folium das recomendações, mapa base compartilhado para mapas em lote e mapa de calor da cobertura (folium importado só ao gerar um mapa).
+
+Uso fora do notebook:
+
+    from recomendador.sistema import SistemaRecomendacaoDF
+    sistema = SistemaRecomendacaoDF.carregar('artefatos/recomendador.npz')
+"""
@@ -0,0 +1,109 @@
+"""
+Artefato compilado do sistema de recomendação: um único arquivo `.npz` (sem pickle).
+
+Guarda os DataFrames de entrada coluna a coluna, os arrays pré-calculados na
+inicialização (incidências, scores nutricionais, relevância regional), o modelo
+colaborativo e a configuração. Carregar o artefato só lê arrays: não refaz o
+mapeamento de produtos, a relevância regional, a simulação de avaliações nem a
+similaridade. O arquivo é gravado sem compressão para que a leitura seja uma cópia direta.
+
+Chaves do `.npz`:
+  * `df__<nome>__...`: colunas de cada DataFrame (listas viram valores + offsets);
+  * `arr__<nome>`: arrays pré-calculados;
+  * `colab__<nome>`: arrays do modelo colaborativo (no 'svd', com as avaliações do treino e as dobradas);
+  * `config__<nome>`: parâmetros escalares (texto ou número).
+"""
+import numpy as np
+import pandas as pd
+
+VERSAO_ARTEFATO = 4
+
+# Tipos de coluna de DataFrame no artefato
+COLUNA_LISTA, COLUNA_TEXTO, COLUNA_VALOR = 'lista', 'texto', 'valor'
+
+
+def _tipo_coluna(serie):
+    if serie.dtype == object and serie.map(lambda valor: isinstance(valor, (list, tuple))).all() and len(serie) > 0:
+        return COLUNA_LISTA
+    if serie.dtype == object or pd.api.types.is_string_dtype(serie.dtype):
+        return COLUNA_TEXTO
+    return COLUNA_VALOR
+
+
+def dataframe_para_arrays(nome, df):
+    """Colunas de `df` como arrays NumPy sem objetos Python (listas de texto viram valores + offsets)."""
+    prefixo = f'df__{nome}__'
+    arrays = {
+        f'{prefixo}colunas': np.array([str(coluna) for coluna in df.columns], dtype=str),
+        f'{prefixo}indice': _valores_sem_objetos(df.index.to_numpy()),
+    }
+    tipos = []
+    for posicao, coluna in enumerate(df.columns):
+        serie = df[coluna]
+        tipo = _tipo_coluna(serie)
+        tipos.append(tipo)
+        if tipo == COLUNA_LISTA:
+            tamanhos = serie.map(len).to_numpy(dtype=np.int64)
+            arrays[f'{prefixo}{posicao}__offsets'] = np.concatenate([[0], np.cumsum(tamanhos)])
+            arrays[f'{prefixo}{posicao}__valores'] = np.array(
+                [str(item) for itens in serie for item in itens], dtype=str
+            )
+        elif tipo == COLUNA_TEXTO:
+            arrays[f'{prefixo}{posicao}'] = np.array(serie.astype(str).tolist(), dtype=str)
+        else:
+            arrays[f'{prefixo}{posicao}'] = serie.to_numpy()
+    arrays[f'{prefixo}tipos'] = np.array(tipos, dtype=str)
+    return arrays
+
+
+def dataframe_de_arrays(nome, arrays):
+    """Inverso de `dataframe_para_arrays`."""
+    prefixo = f'df__{nome}__'
+    dados = {}
+    for posicao, (coluna, tipo) in enumerate(zip(arrays[f'{prefixo}colunas'], arrays[f'{prefixo}tipos'])):
+        if tipo == COLUNA_LISTA:
+            offsets = arrays[f'{prefixo}{posicao}__offsets']
+            valores = arrays[f'{prefixo}{posicao}__valores'].tolist()
+            dados[str(coluna)] = [valores[inicio:fim] for inicio, fim in zip(offsets[:-1], offsets[1:])]
+        elif tipo == COLUNA_TEXTO:
+            dados[str(coluna)] = arrays[f'{prefixo}{posicao}'].tolist()
+        else:
+            dados[str(coluna)] = arrays[f'{prefixo}{posicao}']
+    indice = arrays[f'{prefixo}indice']
+    return pd.DataFrame(dados, index=pd.Index(indice.tolist() if indice.dtype.kind == 'U' else indice))
+
+
+def _valores_sem_objetos(valores):
+    if valores.dtype == object:
+        return np.array([str(valor) for valor in valores], dtype=str)
+    return valores
+
+
+def salvar_artefato(caminho, dataframes, arrays, arrays_colaborativos, config):
+    """Grava o artefato em `caminho` (`.npz`). `config` contém apenas textos e números."""
+    conteudo = {'config__versao': np.array(VERSAO_ARTEFATO)}
+    for nome, df in dataframes.items():
+        conteudo.update(dataframe_para_arrays(nome, df))
+    conteudo.update({f'arr__{nome}': _valores_sem_objetos(np.asarray(array)) for nome, array in arrays.items()})
+    conteudo.update({f'colab__{nome}': np.asarray(array) for nome, array in arrays_colaborativos.items()})
+    conteudo.update({f'config__{nome}': np.array(valor) for nome, valor in config.items()})
+    np.savez(caminho, **conteudo)
+
+
+def carregar_artefato(caminho):
+    """
+    Lê um artefato gravado por `salvar_artefato`.
+    Retorna (dataframes, arrays, arrays_colaborativos, config).
+    """
+    with np.load(caminho, allow_pickle=False) as arquivo:
+        conteudo = {chave: arquivo[chave] for chave in arquivo.files}
+    versao = int(conteudo.pop('config__versao'))
+    if versao != VERSAO_ARTEFATO:
+        raise ValueError(f"Versão do artefato não suportada: {versao} (esperada {VERSAO_ARTEFATO}).")
+
+    nomes_dataframes = {chave.split('__')[1] for chave in conteudo if chave.startswith('df__')}
+    dataframes = {nome: dataframe_de_arrays(nome, conteudo) for nome in nomes_dataframes}
+    arrays = {chave[len('arr__'):]: valor for chave, valor in conteudo.items() if chave.startswith('arr__')}
+    arrays_colaborativos = {chave[len('colab__'):]: valor for chave, valor in conteudo.items() if chave.startswith('colab__')}
+    config = {chave[len('config__'):]: valor.item() for chave, valor in conteudo.items() if chave.startswith('config__')}
+    return dataframes, arrays, arrays_colaborativos, config
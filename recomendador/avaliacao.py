@@ -0,0 +1,251 @@
+"""
+Avaliação offline do sistema de recomendação: precisão@k, revocação@k, NDCG@k e cobertura.
+
+As avaliações (`df_utility_long`) são divididas em treino e teste por consumidor; o sistema
+é montado só com o treino e, para cada consumidor, o ranking (sem as associações que ele
+já avaliou no treino) é comparado com as associações que ele avaliou bem (>= `LIMIAR_RELEVANCIA`)
+no teste. Como as avaliações não têm a posição do consumidor, ela é o centroide das
+associações avaliadas no treino.
+
+Os consumidores são processados em blocos: um único `recomendar_lote` por bloco devolve
+todas as candidatas com os sub-scores normalizados, e cada configuração de pesos da grade
+é só uma soma ponderada desses componentes (sem refazer distância, filtros ou scores).
+Com `trabalhadores > 1`, os blocos rodam em um pool de processos que carregam o sistema
+de treino, somente leitura, de um artefato temporário.
+
+    python -m recomendador.avaliacao --k 5 --trabalhadores 4
+    python -m recomendador.avaliacao --backend svd --grade weight_collaborative_score=0,0.2,0.4 weight_distance=0.1,0.25
+"""
+import argparse
+import itertools
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from recomendador.colaborativo import BACKENDS_COLABORATIVOS
+from recomendador.dados import carregar_associacoes, carregar_nutrientes, carregar_producao, simular_avaliacoes
+from recomendador.sistema import SistemaRecomendacaoDF
+
+# Avaliação a partir da qual uma associação do teste é relevante para o consumidor
+LIMIAR_RELEVANCIA = 3.5
+
+# Coluna normalizada de recomendar_lote que cada peso multiplica
+COLUNAS_COMPONENTES = {
+    'weight_distance': 'normalized_distance_score',
+    'weight_rating': 'normalized_rating_score',
+    'weight_nutritional_goal': 'normalized_nutritional_score',
+    'weight_regional_production_relevance': 'normalized_regional_production_score',
+    'weight_collaborative_score': 'normalized_collaborative_score',
+}
+
+# Preferências padrão da avaliação: sem filtro de raio (o ranking cobre todas as associações)
+PREFERENCIAS_AVALIACAO = {'max_distance_km': float('inf')}
+
+
+def dividir_treino_teste(df_utility_long, fracao_teste=0.2, semente=0):
+    """
+    Separa, por consumidor, `fracao_teste` das avaliações (ao menos 1 e no máximo todas menos 1)
+    para o teste. Consumidores com uma única avaliação ficam só no treino. Retorna (treino, teste).
+    """
+    aleatorio = np.random.default_rng(semente)
+    consumidores = df_utility_long['id_consumidor']
+    # Posição aleatória de cada avaliação entre as do seu consumidor
+    ordem = pd.Series(aleatorio.random(len(df_utility_long)), index=df_utility_long.index).groupby(consumidores).rank(method='first')
+    quantidades = consumidores.map(consumidores.value_counts()).to_numpy()
+    no_teste = np.minimum(np.maximum(np.round(quantidades * fracao_teste), 1), quantidades - 1)
+    teste = ordem.to_numpy() <= no_teste
+    return df_utility_long[~teste].reset_index(drop=True), df_utility_long[teste].reset_index(drop=True)
+
+
+def grade_pesos(**valores):
+    """Produto cartesiano dos valores de cada peso: grade_pesos(weight_distance=[0.1, 0.25], ...) -> lista de dicionários."""
+    nomes = list(valores)
+    return [dict(zip(nomes, combinacao)) for combinacao in itertools.product(*(valores[nome] for nome in nomes))]
+
+
+def _posicoes_por_consumidor(df_avaliacoes, consumidores, posicao_associacao):
+    """Lista, alinhada com `consumidores`, das posições das associações avaliadas por cada um."""
+    posicoes = pd.Series(posicao_associacao.get_indexer(df_avaliacoes['id_associacao']), index=df_avaliacoes.index)
+    posicoes = posicoes[posicoes >= 0]
+    por_consumidor = posicoes.groupby(df_avaliacoes.loc[posicoes.index, 'id_consumidor']).agg(list)
+    return [por_consumidor.get(consumidor, []) for consumidor in consumidores]
+
+
+def _matriz(listas, num_associacoes):
+    matriz = np.zeros((len(listas), num_associacoes), dtype=bool)
+    linhas = np.repeat(np.arange(len(listas)), [len(lista) for lista in listas])
+    matriz[linhas, np.concatenate([np.asarray(lista, dtype=np.intp) for lista in listas] + [np.empty(0, dtype=np.intp)])] = True
+    return matriz
+
+
+def avaliar_bloco(sistema, consumidores, latitudes, longitudes, treino, relevantes, configuracoes, preferencias, k):
+    """
+    Métricas de um bloco de consumidores para cada configuração de pesos. `treino` e `relevantes`
+    são listas (uma por consumidor) de posições de associações. Retorna, por configuração, as
+    somas de precisão, revocação e NDCG e a máscara das associações recomendadas a alguém.
+    """
+    num_associacoes = len(sistema.association_ids)
+    candidatas_df = sistema.recomendar_lote(
+        consumidores, latitudes, longitudes, {**preferencias, 'top_n_results': num_associacoes}
+    )
+    linhas = pd.Index(consumidores).get_indexer(candidatas_df['consumer_id'])
+    colunas = pd.Index(sistema.association_ids).get_indexer(candidatas_df['id'])
+    candidata = np.zeros((len(consumidores), num_associacoes), dtype=bool)
+    candidata[linhas, colunas] = True
+    componentes = {}
+    for peso, coluna in COLUNAS_COMPONENTES.items():
+        componentes[peso] = np.zeros((len(consumidores), num_associacoes))
+        componentes[peso][linhas, colunas] = candidatas_df[coluna].to_numpy(dtype=float)
+    disponivel = candidata & ~_matriz(treino, num_associacoes)
+    relevante = _matriz(relevantes, num_associacoes)
+    num_relevantes = relevante.sum(axis=1)
+    descontos = 1.0 / np.log2(np.arange(2, k + 2))
+    ndcg_ideal = np.cumsum(descontos)[np.minimum(num_relevantes, k) - 1]
+
+    resultados = []
+    for configuracao in configuracoes:
+        # Mesma soma, na mesma ordem, do final_score de recomendar
+        scores = np.zeros((len(consumidores), num_associacoes))
+        for peso, padrao in sistema.DEFAULT_WEIGHTS.items():
+            scores += componentes[peso] * configuracao.get(peso, preferencias.get(peso, padrao))
+        scores[~disponivel] = -np.inf
+        # Ordenação estável: empates ficam na ordem das associações, como em recomendar
+        ranking = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+        recomendada = np.take_along_axis(disponivel, ranking, axis=1)
+        acertos = np.take_along_axis(relevante, ranking, axis=1) & recomendada
+        recomendadas = np.zeros(num_associacoes, dtype=bool)
+        recomendadas[ranking[recomendada]] = True
+        resultados.append({
+            'precisao': (acertos.sum(axis=1) / k).sum(),
+            'revocacao': (acertos.sum(axis=1) / num_relevantes).sum(),
+            'ndcg': ((acertos @ descontos) / ndcg_ideal).sum(),
+            'recomendadas': recomendadas,
+        })
+    return resultados
+
+
+# Sistema de treino de cada processo do pool, carregado pelo inicializador
+_SISTEMA_PROCESSO = None
+
+
+def _iniciar_processo(caminho_artefato):
+    global _SISTEMA_PROCESSO
+    _SISTEMA_PROCESSO = SistemaRecomendacaoDF.carregar(caminho_artefato)
+
+
+def _avaliar_bloco_processo(argumentos):
+    return avaliar_bloco(_SISTEMA_PROCESSO, *argumentos)
+
+
+def avaliar(df_associacoes, df_nutrientes, df_producao, df_utility_long, configuracoes=None, preferencias=None,
+            k=5, fracao_teste=0.2, trabalhadores=None, tamanho_bloco=64, semente=0, **opcoes_sistema):
+    """
+    Avalia cada configuração de pesos (dicionários {weight_*: valor}; os pesos ausentes usam os de
+    `preferencias` ou os padrões de `SistemaRecomendacaoDF.DEFAULT_WEIGHTS`) com o sistema montado
+    sobre o treino. `opcoes_sistema` vai para o construtor (ex: collaborative_backend='svd').
+    `trabalhadores`: processos do pool (None = número de CPUs; 1 = no próprio processo).
+    Retorna um DataFrame com uma linha por configuração: os pesos, precisao@k, revocacao@k,
+    ndcg@k, cobertura (fração das associações recomendadas a alguém) e consumidores avaliados.
+    """
+    configuracoes = [{}] if configuracoes is None else list(configuracoes)
+    preferencias = {**PREFERENCIAS_AVALIACAO, **(preferencias or {})}
+    treino_df, teste_df = dividir_treino_teste(df_utility_long, fracao_teste, semente)
+    sistema = SistemaRecomendacaoDF(df_associacoes, df_nutrientes, df_producao, treino_df, **opcoes_sistema)
+
+    # Consumidores com ao menos uma associação relevante no teste e posição conhecida
+    posicao_associacao = pd.Index(sistema.association_ids)
+    relevantes_df = teste_df[teste_df['avaliacao'] >= LIMIAR_RELEVANCIA]
+    consumidores = pd.unique(relevantes_df['id_consumidor'])
+    treino = _posicoes_por_consumidor(treino_df, consumidores, posicao_associacao)
+    relevantes = _posicoes_por_consumidor(relevantes_df, consumidores, posicao_associacao)
+    with np.errstate(invalid='ignore'):
+        latitudes = np.array([np.nanmean(sistema.association_latitudes[p]) if p else np.nan for p in treino])
+        longitudes = np.array([np.nanmean(sistema.association_longitudes[p]) if p else np.nan for p in treino])
+    validos = np.flatnonzero(~np.isnan(latitudes) & ~np.isnan(longitudes) & np.array([len(r) > 0 for r in relevantes], dtype=bool))
+    blocos = [
+        (
+            [consumidores[i] for i in posicoes], latitudes[posicoes], longitudes[posicoes],
+            [treino[i] for i in posicoes], [relevantes[i] for i in posicoes], configuracoes, preferencias, k
+        )
+        for posicoes in (validos[inicio:inicio + tamanho_bloco] for inicio in range(0, len(validos), tamanho_bloco))
+    ]
+
+    trabalhadores = trabalhadores or os.cpu_count() or 1
+    if trabalhadores == 1 or len(blocos) <= 1:
+        resultados_blocos = [avaliar_bloco(sistema, *bloco) for bloco in blocos]
+    else:
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'sistema_treino.npz')
+            sistema.salvar(caminho)
+            with ProcessPoolExecutor(trabalhadores, initializer=_iniciar_processo, initargs=(caminho,)) as executor:
+                resultados_blocos = list(executor.map(_avaliar_bloco_processo, blocos))
+
+    num_consumidores = len(validos)
+    linhas = []
+    for i, configuracao in enumerate(configuracoes):
+        linha = {peso: configuracao.get(peso, preferencias.get(peso, padrao)) for peso, padrao in sistema.DEFAULT_WEIGHTS.items()}
+        resultados = [resultados_bloco[i] for resultados_bloco in resultados_blocos]
+        for metrica in ('precisao', 'revocacao', 'ndcg'):
+            linha[f'{metrica}@{k}'] = sum(r[metrica] for r in resultados) / num_consumidores if num_consumidores else np.nan
+        recomendadas = np.zeros(len(sistema.association_ids), dtype=bool)
+        for r in resultados:
+            recomendadas |= r['recomendadas']
+        linha['cobertura'] = recomendadas.mean() if len(recomendadas) else np.nan
+        linha['consumidores'] = num_consumidores
+        linhas.append(linha)
+    return pd.DataFrame(linhas)
+
+
+def _ler_grade(especificacoes):
+    """
+    ['weight_distance=0.1,0.25', ...] -> lista de configurações (produto cartesiano).
+    ArgumentTypeError para um peso desconhecido ou valores ausentes ou não numéricos.
+    """
+    valores = {}
+    for especificacao in especificacoes:
+        peso, separador, lista = especificacao.partition('=')
+        if peso not in COLUNAS_COMPONENTES:
+            raise argparse.ArgumentTypeError(f"Peso desconhecido: {peso!r}. Use um de {list(COLUNAS_COMPONENTES)}.")
+        try:
+            valores[peso] = [float(valor) for valor in lista.split(',')] if separador else None
+        except ValueError:
+            valores[peso] = None
+        if valores[peso] is None:
+            raise argparse.ArgumentTypeError(f"Valores inválidos em {especificacao!r}: use {peso}=V1,V2.")
+    return grade_pesos(**valores)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Avaliação offline (precisão, revocação, NDCG e cobertura) do Sistema de Recomendação do DF.")
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--fracao-teste', type=float, default=0.2)
+    parser.add_argument('--backend', choices=BACKENDS_COLABORATIVOS, default='item_item')
+    parser.add_argument('--fatores', type=int, default=20, help="Fatores latentes (backend svd)")
+    parser.add_argument('--trabalhadores', type=int, default=None, help="Processos do pool (padrão: número de CPUs)")
+    parser.add_argument('--grade', nargs='*', default=[], metavar='PESO=V1,V2',
+                        help="Valores de cada peso; avalia o produto cartesiano")
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', help="CSV com o resultado")
+    args = parser.parse_args(argv)
+    try:
+        configuracoes = _ler_grade(args.grade)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    df_associacoes = carregar_associacoes()
+    resultado = avaliar(
+        df_associacoes, carregar_nutrientes(), carregar_producao(), simular_avaliacoes(df_associacoes),
+        configuracoes=configuracoes, k=args.k, fracao_teste=args.fracao_teste,
+        trabalhadores=args.trabalhadores, semente=args.semente,
+        collaborative_backend=args.backend, latent_factors=args.fatores
+    )
+    print(resultado.to_string(index=False))
+    if args.saida:
+        resultado.to_csv(args.saida, index=False)
+
+
+if __name__ == '__main__':
+    main()
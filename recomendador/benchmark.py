@@ -0,0 +1,246 @@
+"""
+Benchmark do `SistemaRecomendacaoDF` em mundos sintéticos de tamanhos diferentes.
+
+Cada configuração gera N associações espalhadas pelo DF, M consumidores com ~R avaliações
+no total e produtos sorteados entre os P primeiros de `PRODUTOS_ESCOPO`, e mede:
+  * `__init__`: tempo e pico de memória (tracemalloc, medido em uma construção à parte);
+  * `recomendar`: latência p50/p95/p99, vazão e tempo médio por etapa de chamadas individuais;
+  * `recomendar_lote`: tempo por lote e vazão em consumidores por segundo.
+Os resultados são gravados em JSON (com o commit atual) para comparar entre commits:
+
+    python -m recomendador.benchmark --configuracoes real pequeno medio --saida bench.json
+    python -m recomendador.benchmark --configuracoes real pequeno --comparar bench.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from recomendador.dados import (
+    PRODUTOS_ESCOPO, ASSOCIACOES, carregar_associacoes, carregar_nutrientes, carregar_producao, simular_avaliacoes
+)
+from recomendador.simulacao import gerar_avaliacoes
+from recomendador.sistema import SistemaRecomendacaoDF
+
+# Retângulo aproximado do DF (latitude, longitude)
+LIMITES_DF = ((-16.05, -15.50), (-48.28, -47.31))
+
+REGIOES_DF = sorted({regiao for associacao in ASSOCIACOES for regiao in associacao['regioes']})
+
+OBJETIVOS_NUTRICIONAIS = (None, 'alta_vitamina_c', 'alta_fibra', 'baixa_caloria')
+
+# Chamadas de `recomendar` repetidas sob tracemalloc para o pico de memória
+CONSULTAS_MEMORIA = 20
+
+# 'real' usa os dados do projeto; as demais, mundos sintéticos
+CONFIGURACOES = {
+    'real': {'associacoes': None, 'consumidores': 500, 'avaliacoes': None, 'produtos': None,
+             'consultas': 300, 'lote': 500},
+    'pequeno': {'associacoes': 200, 'consumidores': 2_000, 'avaliacoes': 30_000, 'produtos': 35,
+                'consultas': 300, 'lote': 500},
+    'medio': {'associacoes': 5_000, 'consumidores': 50_000, 'avaliacoes': 1_000_000, 'produtos': 35,
+              'consultas': 200, 'lote': 200},
+    'grande': {'associacoes': 50_000, 'consumidores': 500_000, 'avaliacoes': 10_000_000, 'produtos': 35,
+               'consultas': 100, 'lote': 100},
+}
+
+
+def gerar_mundo_sintetico(num_associacoes, num_consumidores, num_avaliacoes, num_produtos, semente=0):
+    """
+    (df_associacoes, df_nutrientes, df_producao, df_utility_long) sintéticos: associações com
+    coordenadas uniformes no DF, 1-3 regiões reais e 3-15 produtos entre os `num_produtos`
+    primeiros do escopo. Nutrientes e produção regional são os dados reais do projeto.
+    """
+    aleatorio = np.random.default_rng(semente)
+    produtos = PRODUTOS_ESCOPO[:num_produtos]
+    (lat_min, lat_max), (lon_min, lon_max) = LIMITES_DF
+
+    quantidades_produtos = aleatorio.integers(3, min(15, len(produtos)) + 1, size=num_associacoes)
+    quantidades_regioes = aleatorio.integers(1, 4, size=num_associacoes)
+    df_associacoes = pd.DataFrame({
+        'id': np.arange(1, num_associacoes + 1),
+        'nome': [f'Associação Sintética {i:06d}' for i in range(1, num_associacoes + 1)],
+        'latitude': aleatorio.uniform(lat_min, lat_max, size=num_associacoes),
+        'longitude': aleatorio.uniform(lon_min, lon_max, size=num_associacoes),
+        'regioes': [list(aleatorio.choice(REGIOES_DF, size=q, replace=False)) for q in quantidades_regioes],
+        'produtos': [list(aleatorio.choice(produtos, size=q, replace=False)) for q in quantidades_produtos],
+        'organico_principal': aleatorio.random(num_associacoes) < 0.3,
+        'avaliacao_media': aleatorio.uniform(3.5, 5.0, size=num_associacoes),
+    })
+
+    media_por_consumidor = max(1, round(num_avaliacoes / num_consumidores))
+    df_utility_long = pd.concat(gerar_avaliacoes(
+        df_associacoes, num_consumidores,
+        min_avaliacoes=max(1, media_por_consumidor // 2), max_avaliacoes=media_por_consumidor * 3 // 2,
+        semente=semente
+    ), ignore_index=True)
+    return df_associacoes, carregar_nutrientes(), carregar_producao(), df_utility_long
+
+
+def _mundo(configuracao, semente):
+    if configuracao['associacoes'] is None:
+        df_associacoes = carregar_associacoes()
+        return df_associacoes, carregar_nutrientes(), carregar_producao(), simular_avaliacoes(df_associacoes)
+    return gerar_mundo_sintetico(
+        configuracao['associacoes'], configuracao['consumidores'], configuracao['avaliacoes'],
+        configuracao['produtos'], semente
+    )
+
+
+def _consultas(aleatorio, quantidade, consumidores, produtos):
+    """(consumidor, latitude, longitude, preferências) aleatórios para as medições."""
+    (lat_min, lat_max), (lon_min, lon_max) = LIMITES_DF
+    consultas = []
+    for _ in range(quantidade):
+        preferencias = {
+            'desired_products': list(aleatorio.choice(produtos, size=aleatorio.integers(0, 4), replace=False)),
+            'max_distance_km': float(aleatorio.choice([5, 10, 20, 30])),
+            'only_organic': bool(aleatorio.random() < 0.2),
+            'nutritional_goal': OBJETIVOS_NUTRICIONAIS[aleatorio.integers(len(OBJETIVOS_NUTRICIONAIS))],
+            'top_n_results': 5,
+        }
+        consultas.append((consumidores[aleatorio.integers(len(consumidores))],
+                          aleatorio.uniform(lat_min, lat_max), aleatorio.uniform(lon_min, lon_max), preferencias))
+    return consultas
+
+
+def _percentis_ms(duracoes):
+    p50, p95, p99 = np.percentile(np.asarray(duracoes) * 1000.0, [50, 95, 99])
+    return {'p50_ms': round(p50, 3), 'p95_ms': round(p95, 3), 'p99_ms': round(p99, 3)}
+
+
+def executar_configuracao(nome, configuracao, semente=0):
+    """Mede uma configuração; retorna um dicionário serializável em JSON."""
+    df_associacoes, df_nutrientes, df_producao, df_utility_long = _mundo(configuracao, semente)
+    resultado = {
+        'configuracao': nome,
+        'associacoes': len(df_associacoes),
+        'consumidores': int(df_utility_long['id_consumidor'].nunique()),
+        'avaliacoes': len(df_utility_long),
+    }
+
+    # Tempos medidos sem tracemalloc (que desacelera o Python); a memória é medida em passadas à parte
+    inicio = time.perf_counter()
+    sistema = SistemaRecomendacaoDF(df_associacoes, df_nutrientes, df_producao, df_utility_long)
+    resultado['init_s'] = round(time.perf_counter() - inicio, 4)
+    resultado['init_pico_memoria_mb'] = _pico_memoria_mb(
+        SistemaRecomendacaoDF, df_associacoes, df_nutrientes, df_producao, df_utility_long
+    )
+
+    aleatorio = np.random.default_rng(semente)
+    consumidores = df_utility_long['id_consumidor'].unique()
+    produtos = sorted({produto for produtos_associacao in df_associacoes['produtos'] for produto in produtos_associacao})
+    resultado['produtos'] = len(produtos)
+
+    consultas = _consultas(aleatorio, configuracao['consultas'], consumidores, produtos)
+    duracoes = []
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        sistema.recomendar(*consulta)
+        duracoes.append(time.perf_counter() - inicio)
+    resultado['recomendar'] = {
+        **_percentis_ms(duracoes),
+        'vazao_por_s': round(len(duracoes) / sum(duracoes), 2),
+        'pico_memoria_mb': max(_pico_memoria_mb(sistema.recomendar, *consulta) for consulta in consultas[:CONSULTAS_MEMORIA]),
+    }
+    # Tempo médio por etapa, em uma passada instrumentada à parte
+    estatisticas = sistema.ativar_instrumentacao()
+    for consulta in consultas:
+        sistema.recomendar(*consulta)
+    sistema.desativar_instrumentacao()
+    resultado['recomendar']['etapas_media_ms'] = estatisticas.tempos()['media_ms'].round(4).to_dict()
+
+    # O lote usa as mesmas preferências para todos (o caso de uma campanha para uma coorte)
+    lote = _consultas(aleatorio, configuracao['lote'], consumidores, produtos)
+    argumentos_lote = ([consulta[0] for consulta in lote], [consulta[1] for consulta in lote],
+                       [consulta[2] for consulta in lote], lote[0][3])
+    inicio = time.perf_counter()
+    sistema.recomendar_lote(*argumentos_lote)
+    duracao_lote = time.perf_counter() - inicio
+    resultado['recomendar_lote'] = {
+        'consumidores': len(lote),
+        'duracao_s': round(duracao_lote, 4),
+        'vazao_consumidores_por_s': round(len(lote) / duracao_lote, 2),
+        'pico_memoria_mb': _pico_memoria_mb(sistema.recomendar_lote, *argumentos_lote),
+    }
+    return resultado
+
+
+def _pico_memoria_mb(funcao, *args):
+    """Pico de memória alocada (tracemalloc, em MB) durante uma chamada de `funcao`."""
+    tracemalloc.start()
+    try:
+        funcao(*args)
+        return round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+    finally:
+        tracemalloc.stop()
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar(nomes_configuracoes, semente=0):
+    """Executa as configurações pedidas; retorna o relatório completo (metadados + resultados)."""
+    return {
+        'commit': _commit_atual(),
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'resultados': [executar_configuracao(nome, CONFIGURACOES[nome], semente) for nome in nomes_configuracoes],
+    }
+
+
+def comparar(relatorio, relatorio_anterior):
+    """Linhas de texto com a razão atual/anterior das principais métricas (> 1 = mais lento)."""
+    anteriores = {resultado['configuracao']: resultado for resultado in relatorio_anterior['resultados']}
+    linhas = []
+    for resultado in relatorio['resultados']:
+        anterior = anteriores.get(resultado['configuracao'])
+        if anterior is None:
+            continue
+        metricas = [
+            ('init_s', resultado['init_s'], anterior['init_s']),
+            ('recomendar p50', resultado['recomendar']['p50_ms'], anterior['recomendar']['p50_ms']),
+            ('recomendar p99', resultado['recomendar']['p99_ms'], anterior['recomendar']['p99_ms']),
+            ('lote', resultado['recomendar_lote']['duracao_s'], anterior['recomendar_lote']['duracao_s']),
+        ]
+        linhas.append(f"{resultado['configuracao']} (vs {relatorio_anterior.get('commit')}): " + ", ".join(
+            f"{nome} {atual / anterior_valor:.2f}x" for nome, atual, anterior_valor in metricas if anterior_valor
+        ))
+    return linhas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do SistemaRecomendacaoDF.")
+    parser.add_argument('--configuracoes', nargs='+', choices=list(CONFIGURACOES), default=['real', 'pequeno'])
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', help="Arquivo JSON com os resultados")
+    parser.add_argument('--comparar', help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args(argv)
+
+    relatorio = executar(args.configuracoes, args.semente)
+    for resultado in relatorio['resultados']:
+        print(json.dumps(resultado, ensure_ascii=False))
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            for linha in comparar(relatorio, json.load(arquivo)):
+                print(linha)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
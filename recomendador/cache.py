@@ -0,0 +1,171 @@
+"""
+Cache opcional de resultados de `recomendar` (LRU com validade/TTL).
+
+A chave é (consumidor, latitude e longitude arredondadas para uma grade, hash canônico das
+preferências): pedidos do mesmo consumidor, feitos do mesmo bairro e com as mesmas
+preferências, reaproveitam o resultado do primeiro. Antes do hash, as preferências são
+normalizadas (`normalizar_preferencias`): pedidos equivalentes, como produtos em outra ordem,
+25 e 25.0 ou um valor padrão explícito, têm a mesma chave. Dentro de uma célula da grade as
+distâncias retornadas são as do pedido que preencheu o cache (erro de até meia célula por
+eixo; 0,005° ≈ 550 m de latitude).
+
+A invalidação é feita pelo sistema: por consumidor (novas avaliações quando o modelo
+colaborativo só muda os scores desse consumidor) ou total (mudanças nas associações, na
+produção regional, nos nutrientes, ou avaliações que alteram a similaridade entre associações).
+"""
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from numbers import Real
+
+from recomendador.sazonalidade import mes_da_preferencia
+
+
+def preferencias_canonicas(preferencias):
+    """Texto canônico (JSON com chaves ordenadas) de um dicionário de preferências."""
+    return json.dumps(preferencias, sort_keys=True, default=str, ensure_ascii=False)
+
+
+def _numeros_como_float(valor):
+    if isinstance(valor, dict):
+        return {chave: _numeros_como_float(item) for chave, item in valor.items()}
+    if isinstance(valor, Real) and not isinstance(valor, bool):
+        return float(valor)
+    return valor
+
+
+def normalizar_preferencias(preferencias, padroes=None):
+    """
+    Preferências com o que `recomendar` efetivamente usa: os `padroes` preenchem as chaves
+    ausentes, `desired_products` vira a lista ordenada e sem repetições, `mes` vira o número do
+    mês e os números (inclusive os pesos de um `nutritional_goal` em dicionário) viram float.
+    """
+    normalizadas = {**(padroes or {}), **preferencias}
+    try:
+        normalizadas['mes'] = mes_da_preferencia(normalizadas.get('mes'))
+    except ValueError:
+        pass  # mês inválido: fica como veio (recomendar rejeita o pedido)
+    produtos = normalizadas.get('desired_products')
+    if isinstance(produtos, (list, tuple)):
+        normalizadas['desired_products'] = sorted(set(produtos), key=str)
+    return _numeros_como_float(normalizadas)
+
+
+def hash_preferencias(preferencias, padroes=None):
+    """Hash (hexadecimal, 128 bits) do texto canônico das preferências normalizadas (`normalizar_preferencias`)."""
+    texto = preferencias_canonicas(normalizar_preferencias(preferencias, padroes))
+    return hashlib.blake2b(texto.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class CacheRecomendacoes:
+    """
+    LRU limitado a `capacidade` resultados, cada um válido por `validade_s` segundos
+    (None = sem expiração). `grade_graus` é o tamanho da célula usada para arredondar as
+    coordenadas na chave; `padroes` são os valores das preferências ausentes no pedido.
+    Seguro para uso por várias threads.
+    """
+
+    def __init__(self, capacidade=1024, validade_s=300.0, grade_graus=0.005, padroes=None):
+        if capacidade < 1:
+            raise ValueError(f"Capacidade do cache deve ser >= 1 (recebido {capacidade}).")
+        if grade_graus <= 0:
+            raise ValueError(f"Tamanho da grade deve ser > 0 (recebido {grade_graus}).")
+        self.capacidade = capacidade
+        self.validade_s = validade_s
+        self.grade_graus = grade_graus
+        self.padroes = dict(padroes or {})
+        self._trava = threading.Lock()
+        self._entradas = OrderedDict()      # chave -> (expira_em, resultado)
+        self._chaves_por_consumidor = {}    # consumidor -> {chaves}
+        self.acertos = self.falhas = self.expiradas = self.descartadas = self.invalidadas = 0
+        # Incrementada a cada invalidação: um resultado calculado antes dela não é guardado
+        self.geracao = 0
+
+    def chave(self, consumidor_id, latitude, longitude, preferencias):
+        """Chave do pedido; None se alguma coordenada não for finita (o pedido não passa pelo cache)."""
+        if not (math.isfinite(latitude) and math.isfinite(longitude)):
+            return None
+        return (
+            consumidor_id,
+            round(latitude / self.grade_graus),
+            round(longitude / self.grade_graus),
+            hash_preferencias(preferencias, self.padroes),
+        )
+
+    def obter(self, chave):
+        """Uma cópia do resultado guardado em `chave`, ou None (ausente ou expirado)."""
+        with self._trava:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and entrada[0] is not None and entrada[0] <= time.monotonic():
+                self._remover(chave)
+                self.expiradas += 1
+                entrada = None
+            if entrada is None:
+                self.falhas += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            resultado = entrada[1]
+        return resultado.copy()
+
+    def guardar(self, chave, resultado, geracao=None):
+        """
+        Guarda `resultado` em `chave`. `geracao` é o valor de `self.geracao` lido antes de calcular o
+        resultado: se houve invalidação desde então, o resultado (possivelmente velho) é descartado.
+        """
+        expira_em = None if self.validade_s is None else time.monotonic() + self.validade_s
+        with self._trava:
+            if geracao is not None and geracao != self.geracao:
+                return
+            self._entradas[chave] = (expira_em, resultado.copy())
+            self._entradas.move_to_end(chave)
+            self._chaves_por_consumidor.setdefault(chave[0], set()).add(chave)
+            while len(self._entradas) > self.capacidade:
+                self._remover(next(iter(self._entradas)))
+                self.descartadas += 1
+
+    def _remover(self, chave):
+        del self._entradas[chave]
+        chaves_consumidor = self._chaves_por_consumidor.get(chave[0])
+        if chaves_consumidor is not None:
+            chaves_consumidor.discard(chave)
+            if not chaves_consumidor:
+                del self._chaves_por_consumidor[chave[0]]
+
+    def invalidar_consumidor(self, consumidor_id):
+        """Remove os resultados de um consumidor."""
+        with self._trava:
+            self.geracao += 1
+            chaves = self._chaves_por_consumidor.pop(consumidor_id, set())
+            for chave in chaves:
+                del self._entradas[chave]
+            self.invalidadas += len(chaves)
+
+    def limpar(self):
+        """Remove todos os resultados (as estatísticas são mantidas)."""
+        with self._trava:
+            self.geracao += 1
+            self.invalidadas += len(self._entradas)
+            self._entradas.clear()
+            self._chaves_por_consumidor.clear()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def estatisticas(self):
+        """Acertos, falhas, taxa de acertos, expirações, descartes (LRU), invalidações e tamanho atual."""
+        with self._trava:
+            consultas = self.acertos + self.falhas
+            return {
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'taxa_acertos': self.acertos / consultas if consultas else 0.0,
+                'expiradas': self.expiradas,
+                'descartadas': self.descartadas,
+                'invalidadas': self.invalidadas,
+                'tamanho': len(self._entradas),
+                'capacidade': self.capacidade,
+            }
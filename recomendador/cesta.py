@@ -0,0 +1,201 @@
+"""
+Planejamento de cesta: quais associações visitar, e em que ordem, para comprar todos os
+produtos de uma cesta com o menor deslocamento.
+
+Cada candidata é uma linha booleana dos itens da cesta que ela oferece. O custo de um
+plano é a distância do percurso (do consumidor até a última parada, mais a volta se
+`ida_e_volta`) somada a `custo_parada_km` por parada: uma cobertura de conjuntos
+ponderada com roteamento. As distâncias são as do sistema (em linha reta), não de ruas.
+
+As distâncias entre candidatas são pedidas sob demanda (`distancias_entre(origens, destinos)`),
+nunca para todos os pares: o raio pode ter milhares de associações.
+
+- `plano_guloso`: cobertura gulosa (itens novos por km acrescentado ao percurso), remoção
+  das paradas redundantes e ordem por vizinho mais próximo + 2-opt. Sempre roda primeiro.
+- `plano_exato`: programação dinâmica sobre (itens já cobertos, última parada), com as
+  máscaras em ordem crescente e cada passo vetorizado sobre as candidatas. Antes, são
+  descartadas as candidatas cuja distância até o consumidor já passa do custo do guloso
+  (nenhum percurso que as visite pode ser melhor). Só roda se o trabalho estimado couber
+  em `LIMITE_TRABALHO_EXATO` e desiste ao estourar o prazo, ficando o resultado do guloso.
+"""
+import time
+
+import numpy as np
+
+# Cestas com mais itens que isso usam só o guloso (a tabela da programação dinâmica tem 2^itens linhas)
+MAX_ITENS_EXATO = 12
+# Trabalho máximo (2^itens x candidatas^2) aceito para a programação dinâmica
+LIMITE_TRABALHO_EXATO = 2e7
+
+
+def custo_percurso(distancias_consumidor, distancias_paradas, ida_e_volta=False):
+    """
+    Distância (km) do percurso consumidor -> parada 0 -> ... -> última parada (-> consumidor, se
+    `ida_e_volta`), dadas as distâncias do consumidor a cada parada e entre paradas, na ordem do percurso.
+    """
+    if len(distancias_consumidor) == 0:
+        return 0.0
+    total = distancias_consumidor[0] + np.diagonal(distancias_paradas, offset=1).sum()
+    if ida_e_volta:
+        total += distancias_consumidor[-1]
+    return float(total)
+
+
+def itens_por_parada(ordem, oferta):
+    """Itens comprados em cada parada: cada item fica com a primeira parada do percurso que o oferece."""
+    cobertos = np.zeros(oferta.shape[1], dtype=bool)
+    compras = []
+    for parada in ordem:
+        novos = oferta[parada] & ~cobertos
+        compras.append(np.flatnonzero(novos))
+        cobertos |= novos
+    return compras
+
+
+def _ordenar_paradas(distancias_consumidor, distancias_paradas, ida_e_volta):
+    """Ordem (posições locais) do percurso: vizinho mais próximo a partir do consumidor, melhorada por 2-opt."""
+    restantes = list(range(len(distancias_consumidor)))
+    ordem = []
+    distancias_atual = distancias_consumidor
+    while restantes:
+        proxima = min(restantes, key=lambda parada: distancias_atual[parada])
+        ordem.append(proxima)
+        restantes.remove(proxima)
+        distancias_atual = distancias_paradas[proxima]
+
+    def custo(ordem):
+        return custo_percurso(distancias_consumidor[ordem], distancias_paradas[np.ix_(ordem, ordem)], ida_e_volta)
+
+    melhor_custo = custo(ordem)
+    melhorou = True
+    while melhorou:
+        melhorou = False
+        for i in range(len(ordem) - 1):
+            for j in range(i + 1, len(ordem)):
+                candidata = ordem[:i] + ordem[i:j + 1][::-1] + ordem[j + 1:]
+                custo_candidata = custo(candidata)
+                if custo_candidata < melhor_custo - 1e-9:
+                    ordem, melhor_custo, melhorou = candidata, custo_candidata, True
+    return ordem
+
+
+def plano_guloso(oferta, distancias_consumidor, distancias_entre, custo_parada_km=2.0, ida_e_volta=False):
+    """
+    Plano heurístico para cobrir todos os itens de `oferta` (candidatas x itens; cada item deve
+    ser oferecido por ao menos uma candidata). Retorna (ordem das paradas, custo).
+    """
+    num_candidatas, num_itens = oferta.shape
+    todas = np.arange(num_candidatas)
+    cobertos = np.zeros(num_itens, dtype=bool)
+    paradas = []
+    # Menor distância de cada candidata até o percurso atual (consumidor ou alguma parada)
+    distancia_ao_percurso = distancias_consumidor.copy()
+    while not cobertos.all():
+        novos = (oferta & ~cobertos).sum(axis=1)
+        acrescimo = np.maximum(distancia_ao_percurso + custo_parada_km, 1e-9)
+        razao = np.where(novos > 0, novos / acrescimo, -1.0)
+        escolhida = int(np.argmax(razao))
+        paradas.append(escolhida)
+        cobertos |= oferta[escolhida]
+        distancia_ao_percurso = np.minimum(distancia_ao_percurso, distancias_entre([escolhida], todas)[0])
+
+    # Remove paradas cujos itens as outras já cobrem (as escolhidas por último primeiro)
+    for parada in reversed(list(paradas)):
+        outras = [outra for outra in paradas if outra != parada]
+        if outras and oferta[outras].any(axis=0).all():
+            paradas = outras
+
+    paradas = np.array(paradas, dtype=np.intp)
+    distancias_paradas = distancias_entre(paradas, paradas)
+    ordem = _ordenar_paradas(distancias_consumidor[paradas], distancias_paradas, ida_e_volta)
+    distancia = custo_percurso(distancias_consumidor[paradas[ordem]], distancias_paradas[np.ix_(ordem, ordem)], ida_e_volta)
+    return paradas[ordem].tolist(), distancia + custo_parada_km * len(ordem)
+
+
+def plano_exato(oferta, distancias_consumidor, distancias_candidatas, custo_parada_km=2.0, ida_e_volta=False,
+                prazo=None):
+    """
+    Plano ótimo por programação dinâmica sobre (máscara de itens cobertos, última parada), com a
+    matriz completa `distancias_candidatas` (candidatas x candidatas).
+    Retorna (ordem das paradas, custo), ou None se `prazo` (instante de `time.perf_counter`) passar.
+    """
+    num_candidatas, num_itens = oferta.shape
+    mascaras = oferta.astype(np.int64) @ (np.int64(1) << np.arange(num_itens, dtype=np.int64))
+    cheia = (1 << num_itens) - 1
+
+    custo = np.full((cheia + 1, num_candidatas), np.inf)
+    anterior = np.full((cheia + 1, num_candidatas), -1, dtype=np.intp)
+    mascara_anterior = np.zeros((cheia + 1, num_candidatas), dtype=np.int64)
+    custo[mascaras, np.arange(num_candidatas)] = distancias_consumidor + custo_parada_km
+    # Toda transição acrescenta itens, então a máscara seguinte é sempre maior que a atual
+    for mascara in range(1, cheia):
+        if prazo is not None and time.perf_counter() > prazo:
+            return None
+        ultimas = np.flatnonzero(np.isfinite(custo[mascara]))
+        if len(ultimas) == 0:
+            continue
+        proximas = np.flatnonzero(mascaras & ~mascara)
+        totais = custo[mascara, ultimas][:, np.newaxis] + distancias_candidatas[np.ix_(ultimas, proximas)]
+        melhores = np.argmin(totais, axis=0)
+        totais = totais[melhores, np.arange(len(proximas))] + custo_parada_km
+        seguintes = mascaras[proximas] | mascara
+        melhora = totais < custo[seguintes, proximas]
+        custo[seguintes[melhora], proximas[melhora]] = totais[melhora]
+        anterior[seguintes[melhora], proximas[melhora]] = ultimas[melhores[melhora]]
+        mascara_anterior[seguintes[melhora], proximas[melhora]] = mascara
+
+    finais = custo[cheia] + (distancias_consumidor if ida_e_volta else 0.0)
+    ultima = int(np.argmin(finais))
+    custo_final = float(finais[ultima])
+    if not np.isfinite(custo_final):
+        return None
+
+    # Reconstrói o percurso de trás para frente
+    ordem = []
+    mascara = cheia
+    while ultima >= 0:
+        ordem.append(ultima)
+        mascara, ultima = int(mascara_anterior[mascara, ultima]), int(anterior[mascara, ultima])
+    return ordem[::-1], custo_final
+
+
+def planejar(oferta, distancias_consumidor, distancias_entre, custo_parada_km=2.0, ida_e_volta=False,
+             orcamento_ms=50.0, max_itens_exato=MAX_ITENS_EXATO):
+    """
+    Melhor plano dentro do orçamento de tempo: o guloso e, se a cesta e as candidatas couberem,
+    o exato sobre as candidatas que ainda podem melhorar o guloso.
+    `distancias_entre(origens, destinos)`: matriz de distâncias (km) entre posições de `oferta`.
+    Retorna um dicionário com 'ordem' (posições em `oferta`), 'itens' (itens comprados em cada
+    parada), 'trechos_km' (distância de cada trecho até a parada), 'distancia_km' (total do
+    percurso), 'custo' e 'metodo' ('exato' ou 'guloso').
+    """
+    inicio = time.perf_counter()
+    ordem, custo = plano_guloso(oferta, distancias_consumidor, distancias_entre, custo_parada_km, ida_e_volta)
+    metodo = 'guloso'
+
+    # Um percurso que visita a candidata j custa ao menos a distância até ela (ida e volta, se for o caso) mais uma parada
+    uteis = np.flatnonzero(distancias_consumidor * (2 if ida_e_volta else 1) + custo_parada_km < custo - 1e-9)
+    num_itens = oferta.shape[1]
+    if num_itens == 0 or not oferta[uteis].any(axis=0).all():
+        # Só com as candidatas descartadas se cobre a cesta: nenhum plano melhora o guloso
+        metodo = 'exato'
+    elif num_itens <= max_itens_exato and (2 ** num_itens) * len(uteis) ** 2 <= LIMITE_TRABALHO_EXATO:
+        exato = plano_exato(
+            oferta[uteis], distancias_consumidor[uteis], distancias_entre(uteis, uteis),
+            custo_parada_km, ida_e_volta, prazo=inicio + orcamento_ms / 1000.0
+        )
+        if exato is not None:
+            metodo = 'exato'
+            if exato[1] < custo - 1e-9:
+                ordem, custo = uteis[exato[0]].tolist(), exato[1]
+
+    distancias_paradas = distancias_entre(ordem, ordem)
+    trechos = np.concatenate([distancias_consumidor[ordem[:1]], np.diagonal(distancias_paradas, offset=1)])
+    return {
+        'ordem': ordem,
+        'itens': itens_por_parada(ordem, oferta),
+        'trechos_km': trechos,
+        'distancia_km': custo_percurso(distancias_consumidor[ordem], distancias_paradas, ida_e_volta),
+        'custo': float(custo),
+        'metodo': metodo,
+    }
@@ -0,0 +1,586 @@
+"""
+Estruturas esparsas para a filtragem colaborativa.
+
+- As avaliações ficam em uma matriz CSR (consumidores x associações) montada
+  diretamente a partir da matriz de utilidade em formato longo.
+- A similaridade do cosseno entre associações é mantida como uma matriz CSR com
+  no máximo `k` vizinhos (os mais similares) por associação, sem a diagonal.
+
+A memória da inicialização fica proporcional ao número de avaliações
+(mais `n_associacoes x k`), em vez de consumidores x associações.
+
+Alternativamente, `ModeloFatoresLatentes` fatora a matriz centrada na média de cada
+consumidor com SVD truncada (`svds`) e pontua por produto escalar dos fatores.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix, diags
+
+COLUNAS_UTILIDADE_LONGA = ('id_consumidor', 'id_associacao', 'avaliacao')
+
+# Limite de elementos do bloco denso usado ao calcular a similaridade por partes
+ELEMENTOS_POR_BLOCO = 2_000_000
+
+# Backends colaborativos disponíveis em SistemaRecomendacaoDF
+BACKENDS_COLABORATIVOS = ('item_item', 'svd')
+
+
+def utilidade_pivot_para_longa(df_utility_pivot):
+    """Converte a matriz de utilidade pivotada (NaN = sem avaliação) para o formato longo."""
+    valores = df_utility_pivot.to_numpy(dtype=float)
+    linhas, colunas = np.nonzero(~np.isnan(valores))
+    return pd.DataFrame({
+        'id_consumidor': df_utility_pivot.index.to_numpy()[linhas],
+        'id_associacao': df_utility_pivot.columns.to_numpy()[colunas],
+        'avaliacao': valores[linhas, colunas],
+    })
+
+
+def matriz_avaliacoes_esparsa(df_utility_long):
+    """
+    Monta a matriz CSR (consumidores x associações) a partir do formato longo.
+
+    Retorna (matriz, indice_consumidores, indice_associacoes), em que os índices
+    (pd.Index) mapeiam IDs para as posições de linha/coluna da matriz.
+    Avaliações repetidas para o mesmo par mantêm a última.
+    """
+    df_utility_long = df_utility_long.drop_duplicates(subset=['id_consumidor', 'id_associacao'], keep='last')
+    codigos_consumidores, consumidores = pd.factorize(df_utility_long['id_consumidor'], sort=True)
+    codigos_associacoes, associacoes = pd.factorize(df_utility_long['id_associacao'], sort=True)
+    matriz = csr_matrix(
+        (df_utility_long['avaliacao'].to_numpy(dtype=float), (codigos_consumidores, codigos_associacoes)),
+        shape=(len(consumidores), len(associacoes))
+    )
+    # Avaliações 0 equivalem a "sem avaliação" (como no fillna(0))
+    matriz.eliminate_zeros()
+    return matriz, pd.Index(consumidores), pd.Index(associacoes)
+
+
+def similaridade_cosseno_top_k(matriz_avaliacoes, k=50):
+    """
+    Similaridade do cosseno entre as colunas (associações) de `matriz_avaliacoes`,
+    mantendo apenas os `k` vizinhos mais similares (e positivos) de cada associação.
+    A diagonal (autossimilaridade) não é armazenada.
+
+    O cálculo é feito em blocos de associações, para que a parte densa
+    intermediária nunca passe de `ELEMENTOS_POR_BLOCO` elementos.
+    """
+    num_associacoes = matriz_avaliacoes.shape[1]
+    k = min(k, num_associacoes - 1)
+    if k <= 0:
+        return csr_matrix((num_associacoes, num_associacoes))
+
+    normas = np.sqrt(np.asarray(matriz_avaliacoes.multiply(matriz_avaliacoes).sum(axis=0)).ravel())
+    inverso_normas = np.divide(1.0, normas, out=np.zeros_like(normas), where=normas > 0)
+    normalizada = (matriz_avaliacoes @ diags(inverso_normas)).tocsc()
+    normalizada_t = normalizada.T.tocsr()
+
+    tamanho_bloco = max(1, ELEMENTOS_POR_BLOCO // num_associacoes)
+    linhas, colunas, valores = [], [], []
+    for inicio in range(0, num_associacoes, tamanho_bloco):
+        fim = min(inicio + tamanho_bloco, num_associacoes)
+        bloco = (normalizada_t[inicio:fim] @ normalizada).toarray()
+        posicoes_bloco = np.arange(fim - inicio)
+        bloco[posicoes_bloco, np.arange(inicio, fim)] = -np.inf  # Exclui a autossimilaridade
+
+        vizinhos = np.argpartition(-bloco, k - 1, axis=1)[:, :k]
+        similaridades = np.take_along_axis(bloco, vizinhos, axis=1)
+        positivas = similaridades > 0
+        linhas.append(np.repeat(np.arange(inicio, fim), k)[positivas.ravel()])
+        colunas.append(vizinhos[positivas])
+        valores.append(similaridades[positivas])
+
+    return csr_matrix(
+        (np.concatenate(valores), (np.concatenate(linhas), np.concatenate(colunas))),
+        shape=(num_associacoes, num_associacoes)
+    )
+
+
+def scores_colaborativos(avaliacoes_consumidores, similaridade_candidatas, posicoes_candidatas, limiar_avaliacao=3.5):
+    """
+    Scores colaborativos brutos (consumidores x candidatas).
+
+    `similaridade_candidatas` são as linhas da similaridade top-k das candidatas,
+    cujas colunas em `avaliacoes_consumidores` são `posicoes_candidatas`.
+
+    Para cada candidata: soma de similaridade x avaliação sobre as associações que o
+    consumidor avaliou bem (>= `limiar_avaliacao`), dividida pelo número dessas
+    associações (excluindo a própria candidata). Vizinhos fora do top-k contam como
+    similaridade 0.
+    """
+    bem_avaliadas = avaliacoes_consumidores.copy()
+    bem_avaliadas.data = np.where(bem_avaliadas.data >= limiar_avaliacao, bem_avaliadas.data, 0.0)
+    bem_avaliadas.eliminate_zeros()
+
+    soma_ponderada = (bem_avaliadas @ similaridade_candidatas.T).toarray()
+    candidata_bem_avaliada = bem_avaliadas[:, posicoes_candidatas].toarray() > 0
+    contagem_usada = np.diff(bem_avaliadas.indptr)[:, np.newaxis] - candidata_bem_avaliada
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(contagem_usada > 0, soma_ponderada / contagem_usada, 0.0)
+
+
+class MatrizLinhasMutaveis:
+    """
+    Matriz CSR cujas linhas podem ser substituídas sem reconstruir a matriz inteira.
+
+    As linhas alteradas ficam em um dicionário (`linhas_alteradas`) e sobrepõem a
+    matriz base; quando passam de ~10% das linhas, a matriz é compactada.
+    """
+    def __init__(self, matriz_base):
+        self.base = matriz_base.tocsr()
+        self.shape = self.base.shape
+        self.linhas_alteradas = {}
+
+    def linha(self, posicao):
+        """Retorna (colunas, valores) da linha, com as colunas em ordem crescente."""
+        if posicao in self.linhas_alteradas:
+            return self.linhas_alteradas[posicao]
+        if posicao >= self.base.shape[0]:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        inicio, fim = self.base.indptr[posicao], self.base.indptr[posicao + 1]
+        return self.base.indices[inicio:fim], self.base.data[inicio:fim]
+
+    def substituir_linha(self, posicao, colunas, valores):
+        ordem = np.argsort(colunas, kind='stable')
+        self.linhas_alteradas[posicao] = (np.asarray(colunas, dtype=np.int64)[ordem], np.asarray(valores, dtype=float)[ordem])
+        if len(self.linhas_alteradas) > max(64, self.shape[0] // 10):
+            self.compactar()
+
+    def somar_na_linha(self, posicao, colunas, deltas):
+        """Soma `deltas` às entradas (`posicao`, `colunas`), removendo as que zerarem."""
+        colunas_atuais, valores_atuais = self.linha(posicao)
+        todas_colunas, inverso = np.unique(
+            np.concatenate([colunas_atuais, np.asarray(colunas, dtype=np.int64)]), return_inverse=True
+        )
+        somas = np.bincount(inverso, weights=np.concatenate([valores_atuais, np.asarray(deltas, dtype=float)]))
+        nao_nulas = np.abs(somas) > 1e-12
+        self.substituir_linha(posicao, todas_colunas[nao_nulas], somas[nao_nulas])
+
+    def redimensionar(self, num_linhas, num_colunas):
+        self.shape = (max(num_linhas, self.shape[0]), max(num_colunas, self.shape[1]))
+
+    def linhas(self, posicoes):
+        """Submatriz CSR com as linhas em `posicoes` (na ordem dada)."""
+        posicoes = np.asarray(posicoes, dtype=np.int64)
+        na_base = posicoes < self.base.shape[0]
+        if self.linhas_alteradas:
+            na_base &= ~np.isin(posicoes, np.fromiter(self.linhas_alteradas, dtype=np.int64, count=len(self.linhas_alteradas)))
+
+        submatriz_base = self.base[posicoes[na_base]].tocoo()
+        linhas_base = np.flatnonzero(na_base)
+        partes_linhas, partes_colunas, partes_valores = [linhas_base[submatriz_base.row]], [submatriz_base.col], [submatriz_base.data]
+        for linha_resultado in np.flatnonzero(~na_base):
+            colunas, valores = self.linha(int(posicoes[linha_resultado]))
+            partes_linhas.append(np.full(len(colunas), linha_resultado))
+            partes_colunas.append(colunas)
+            partes_valores.append(valores)
+        return csr_matrix(
+            (np.concatenate(partes_valores), (np.concatenate(partes_linhas), np.concatenate(partes_colunas))),
+            shape=(len(posicoes), self.shape[1])
+        )
+
+    def compactar(self):
+        """Incorpora as linhas alteradas à matriz base."""
+        self.base = self.linhas(np.arange(self.shape[0]))
+        self.linhas_alteradas = {}
+
+
+class ModeloItemItem:
+    """
+    Filtragem colaborativa item-item: avaliações esparsas + similaridade do cosseno top-k,
+    com atualização incremental das avaliações.
+
+    Na primeira atualização são montados (e depois mantidos) os produtos escalares entre
+    associações avaliadas pelos mesmos consumidores e as normas de cada associação. Cada
+    mudança de avaliação atualiza apenas os pares afetados e as listas de vizinhos que mudaram.
+    """
+    BACKEND = 'item_item'
+    # Avaliações de um consumidor mudam a similaridade entre associações (e os scores dos demais)
+    ATUALIZACAO_AFETA_OUTROS_CONSUMIDORES = True
+
+    def __init__(self, df_utility_long, k=50, limiar_avaliacao=3.5):
+        self.k = k
+        self.limiar_avaliacao = limiar_avaliacao
+        matriz, consumidores, associacoes = matriz_avaliacoes_esparsa(df_utility_long)
+        self._definir_estado(matriz, similaridade_cosseno_top_k(matriz, k=k), consumidores, associacoes)
+
+    def _definir_estado(self, matriz, similaridade, consumidores, associacoes):
+        self.avaliacoes = MatrizLinhasMutaveis(matriz)
+        self.vizinhos = MatrizLinhasMutaveis(similaridade)
+        self.num_avaliacoes = matriz.nnz
+        self.posicao_consumidor = {consumidor: posicao for posicao, consumidor in enumerate(consumidores)}
+        self.posicao_associacao = {associacao: posicao for posicao, associacao in enumerate(associacoes)}
+        # Montados sob demanda na primeira atualização incremental
+        self.produtos_escalares = None
+        self.normas_quadradas = None
+
+    def para_arrays(self):
+        """Estado do modelo como arrays NumPy (avaliações e vizinhos em CSR, IDs e parâmetros)."""
+        self.avaliacoes.compactar()
+        self.vizinhos.compactar()
+        return {
+            **_csr_para_arrays('avaliacoes', self.avaliacoes.base),
+            **_csr_para_arrays('vizinhos', self.vizinhos.base),
+            'ids_consumidores': _ids_para_array(self.posicao_consumidor),
+            'ids_associacoes': _ids_para_array(self.posicao_associacao),
+            'parametros': np.array([self.k, self.limiar_avaliacao], dtype=float),
+        }
+
+    @classmethod
+    def de_arrays(cls, arrays):
+        """Reconstrói o modelo a partir de `para_arrays`, sem recalcular a similaridade."""
+        modelo = cls.__new__(cls)
+        k, modelo.limiar_avaliacao = arrays['parametros']
+        modelo.k = int(k)
+        modelo._definir_estado(
+            _csr_de_arrays('avaliacoes', arrays), _csr_de_arrays('vizinhos', arrays),
+            _ids_de_array(arrays['ids_consumidores']), _ids_de_array(arrays['ids_associacoes'])
+        )
+        return modelo
+
+    @property
+    def shape(self):
+        return self.avaliacoes.shape
+
+    @property
+    def disponivel(self):
+        return self.num_avaliacoes > 0 and len(self.posicao_associacao) > 1
+
+    def conhece_consumidor(self, consumidor_id):
+        return consumidor_id in self.posicao_consumidor
+
+    def scores(self, consumer_ids, association_ids):
+        """Scores colaborativos brutos (consumidores x associações); 0 para IDs sem avaliações."""
+        scores = np.zeros((len(consumer_ids), len(association_ids)))
+        if not self.disponivel:
+            return scores
+        posicoes_consumidores = np.array([self.posicao_consumidor.get(c, -1) for c in consumer_ids], dtype=np.int64)
+        posicoes_associacoes = np.array([self.posicao_associacao.get(a, -1) for a in association_ids], dtype=np.int64)
+        consumidores_conhecidos = posicoes_consumidores >= 0
+        associacoes_conhecidas = posicoes_associacoes >= 0
+        if not consumidores_conhecidos.any() or not associacoes_conhecidas.any():
+            return scores
+
+        posicoes_candidatas = posicoes_associacoes[associacoes_conhecidas]
+        scores[np.ix_(consumidores_conhecidos, associacoes_conhecidas)] = scores_colaborativos(
+            self.avaliacoes.linhas(posicoes_consumidores[consumidores_conhecidos]),
+            self.vizinhos.linhas(posicoes_candidatas),
+            posicoes_candidatas,
+            self.limiar_avaliacao
+        )
+        return scores
+
+    def atualizar_avaliacoes(self, consumidor_id, avaliacoes):
+        """
+        Aplica as avaliações {id_associacao: avaliacao} do consumidor; avaliação 0 ou None remove.
+        Consumidores e associações novos são incluídos na matriz.
+        """
+        if self.produtos_escalares is None:
+            self._montar_produtos_escalares()
+
+        if consumidor_id not in self.posicao_consumidor:
+            self.posicao_consumidor[consumidor_id] = len(self.posicao_consumidor)
+        posicao_consumidor = self.posicao_consumidor[consumidor_id]
+        for associacao_id, avaliacao in avaliacoes.items():
+            if associacao_id not in self.posicao_associacao:
+                if not avaliacao:
+                    continue
+                self._incluir_associacao(associacao_id)
+            self._atualizar_avaliacao(posicao_consumidor, self.posicao_associacao[associacao_id], float(avaliacao or 0.0))
+        self.avaliacoes.redimensionar(len(self.posicao_consumidor), len(self.posicao_associacao))
+
+    def _montar_produtos_escalares(self):
+        matriz = self.avaliacoes.linhas(np.arange(self.shape[0]))
+        gram = (matriz.T @ matriz).tocsr()
+        self.normas_quadradas = gram.diagonal().astype(float)
+        gram.setdiag(0)
+        gram.eliminate_zeros()
+        self.produtos_escalares = MatrizLinhasMutaveis(gram)
+
+    def _incluir_associacao(self, associacao_id):
+        posicao = len(self.posicao_associacao)
+        self.posicao_associacao[associacao_id] = posicao
+        self.normas_quadradas = np.append(self.normas_quadradas, 0.0)
+        for matriz in (self.avaliacoes, self.vizinhos, self.produtos_escalares):
+            matriz.redimensionar(matriz.shape[0] if matriz is self.avaliacoes else posicao + 1, posicao + 1)
+
+    def _atualizar_avaliacao(self, posicao_consumidor, posicao_associacao, nova_avaliacao):
+        colunas, valores = self.avaliacoes.linha(posicao_consumidor)
+        eh_alvo = colunas == posicao_associacao
+        avaliacao_anterior = valores[eh_alvo][0] if eh_alvo.any() else 0.0
+        variacao = nova_avaliacao - avaliacao_anterior
+        if variacao == 0:
+            return
+
+        # Produtos escalares com as outras associações avaliadas pelo consumidor (pares simétricos)
+        outras_colunas, outras_avaliacoes = colunas[~eh_alvo], valores[~eh_alvo]
+        vizinhas_antes = self.produtos_escalares.linha(posicao_associacao)[0]
+        self.produtos_escalares.somar_na_linha(posicao_associacao, outras_colunas, variacao * outras_avaliacoes)
+        for outra_coluna, outra_avaliacao in zip(outras_colunas, outras_avaliacoes):
+            self.produtos_escalares.somar_na_linha(outra_coluna, [posicao_associacao], [variacao * outra_avaliacao])
+        self.normas_quadradas[posicao_associacao] += nova_avaliacao ** 2 - avaliacao_anterior ** 2
+
+        if nova_avaliacao:
+            self.avaliacoes.somar_na_linha(posicao_consumidor, [posicao_associacao], [variacao])
+        else:
+            self.avaliacoes.substituir_linha(posicao_consumidor, outras_colunas, outras_avaliacoes)
+        self.num_avaliacoes += int(nova_avaliacao != 0) - int(avaliacao_anterior != 0)
+
+        # A norma da associação mudou: a similaridade com todas as suas vizinhas muda
+        self._recalcular_vizinhos(posicao_associacao)
+        colunas_depois, produtos_depois = self.produtos_escalares.linha(posicao_associacao)
+        similaridades_depois = dict(zip(colunas_depois, self._similaridades(posicao_associacao, colunas_depois, produtos_depois)))
+        for vizinha in np.union1d(vizinhas_antes, colunas_depois):
+            colunas_vizinha, similaridades_vizinha = self.vizinhos.linha(vizinha)
+            nova_similaridade = similaridades_depois.get(vizinha, 0.0)
+            if posicao_associacao in colunas_vizinha or (
+                nova_similaridade > 0 and (len(colunas_vizinha) < self.k or nova_similaridade > similaridades_vizinha.min())
+            ):
+                self._recalcular_vizinhos(vizinha)
+
+    def _similaridades(self, posicao, colunas, produtos):
+        normas = np.sqrt(self.normas_quadradas[posicao] * self.normas_quadradas[colunas])
+        return np.divide(produtos, normas, out=np.zeros_like(produtos, dtype=float), where=normas > 0)
+
+    def _recalcular_vizinhos(self, posicao):
+        """Recalcula os top-k vizinhos de uma associação a partir dos produtos escalares em cache."""
+        colunas, produtos = self.produtos_escalares.linha(posicao)
+        similaridades = self._similaridades(posicao, colunas, produtos)
+        positivas = similaridades > 0
+        colunas, similaridades = colunas[positivas], similaridades[positivas]
+        if len(colunas) > self.k:
+            melhores = np.argpartition(-similaridades, self.k - 1)[:self.k]
+            colunas, similaridades = colunas[melhores], similaridades[melhores]
+        self.vizinhos.substituir_linha(posicao, colunas, similaridades)
+
+
+class ModeloFatoresLatentes:
+    """
+    Filtragem colaborativa por fatores latentes: SVD truncada da matriz de avaliações
+    centrada na média de cada consumidor.
+
+    R - médias ≈ U S Vᵀ; guardam-se os fatores dos consumidores (U S), das associações (V)
+    e as médias. O score (avaliação prevista) é média + fator_consumidor · fator_associacao,
+    em O(k). Consumidores novos entram por folding-in (r_centrado V), sem refatorar.
+    """
+    BACKEND = 'svd'
+    # O folding-in só recalcula o fator do próprio consumidor
+    ATUALIZACAO_AFETA_OUTROS_CONSUMIDORES = False
+    ARQUIVOS = ('fatores_consumidores', 'fatores_associacoes', 'medias_consumidores',
+                'ids_consumidores', 'ids_associacoes',
+                'avaliacoes_treino_data', 'avaliacoes_treino_indices', 'avaliacoes_treino_indptr', 'avaliacoes_treino_shape',
+                'dobradas_consumidores', 'dobradas_offsets', 'dobradas_associacoes', 'dobradas_avaliacoes')
+
+    def __init__(self, df_utility_long=None, k=20, random_state=0):
+        self.k = k
+        self.fatores_consumidores = np.zeros((0, 0))
+        self.fatores_associacoes = np.zeros((0, 0))
+        self.medias_consumidores = np.zeros(0)
+        self.posicao_consumidor = {}
+        self.posicao_associacao = {}
+        # Avaliações do treino e as aplicadas depois por folding-in (que substituem as do treino)
+        self.avaliacoes_treino = None
+        self.avaliacoes_dobradas = {}
+        if df_utility_long is not None:
+            self.treinar(df_utility_long, random_state=random_state)
+
+    @property
+    def disponivel(self):
+        return self.fatores_associacoes.shape[1] > 0
+
+    def conhece_consumidor(self, consumidor_id):
+        return consumidor_id in self.posicao_consumidor
+
+    def treinar(self, df_utility_long, random_state=0):
+        matriz, consumidores, associacoes = matriz_avaliacoes_esparsa(df_utility_long)
+        self.posicao_consumidor = {consumidor: posicao for posicao, consumidor in enumerate(consumidores)}
+        self.posicao_associacao = {associacao: posicao for posicao, associacao in enumerate(associacoes)}
+        self.avaliacoes_treino = matriz
+        self.avaliacoes_dobradas = {}
+
+        num_avaliacoes = np.diff(matriz.indptr)
+        somas = np.asarray(matriz.sum(axis=1)).ravel()
+        self.medias_consumidores = np.divide(somas, num_avaliacoes, out=np.zeros(len(somas)), where=num_avaliacoes > 0)
+        # Centraliza só as avaliações existentes (ausência continua sendo "sem informação")
+        centrada = matriz.copy()
+        centrada.data = centrada.data - np.repeat(self.medias_consumidores, num_avaliacoes)
+
+        k = min(self.k, min(centrada.shape) - 1)
+        if k < 1 or centrada.nnz == 0:
+            self.fatores_consumidores = np.zeros((centrada.shape[0], 0))
+            self.fatores_associacoes = np.zeros((centrada.shape[1], 0))
+            return self
+        from scipy.sparse.linalg import svds  # importado só no treino (carregar um modelo não precisa)
+        u, s, vt = svds(centrada, k=k, random_state=random_state)
+        ordem = np.argsort(s)[::-1]
+        self.fatores_consumidores = u[:, ordem] * s[ordem]
+        self.fatores_associacoes = vt[ordem].T
+        return self
+
+    def dobrar_consumidor(self, avaliacoes):
+        """Folding-in: (fator, média) de um consumidor a partir de {id_associacao: avaliacao}."""
+        conhecidas = [(self.posicao_associacao[a], float(r)) for a, r in avaliacoes.items()
+                      if r and a in self.posicao_associacao]
+        if not conhecidas:
+            return np.zeros(self.fatores_associacoes.shape[1]), 0.0
+        posicoes, valores = map(np.array, zip(*conhecidas))
+        media = valores.mean()
+        return (valores - media) @ self.fatores_associacoes[posicoes], media
+
+    def atualizar_avaliacoes(self, consumidor_id, avaliacoes):
+        """
+        Aplica as avaliações {id_associacao: avaliacao} (0 ou None remove) e recalcula o fator do
+        consumidor por folding-in. As associações mantêm os fatores do treino; associações
+        desconhecidas só passam a contar no próximo `treinar`.
+        """
+        avaliacoes_consumidor = self._avaliacoes_do_consumidor(consumidor_id)
+        for associacao_id, avaliacao in avaliacoes.items():
+            if avaliacao:
+                avaliacoes_consumidor[associacao_id] = float(avaliacao)
+            else:
+                avaliacoes_consumidor.pop(associacao_id, None)
+        self.avaliacoes_dobradas[consumidor_id] = avaliacoes_consumidor
+
+        fator, media = self.dobrar_consumidor(avaliacoes_consumidor)
+        if consumidor_id not in self.posicao_consumidor:
+            self.posicao_consumidor[consumidor_id] = len(self.posicao_consumidor)
+            self.fatores_consumidores = np.vstack([self.fatores_consumidores, fator])
+            self.medias_consumidores = np.append(self.medias_consumidores, media)
+        else:
+            # Fatores carregados com mmap são somente leitura: copia antes da primeira escrita
+            if not self.fatores_consumidores.flags.writeable:
+                self.fatores_consumidores = np.array(self.fatores_consumidores)
+                self.medias_consumidores = np.array(self.medias_consumidores)
+            posicao = self.posicao_consumidor[consumidor_id]
+            self.fatores_consumidores[posicao] = fator
+            self.medias_consumidores[posicao] = media
+
+    def _avaliacoes_do_consumidor(self, consumidor_id):
+        """Avaliações atuais do consumidor como {id_associacao: avaliacao} (vazio se desconhecidas)."""
+        if consumidor_id in self.avaliacoes_dobradas:
+            return dict(self.avaliacoes_dobradas[consumidor_id])
+        posicao = self.posicao_consumidor.get(consumidor_id)
+        if self.avaliacoes_treino is None or posicao is None or posicao >= self.avaliacoes_treino.shape[0]:
+            return {}
+        inicio, fim = self.avaliacoes_treino.indptr[posicao], self.avaliacoes_treino.indptr[posicao + 1]
+        ids_associacoes = list(self.posicao_associacao)
+        return {ids_associacoes[coluna]: float(valor) for coluna, valor in
+                zip(self.avaliacoes_treino.indices[inicio:fim], self.avaliacoes_treino.data[inicio:fim])}
+
+    def scores(self, consumer_ids, association_ids):
+        """Avaliações previstas (consumidores x associações), >= 0; 0 para IDs fora do treino."""
+        scores = np.zeros((len(consumer_ids), len(association_ids)))
+        posicoes_consumidores = np.array([self.posicao_consumidor.get(c, -1) for c in consumer_ids], dtype=np.int64)
+        posicoes_associacoes = np.array([self.posicao_associacao.get(a, -1) for a in association_ids], dtype=np.int64)
+        consumidores_conhecidos = posicoes_consumidores >= 0
+        associacoes_conhecidas = posicoes_associacoes >= 0
+        if not self.disponivel or not consumidores_conhecidos.any() or not associacoes_conhecidas.any():
+            return scores
+
+        posicoes_consumidores = posicoes_consumidores[consumidores_conhecidos]
+        previstas = (
+            self.medias_consumidores[posicoes_consumidores, None]
+            + self.fatores_consumidores[posicoes_consumidores] @ self.fatores_associacoes[posicoes_associacoes[associacoes_conhecidas]].T
+        )
+        scores[np.ix_(consumidores_conhecidos, associacoes_conhecidas)] = np.clip(previstas, 0.0, None)
+        return scores
+
+    def para_arrays(self):
+        """
+        Fatores, médias e IDs como arrays NumPy, com as avaliações do treino (CSR) e as aplicadas
+        por folding-in, para que `atualizar_avaliacoes` continue a partir do histórico do consumidor.
+        """
+        avaliacoes_treino = self.avaliacoes_treino
+        if avaliacoes_treino is None:
+            avaliacoes_treino = csr_matrix((len(self.posicao_consumidor), len(self.posicao_associacao)))
+        # Avaliações dobradas em listas com offsets: consumidor i tem as entradas offsets[i]:offsets[i + 1]
+        # (um consumidor sem nenhuma entrada também é guardado: a lista vazia substitui a do treino)
+        dobradas = list(self.avaliacoes_dobradas.items())
+        return {
+            'fatores_consumidores': self.fatores_consumidores,
+            'fatores_associacoes': self.fatores_associacoes,
+            'medias_consumidores': self.medias_consumidores,
+            'ids_consumidores': _ids_para_array(self.posicao_consumidor),
+            'ids_associacoes': _ids_para_array(self.posicao_associacao),
+            **_csr_para_arrays('avaliacoes_treino', avaliacoes_treino),
+            'dobradas_consumidores': _ids_para_array([consumidor for consumidor, _ in dobradas]),
+            'dobradas_offsets': np.concatenate([[0], np.cumsum([len(avaliacoes) for _, avaliacoes in dobradas])]).astype(np.int64),
+            'dobradas_associacoes': _ids_para_array([a for _, avaliacoes in dobradas for a in avaliacoes]),
+            'dobradas_avaliacoes': np.array([r for _, avaliacoes in dobradas for r in avaliacoes.values()], dtype=float),
+        }
+
+    @classmethod
+    def de_arrays(cls, arrays):
+        """
+        Reconstrói o modelo a partir de `para_arrays` (os arrays são usados sem cópia).
+        Sem os arrays de avaliações (modelos salvos antes deles), atualizar um consumidor
+        existente parte só das novas avaliações.
+        """
+        modelo = cls()
+        modelo.fatores_consumidores = arrays['fatores_consumidores']
+        modelo.fatores_associacoes = arrays['fatores_associacoes']
+        modelo.medias_consumidores = arrays['medias_consumidores']
+        modelo.k = modelo.fatores_associacoes.shape[1]
+        modelo.posicao_consumidor = {_id: posicao for posicao, _id in enumerate(_ids_de_array(arrays['ids_consumidores']))}
+        modelo.posicao_associacao = {_id: posicao for posicao, _id in enumerate(_ids_de_array(arrays['ids_associacoes']))}
+        if 'avaliacoes_treino_data' in arrays:
+            modelo.avaliacoes_treino = _csr_de_arrays('avaliacoes_treino', arrays)
+        if 'dobradas_consumidores' in arrays:
+            offsets = np.asarray(arrays['dobradas_offsets'])
+            associacoes = _ids_de_array(arrays['dobradas_associacoes'])
+            avaliacoes = np.asarray(arrays['dobradas_avaliacoes']).tolist()
+            modelo.avaliacoes_dobradas = {
+                consumidor: dict(zip(associacoes[inicio:fim], avaliacoes[inicio:fim]))
+                for consumidor, inicio, fim in zip(_ids_de_array(arrays['dobradas_consumidores']), offsets[:-1], offsets[1:])
+            }
+        return modelo
+
+    def salvar(self, diretorio):
+        """Salva fatores, médias, IDs e avaliações como arquivos `.npy` em `diretorio`."""
+        os.makedirs(diretorio, exist_ok=True)
+        for nome, array in self.para_arrays().items():
+            np.save(os.path.join(diretorio, f"{nome}.npy"), array, allow_pickle=False)
+
+    @classmethod
+    def carregar(cls, diretorio, mmap_mode=None):
+        """Carrega um modelo salvo por `salvar` (`mmap_mode='r'` mapeia os fatores sem lê-los inteiros)."""
+        # Os arquivos das avaliações podem faltar em modelos salvos antes deles
+        caminhos = {nome: os.path.join(diretorio, f"{nome}.npy") for nome in cls.ARQUIVOS}
+        return cls.de_arrays({
+            nome: np.load(caminho, mmap_mode=mmap_mode, allow_pickle=False)
+            for nome, caminho in caminhos.items() if os.path.exists(caminho)
+        })
+
+
+def _ids_para_array(posicoes):
+    """IDs (na ordem das posições) como array sem objetos Python: inteiros se todos forem, senão texto."""
+    ids = list(posicoes)
+    if all(isinstance(_id, (int, np.integer)) for _id in ids):
+        return np.array(ids, dtype=np.int64)
+    return np.array([str(_id) for _id in ids], dtype=str)
+
+
+def _ids_de_array(ids):
+    """Inverso de `_ids_para_array`: lista de IDs como objetos Python (int ou str)."""
+    return np.asarray(ids).tolist()
+
+
+def _csr_para_arrays(prefixo, matriz):
+    return {
+        f'{prefixo}_data': matriz.data, f'{prefixo}_indices': matriz.indices,
+        f'{prefixo}_indptr': matriz.indptr, f'{prefixo}_shape': np.array(matriz.shape, dtype=np.int64),
+    }
+
+
+def _csr_de_arrays(prefixo, arrays):
+    return csr_matrix(
+        (arrays[f'{prefixo}_data'], arrays[f'{prefixo}_indices'], arrays[f'{prefixo}_indptr']),
+        shape=tuple(arrays[f'{prefixo}_shape'])
+    )
+
+
+# Modelo de cada backend colaborativo (para reconstruir um modelo salvo)
+MODELOS_COLABORATIVOS = {modelo.BACKEND: modelo for modelo in (ModeloItemItem, ModeloFatoresLatentes)}
@@ -0,0 +1,49 @@
+"""
+Etapa de build: prepara os dados (`recomendador.dados`), monta o `SistemaRecomendacaoDF`
+e grava o artefato `.npz` que `SistemaRecomendacaoDF.carregar` lê em milissegundos.
+
+    python -m recomendador.construir artefatos/recomendador.npz
+    python -m recomendador.construir artefatos/recomendador_svd.npz --backend svd --fatores 20
+"""
+import argparse
+import os
+
+from recomendador.dados import (
+    carregar_associacoes, carregar_nutrientes, carregar_producao, carregar_sazonalidade, simular_avaliacoes
+)
+from recomendador.sistema import SistemaRecomendacaoDF
+from recomendador.colaborativo import BACKENDS_COLABORATIVOS
+from recomendador.distancia import METODOS_DISTANCIA
+
+
+def construir(caminho, distance_method='elipsoidal', similarity_top_k=50, collaborative_backend='item_item',
+              latent_factors=20):
+    """Monta o sistema com os dados do projeto e grava o artefato em `caminho`. Retorna o sistema."""
+    df_associacoes = carregar_associacoes()
+    sistema = SistemaRecomendacaoDF(
+        df_associacoes, carregar_nutrientes(), carregar_producao(), simular_avaliacoes(df_associacoes),
+        distance_method=distance_method, similarity_top_k=similarity_top_k,
+        collaborative_backend=collaborative_backend, latent_factors=latent_factors,
+        seasonality_df=carregar_sazonalidade()
+    )
+    diretorio = os.path.dirname(caminho)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    sistema.salvar(caminho)
+    return sistema
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera o artefato .npz do Sistema de Recomendação do DF.")
+    parser.add_argument('caminho', help="Arquivo .npz de saída")
+    parser.add_argument('--distancia', choices=METODOS_DISTANCIA, default='elipsoidal')
+    parser.add_argument('--top-k', type=int, default=50, help="Vizinhos por associação (backend item_item)")
+    parser.add_argument('--backend', choices=BACKENDS_COLABORATIVOS, default='item_item')
+    parser.add_argument('--fatores', type=int, default=20, help="Fatores latentes (backend svd)")
+    args = parser.parse_args(argv)
+    construir(args.caminho, args.distancia, args.top_k, args.backend, args.fatores)
+    print(f"Artefato gravado em {args.caminho}")
+
+
+if __name__ == '__main__':
+    main()
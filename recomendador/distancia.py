@@ -0,0 +1,75 @@
+"""
+Cálculo vetorizado de distâncias entre consumidores e associações.
+
+Substitui as chamadas individuais a `geopy.distance.geodesic` por operações
+NumPy sobre arrays de coordenadas, devolvendo uma matriz de distâncias
+(consumidores x associações) em km.
+
+Métodos disponíveis:
+- 'elipsoidal' (padrão): fórmula de Lambert sobre o elipsoide WGS-84. Erro relativo
+  abaixo de 0,01% em relação à geodésica (< 1 m nas distâncias do DF), então o
+  filtro de raio mantém as mesmas candidatas de `geodesic`.
+- 'haversine': esfera de raio médio (um pouco mais rápido). Erro relativo de até
+  ~0,6% em relação à geodésica no elipsoide WGS-84 (~0,5 km em 100 km): associações
+  perto da borda do raio podem entrar ou sair do resultado.
+"""
+import numpy as np
+
+RAIO_MEDIO_TERRA_KM = 6371.0088  # Raio médio (IUGG)
+SEMI_EIXO_MAIOR_KM = 6378.137  # WGS-84
+ACHATAMENTO = 1 / 298.257223563  # WGS-84
+
+METODOS_DISTANCIA = ('haversine', 'elipsoidal')
+
+
+def _angulo_central(lat1, lon1, lat2, lon2):
+    """Ângulo central (rad) entre pontos, pela fórmula do haversine. Entradas em radianos."""
+    seno_dlat = np.sin((lat2 - lat1) / 2.0)
+    seno_dlon = np.sin((lon2 - lon1) / 2.0)
+    h = seno_dlat ** 2 + np.cos(lat1) * np.cos(lat2) * seno_dlon ** 2
+    return 2.0 * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Distância em km sobre uma esfera de raio médio. Aceita escalares ou arrays (com broadcasting)."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    return RAIO_MEDIO_TERRA_KM * _angulo_central(lat1, lon1, lat2, lon2)
+
+
+def elipsoidal_km(lat1, lon1, lat2, lon2):
+    """Distância em km no elipsoide WGS-84 (fórmula de Lambert). Aceita escalares ou arrays."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    # Latitudes reduzidas
+    beta1 = np.arctan((1 - ACHATAMENTO) * np.tan(lat1))
+    beta2 = np.arctan((1 - ACHATAMENTO) * np.tan(lat2))
+    sigma = _angulo_central(beta1, lon1, beta2, lon2)
+
+    p = (beta1 + beta2) / 2.0
+    q = (beta2 - beta1) / 2.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = (sigma - np.sin(sigma)) * (np.sin(p) * np.cos(q)) ** 2 / np.cos(sigma / 2.0) ** 2
+        y = (sigma + np.sin(sigma)) * (np.cos(p) * np.sin(q)) ** 2 / np.sin(sigma / 2.0) ** 2
+        distancia = SEMI_EIXO_MAIOR_KM * (sigma - ACHATAMENTO / 2.0 * (x + y))
+    # Pontos coincidentes geram 0/0 no termo de correção
+    return np.where(sigma == 0, 0.0, distancia)
+
+
+def matriz_distancias_km(lat_usuarios, lon_usuarios, lat_associacoes, lon_associacoes, metodo='elipsoidal'):
+    """
+    Calcula a matriz de distâncias (n_usuarios x n_associacoes) em km.
+
+    Coordenadas NaN (de qualquer um dos lados) resultam em distância `inf`,
+    mantendo o comportamento de `_calculate_distance_km`.
+    """
+    if metodo not in METODOS_DISTANCIA:
+        raise ValueError(f"Método de distância desconhecido: '{metodo}'. Use um de {METODOS_DISTANCIA}.")
+    lat_u = np.atleast_1d(np.asarray(lat_usuarios, dtype=float))[:, np.newaxis]
+    lon_u = np.atleast_1d(np.asarray(lon_usuarios, dtype=float))[:, np.newaxis]
+    lat_a = np.atleast_1d(np.asarray(lat_associacoes, dtype=float))[np.newaxis, :]
+    lon_a = np.atleast_1d(np.asarray(lon_associacoes, dtype=float))[np.newaxis, :]
+
+    funcao_distancia = haversine_km if metodo == 'haversine' else elipsoidal_km
+    distancias = funcao_distancia(lat_u, lon_u, lat_a, lon_a)
+
+    coordenadas_invalidas = np.isnan(lat_u) | np.isnan(lon_u) | np.isnan(lat_a) | np.isnan(lon_a)
+    return np.where(coordenadas_invalidas, np.inf, distancias)
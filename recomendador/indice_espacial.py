@@ -0,0 +1,64 @@
+"""
+Índice espacial das associações para o filtro de raio (`max_distance_km`).
+
+Construído uma única vez sobre as colunas `latitude`/`longitude`, usando uma
+BallTree com métrica haversine (sklearn). A consulta devolve apenas as
+associações dentro do raio, sem medir a distância para todas as linhas.
+"""
+import numpy as np
+
+from recomendador.distancia import RAIO_MEDIO_TERRA_KM
+
+# Folga relativa no raio de busca: cobre a diferença entre a esfera do índice e
+# o método 'elipsoidal' (< 0,6%), que é aplicado depois sobre os candidatos.
+FOLGA_RAIO = 0.01
+
+
+class IndiceEspacialAssociacoes:
+    def __init__(self, latitudes, longitudes, leaf_size=40):
+        latitudes = np.asarray(latitudes, dtype=float)
+        longitudes = np.asarray(longitudes, dtype=float)
+        # Associações sem coordenadas nunca estão dentro de um raio (distância inf)
+        coordenadas_validas = ~(np.isnan(latitudes) | np.isnan(longitudes))
+        self.posicoes_validas = np.flatnonzero(coordenadas_validas)
+        self.num_associacoes = len(latitudes)
+
+        self.arvore = None
+        if len(self.posicoes_validas) > 0:
+            from sklearn.neighbors import BallTree  # import adiado: carregar o sistema não depende do sklearn
+            pontos_rad = np.radians(np.column_stack([latitudes[coordenadas_validas], longitudes[coordenadas_validas]]))
+            self.arvore = BallTree(pontos_rad, metric='haversine', leaf_size=leaf_size)
+
+    def consultar_raio(self, latitude, longitude, raio_km):
+        """
+        Retorna as posições (em ordem crescente) das associações a até `raio_km`
+        (acrescido de `FOLGA_RAIO`) do ponto. As distâncias exatas devem ser
+        recalculadas sobre esses candidatos.
+        """
+        if self.arvore is None or np.isnan(latitude) or np.isnan(longitude):
+            return np.empty(0, dtype=np.intp)
+        if not np.isfinite(raio_km):
+            return self.posicoes_validas.copy()
+
+        raio_rad = raio_km * (1 + FOLGA_RAIO) / RAIO_MEDIO_TERRA_KM
+        ponto_rad = np.radians([[latitude, longitude]])
+        indices_arvore = self.arvore.query_radius(ponto_rad, r=raio_rad)[0]
+        return np.sort(self.posicoes_validas[indices_arvore])
+
+    def consultar_raio_varios(self, latitudes, longitudes, raio_km):
+        """
+        Posições (em ordem crescente) das associações a até `raio_km` (com a folga) de pelo menos
+        um dos pontos: a união de `consultar_raio` para cada ponto, numa única consulta à árvore.
+        """
+        latitudes = np.asarray(latitudes, dtype=float)
+        longitudes = np.asarray(longitudes, dtype=float)
+        pontos_validos = ~(np.isnan(latitudes) | np.isnan(longitudes))
+        if self.arvore is None or not pontos_validos.any():
+            return np.empty(0, dtype=np.intp)
+        if not np.isfinite(raio_km):
+            return self.posicoes_validas.copy()
+
+        raio_rad = raio_km * (1 + FOLGA_RAIO) / RAIO_MEDIO_TERRA_KM
+        pontos_rad = np.radians(np.column_stack([latitudes[pontos_validos], longitudes[pontos_validos]]))
+        indices_arvore = np.concatenate(self.arvore.query_radius(pontos_rad, r=raio_rad))
+        return self.posicoes_validas[np.unique(indices_arvore)]
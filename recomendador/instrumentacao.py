@@ -0,0 +1,128 @@
+"""
+Instrumentação opcional de `recomendar` e `recomendar_lote`: tempo por etapa e contadores.
+
+Cada chamada instrumentada abre uma `Medicao`, que marca o fim de cada etapa (o tempo
+desde a marca anterior é atribuído à etapa) e registra contadores (candidatas que
+sobrevivem a cada filtro, produtos pontuados, consultas de similaridade). Os eventos
+são entregues a ganchos `gancho(tipo, nome, valor)`, com `tipo` em `TIPOS_EVENTO`:
+  * 'etapa': `nome` = '<operação>.<etapa>', `valor` = duração em segundos;
+  * 'contador': `nome` = '<operação>.<contador>', `valor` = quantidade;
+  * 'chamada': `nome` = '<operação>', `valor` = duração total em segundos.
+`EstatisticasInstrumentacao` é um gancho que agrega os eventos de várias chamadas.
+
+Com a instrumentação desativada, o sistema usa `MEDICAO_DESATIVADA`, cujos métodos não
+fazem nada: o custo é o de algumas chamadas vazias por requisição.
+"""
+import threading
+import time
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+TIPOS_EVENTO = ('etapa', 'contador', 'chamada')
+
+
+class Medicao:
+    """Medição de uma única chamada (não é compartilhada entre threads)."""
+
+    __slots__ = ('operacao', 'ganchos', 'inicio', 'ultima_marca')
+
+    def __init__(self, operacao, ganchos):
+        self.operacao = operacao
+        self.ganchos = ganchos
+        self.inicio = self.ultima_marca = time.perf_counter()
+
+    def _emitir(self, tipo, nome, valor):
+        for gancho in self.ganchos:
+            gancho(tipo, nome, valor)
+
+    def etapa(self, nome):
+        """Encerra a etapa `nome`: atribui a ela o tempo desde a marca anterior."""
+        agora = time.perf_counter()
+        self._emitir('etapa', f'{self.operacao}.{nome}', agora - self.ultima_marca)
+        self.ultima_marca = agora
+
+    def contar(self, nome, quantidade):
+        self._emitir('contador', f'{self.operacao}.{nome}', int(quantidade))
+
+    def finalizar(self):
+        self._emitir('chamada', self.operacao, time.perf_counter() - self.inicio)
+
+
+class _MedicaoDesativada:
+    """Medição que não faz nada (instrumentação desativada)."""
+
+    __slots__ = ()
+
+    def etapa(self, nome):
+        pass
+
+    def contar(self, nome, quantidade):
+        pass
+
+    def finalizar(self):
+        pass
+
+
+MEDICAO_DESATIVADA = _MedicaoDesativada()
+
+
+class Instrumentacao:
+    """Conjunto de ganchos que recebem os eventos das chamadas instrumentadas."""
+
+    def __init__(self, ganchos=()):
+        self.ganchos = list(ganchos)
+
+    def iniciar(self, operacao):
+        return Medicao(operacao, self.ganchos)
+
+
+class EstatisticasInstrumentacao:
+    """
+    Gancho que agrega os eventos: chamadas e tempo total/máximo por operação e por etapa,
+    e a soma de cada contador. Pode ser usado por várias threads ao mesmo tempo.
+    """
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._trava:
+            self.ocorrencias = Counter()
+            self.tempo_total_s = defaultdict(float)
+            self.tempo_maximo_s = defaultdict(float)
+            self.contadores = Counter()
+
+    def __call__(self, tipo, nome, valor):
+        with self._trava:
+            if tipo == 'contador':
+                self.contadores[nome] += valor
+                return
+            self.ocorrencias[nome] += 1
+            self.tempo_total_s[nome] += valor
+            if valor > self.tempo_maximo_s[nome]:
+                self.tempo_maximo_s[nome] = valor
+
+    def tempos(self):
+        """DataFrame com ocorrências, tempo total, médio e máximo (ms) por operação e etapa."""
+        with self._trava:
+            linhas = [
+                {'nome': nome, 'ocorrencias': ocorrencias,
+                 'total_ms': self.tempo_total_s[nome] * 1000.0,
+                 'media_ms': self.tempo_total_s[nome] * 1000.0 / ocorrencias,
+                 'maximo_ms': self.tempo_maximo_s[nome] * 1000.0}
+                for nome, ocorrencias in self.ocorrencias.items()
+            ]
+        return pd.DataFrame(linhas, columns=['nome', 'ocorrencias', 'total_ms', 'media_ms', 'maximo_ms']).set_index('nome')
+
+    def resumo(self):
+        """Dicionário serializável em JSON com os tempos (ms) e os contadores agregados."""
+        with self._trava:
+            return {
+                'tempos_ms': {nome: {'ocorrencias': ocorrencias,
+                                     'total': round(self.tempo_total_s[nome] * 1000.0, 4),
+                                     'maximo': round(self.tempo_maximo_s[nome] * 1000.0, 4)}
+                              for nome, ocorrencias in self.ocorrencias.items()},
+                'contadores': dict(self.contadores),
+            }
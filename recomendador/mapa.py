@@ -0,0 +1,326 @@
+"""
+Mapas interativos (folium) das recomendações. O folium só é importado quando um mapa é gerado.
+
+- `criar_mapa_recomendacoes`: um mapa (`folium.Map`) com a localização do usuário, o raio de busca
+  e as associações recomendadas;
+- `MapaBase`: mapa base compartilhado entre usuários, renderizado uma vez (tiles, a camada GeoJSON de
+  todas as associações e as camadas vazias das recomendações). O mapa de cada usuário é esse HTML
+  mais um script com a localização, o raio e as recomendações em GeoJSON: nenhum objeto folium por
+  usuário, milissegundos por mapa;
+- `gerar_mapas_lote`: os mapas de todos os consumidores de uma saída de `recomendar_lote`;
+- `criar_mapa_cobertura`: mapa de calor da cobertura das recomendações no DF (quantas vezes, ou com
+  que score total, cada associação foi recomendada).
+
+As recomendações nunca viram um marcador folium por linha: vão numa única FeatureCollection, e o
+navegador cria os marcadores (e o popup, só quando aberto) e os agrupa (Leaflet.markercluster).
+"""
+import json
+import logging
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ZOOM_INICIAL = 10
+
+# Sub-scores do popup: (coluna de `recomendar`, rótulo)
+SUBSCORES_POPUP = [
+    ('normalized_distance_score', 'Dist'),
+    ('normalized_rating_score', 'Aval'),
+    ('normalized_nutritional_score', 'Nutri'),
+    ('normalized_regional_production_score', 'Relev'),
+    ('normalized_collaborative_score', 'Collab'),
+]
+
+# Desenha usuário, raio e recomendações (ver `_dados_usuario`); `agrupamento` é um MarkerCluster do mapa
+_FUNCAO_DESENHO = """
+function desenhar_recomendacoes(mapa, agrupamento, dados) {
+    function texto(valor) {
+        return String(valor).replace(/[&<>"']/g, function (c) { return '&#' + c.charCodeAt(0) + ';'; });
+    }
+    function numero(valor, casas) {
+        return valor === null ? '-' : valor.toFixed(casas);
+    }
+    function popup(p) {
+        var subscores = p.subscores.map(function (valor, i) {
+            return dados.rotulos_subscores[i] + ': ' + numero(valor, 2);
+        });
+        return '<b>' + texto(p.nome) + '</b><hr>' +
+            '<b>Score:</b> ' + numero(p.score, 2) + '<br>' +
+            '<b>Distância:</b> ' + numero(p.distancia_km, 1) + ' km<br>' +
+            '<b>Avaliação:</b> ' + numero(p.avaliacao, 1) + '/5<br>' +
+            '<b>Orgânico:</b> ' + (p.organico ? 'Sim' : 'Não') + '<br>' +
+            '<b>Produtos:</b> ' + texto(p.produtos) + '<br>' +
+            '<details><summary>Sub-scores</summary><small>' + subscores.join(' | ') + '</small></details>';
+    }
+    L.marker(dados.usuario, {icon: L.AwesomeMarkers.icon({icon: 'user', prefix: 'fa', markerColor: 'red'})})
+        .bindPopup('Sua Localização').bindTooltip('Você').addTo(mapa);
+    if (dados.raio_km !== null) {
+        L.circle(dados.usuario, {radius: dados.raio_km * 1000, color: 'blue', fill: true, fillOpacity: 0.1})
+            .bindTooltip('Raio: ' + dados.raio_km + ' km').addTo(mapa);
+    }
+    L.geoJSON(dados.recomendacoes, {
+        pointToLayer: function (feature, latlng) {
+            var cor = feature.properties.organico ? 'green' : 'orange';
+            return L.marker(latlng, {icon: L.AwesomeMarkers.icon({icon: 'shopping-basket', prefix: 'fa', markerColor: cor})});
+        },
+        onEachFeature: function (feature, camada) {
+            var p = feature.properties;
+            camada.bindTooltip(texto(p.nome) + ' (Score: ' + numero(p.score, 2) + ')');
+            camada.bindPopup(function () { return popup(p); }, {maxWidth: 380});
+        }
+    }).addTo(agrupamento);
+    mapa.setView(dados.usuario, mapa.getZoom());
+}
+"""
+
+
+def _valores(df, coluna, casas):
+    """Coluna de `df` arredondada como lista (None para NaN ou coluna ausente)."""
+    if coluna not in df.columns:
+        return [None] * len(df)
+    valores = df[coluna].to_numpy(dtype=float).round(casas)
+    return [None if math.isnan(valor) else valor for valor in valores.tolist()]
+
+
+def _resumo_produtos(produtos):
+    produtos = list(produtos) if isinstance(produtos, (list, tuple, np.ndarray)) else []
+    return ", ".join(produtos[:3]) + ('...' if len(produtos) > 3 else '')
+
+
+def _json_script(valor):
+    """JSON seguro dentro de <script> (um nome com '</script>' não fecha o bloco)."""
+    return json.dumps(valor, ensure_ascii=False).replace('</', '<\\/')
+
+
+def colecao_geojson(latitudes, longitudes, propriedades):
+    """
+    FeatureCollection (dict GeoJSON) de pontos; `propriedades` é um dicionário nome -> sequência
+    com um valor por ponto.
+    """
+    nomes = list(propriedades)
+    features = [
+        {'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+         'properties': dict(zip(nomes, valores))}
+        for lat, lon, *valores in zip(np.round(latitudes, 6).tolist(), np.round(longitudes, 6).tolist(),
+                                      *propriedades.values())
+    ]
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+class _CoordenadasAssociacoes:
+    """Latitude, longitude e `organico_principal` das associações, buscados pelo id."""
+
+    def __init__(self, df_associacoes):
+        self.ids = pd.Index(df_associacoes['id'])
+        self.latitudes = df_associacoes['latitude'].to_numpy(dtype=float)
+        self.longitudes = df_associacoes['longitude'].to_numpy(dtype=float)
+        self.organicas = df_associacoes['organico_principal'].fillna(False).to_numpy(dtype=bool)
+
+    def posicoes(self, ids):
+        """Posições dos `ids`; -1 para ids desconhecidos ou sem coordenadas."""
+        posicoes = self.ids.get_indexer(ids)
+        conhecidas = posicoes >= 0
+        sem_coordenadas = np.zeros(len(posicoes), dtype=bool)
+        sem_coordenadas[conhecidas] = (np.isnan(self.latitudes[posicoes[conhecidas]])
+                                       | np.isnan(self.longitudes[posicoes[conhecidas]]))
+        return np.where(sem_coordenadas, -1, posicoes)
+
+    def features_recomendacoes(self, recomendacoes_df):
+        """
+        Um Feature GeoJSON (já em JSON) por linha de `recomendacoes_df` (saída de `recomendar` ou
+        `recomendar_lote`); None para as linhas cuja associação não tem coordenadas.
+        """
+        posicoes = self.posicoes(recomendacoes_df['id'])
+        propriedades = {
+            'nome': recomendacoes_df['nome'].astype(str).tolist() if 'nome' in recomendacoes_df.columns
+            else recomendacoes_df['id'].astype(str).tolist(),
+            'score': _valores(recomendacoes_df, 'final_score', 4),
+            'distancia_km': _valores(recomendacoes_df, 'distance_km', 2),
+            'avaliacao': _valores(recomendacoes_df, 'avaliacao_media', 2),
+            'organico': self.organicas[posicoes].tolist(),
+            'produtos': [_resumo_produtos(produtos) for produtos in recomendacoes_df['produtos']]
+            if 'produtos' in recomendacoes_df.columns else [''] * len(recomendacoes_df),
+            'subscores': [list(linha) for linha in zip(*(_valores(recomendacoes_df, coluna, 4)
+                                                         for coluna, _ in SUBSCORES_POPUP))],
+        }
+        colecao = colecao_geojson(self.latitudes[posicoes], self.longitudes[posicoes], propriedades)
+        return [_json_script(feature) if posicao >= 0 else None
+                for feature, posicao in zip(colecao['features'], posicoes)]
+
+
+def _raio_km(preferencias):
+    """Raio de busca das preferências (None se infinito: o círculo não é desenhado)."""
+    raio = float(preferencias.get('max_distance_km', 30))
+    return raio if math.isfinite(raio) else None
+
+
+def _dados_usuario(user_lat, user_lon, raio_km, features):
+    """Objeto JavaScript (texto) passado a `desenhar_recomendacoes`."""
+    recomendacoes = '{"type": "FeatureCollection", "features": [' + ', '.join(f for f in features if f) + ']}'
+    return (
+        '{"usuario": ' + _json_script([float(user_lat), float(user_lon)])
+        + ', "raio_km": ' + _json_script(raio_km)
+        + ', "rotulos_subscores": ' + _json_script([rotulo for _, rotulo in SUBSCORES_POPUP])
+        + ', "recomendacoes": ' + recomendacoes + '}'
+    )
+
+
+def criar_mapa_recomendacoes(
+    user_lat, user_lon,
+    raw_recommendations_df,       # DataFrame de recomendações (SAÍDA do método recomendar)
+    all_associations_data_df,   # SEU df_associacoes original e completo
+    map_preferences_dict        # Dicionário de preferências usado na busca (para o raio)
+):
+    if pd.isna(user_lat) or pd.isna(user_lon):
+        logger.warning("Coordenadas do usuário inválidas para o mapa.")
+        return None
+
+    if raw_recommendations_df.empty:
+        # O fluxo principal já informa se não há recomendações
+        return None
+
+    # Coordenadas e 'organico_principal' vêm de all_associations_data_df, pelo id
+    features = _CoordenadasAssociacoes(all_associations_data_df).features_recomendacoes(raw_recommendations_df)
+
+    import folium  # importado só quando um mapa é gerado
+    from folium.plugins import MarkerCluster
+
+    mapa = folium.Map(location=[user_lat, user_lon], zoom_start=ZOOM_INICIAL)
+    agrupamento = MarkerCluster(name='Recomendadas').add_to(mapa)
+    dados = _dados_usuario(user_lat, user_lon, _raio_km(map_preferences_dict), features)
+    # O script do mapa vem depois do <body>: o desenho espera o documento ser carregado
+    mapa.get_root().html.add_child(folium.Element(
+        f"<script>{_FUNCAO_DESENHO}document.addEventListener('DOMContentLoaded', function () {{ "
+        f"desenhar_recomendacoes({mapa.get_name()}, {agrupamento.get_name()}, {dados}); }});</script>"
+    ))
+    return mapa
+
+
+class MapaBase:
+    """
+    Mapa base compartilhado pelos mapas de vários usuários.
+
+    Na criação, o folium renderiza uma única vez o mapa com os tiles, a camada GeoJSON de todas as
+    associações (agrupada no navegador; oculta por padrão, ativável no controle de camadas) e a
+    camada vazia das recomendações. `renderizar` só acrescenta a esse HTML o script com os dados
+    do usuário.
+    """
+
+    def __init__(self, df_associacoes, mostrar_associacoes=False, zoom_start=ZOOM_INICIAL):
+        import folium  # importado só quando um mapa é gerado
+        from folium.plugins import MarkerCluster
+
+        self.coordenadas = _CoordenadasAssociacoes(df_associacoes)
+        validas = ~(np.isnan(self.coordenadas.latitudes) | np.isnan(self.coordenadas.longitudes))
+        latitudes, longitudes = self.coordenadas.latitudes[validas], self.coordenadas.longitudes[validas]
+
+        mapa = folium.Map(location=[float(latitudes.mean()), float(longitudes.mean())], zoom_start=zoom_start)
+        todas = MarkerCluster(name='Todas as associações', show=mostrar_associacoes).add_to(mapa)
+        folium.GeoJson(
+            colecao_geojson(latitudes, longitudes, {'nome': df_associacoes['nome'].astype(str)[validas].tolist()}),
+            marker=folium.CircleMarker(radius=5, color='gray', fill=True, fill_opacity=0.6),
+            tooltip=folium.GeoJsonTooltip(fields=['nome'], labels=False),
+        ).add_to(todas)
+        agrupamento = MarkerCluster(name='Recomendadas').add_to(mapa)
+        folium.LayerControl().add_to(mapa)
+
+        html = mapa.get_root().render()
+        inicio, fim = html.rsplit('</html>', 1)
+        # Cada mapa: inicio + dados do usuário + fim
+        self._inicio = (inicio + f"<script>{_FUNCAO_DESENHO}</script>\n"
+                        f"<script>desenhar_recomendacoes({mapa.get_name()}, {agrupamento.get_name()}, ")
+        self._fim = ");</script>\n</html>" + fim
+
+    def _html(self, user_lat, user_lon, raio_km, features):
+        return self._inicio + _dados_usuario(user_lat, user_lon, raio_km, features) + self._fim
+
+    def renderizar(self, user_lat, user_lon, recomendacoes_df, preferencias):
+        """HTML (str) do mapa de um usuário, a partir da saída de `recomendar` e das preferências usadas."""
+        features = self.coordenadas.features_recomendacoes(recomendacoes_df) if len(recomendacoes_df) else []
+        return self._html(user_lat, user_lon, _raio_km(preferencias), features)
+
+
+def gerar_mapas_lote(mapa_base, recomendacoes_lote_df, consumer_ids, user_latitudes, user_longitudes,
+                     user_preferences, diretorio=None):
+    """
+    Mapas de vários consumidores a partir da saída de `recomendar_lote` e dos mesmos argumentos
+    (`user_preferences`: um dicionário para todos ou uma lista com um por consumidor).
+    Os Features das recomendações são gerados uma vez para o lote todo.
+    Retorna um dicionário consumer_id -> HTML ou, com `diretorio`, consumer_id -> caminho do
+    arquivo `<diretorio>/<consumer_id>.html` gravado.
+    """
+    consumer_ids = list(consumer_ids)
+    if isinstance(user_preferences, dict):
+        user_preferences = [user_preferences] * len(consumer_ids)
+    else:
+        user_preferences = list(user_preferences)
+    if not (len(consumer_ids) == len(user_latitudes) == len(user_longitudes) == len(user_preferences)):
+        raise ValueError("consumer_ids, latitudes, longitudes e preferências devem ter o mesmo tamanho.")
+    if len(set(consumer_ids)) != len(consumer_ids):
+        raise ValueError("consumer_ids repetidos: cada consumidor tem um único mapa.")
+
+    features, linhas_por_consumidor = [], {}
+    if len(recomendacoes_lote_df):
+        features = mapa_base.coordenadas.features_recomendacoes(recomendacoes_lote_df)
+        linhas_por_consumidor = recomendacoes_lote_df.groupby('consumer_id', sort=False).indices
+    if diretorio is not None:
+        os.makedirs(diretorio, exist_ok=True)
+
+    mapas = {}
+    for consumer_id, user_lat, user_lon, preferencias in zip(consumer_ids, user_latitudes, user_longitudes,
+                                                            user_preferences):
+        linhas = linhas_por_consumidor.get(consumer_id, ())
+        html = mapa_base._html(user_lat, user_lon, _raio_km(preferencias), [features[linha] for linha in linhas])
+        if diretorio is None:
+            mapas[consumer_id] = html
+        else:
+            caminho = os.path.join(diretorio, f"{consumer_id}.html")
+            with open(caminho, 'w', encoding='utf-8') as arquivo:
+                arquivo.write(html)
+            mapas[consumer_id] = caminho
+    return mapas
+
+
+def criar_mapa_cobertura(recomendacoes_df, df_associacoes, coluna_peso=None, raio=25, zoom_start=ZOOM_INICIAL):
+    """
+    Mapa de calor da cobertura das recomendações (ex: saída de `recomendar_lote`): cada associação
+    pesa o número de vezes em que foi recomendada ou, com `coluna_peso` (ex: 'final_score'), a
+    soma dessa coluna. As associações nunca recomendadas ficam numa camada própria, em cinza.
+    """
+    coordenadas = _CoordenadasAssociacoes(df_associacoes)
+    if coluna_peso is None:
+        pesos = recomendacoes_df.groupby('id', sort=False).size()
+    else:
+        pesos = recomendacoes_df.groupby('id', sort=False)[coluna_peso].sum()
+    posicoes = coordenadas.posicoes(pesos.index)
+    pesos = pesos.to_numpy(dtype=float)[posicoes >= 0]
+    posicoes = posicoes[posicoes >= 0]
+
+    validas = ~(np.isnan(coordenadas.latitudes) | np.isnan(coordenadas.longitudes))
+    nao_recomendadas = validas.copy()
+    nao_recomendadas[posicoes] = False
+
+    import folium  # importado só quando um mapa é gerado
+    from folium.plugins import HeatMap
+
+    centro = [float(coordenadas.latitudes[validas].mean()), float(coordenadas.longitudes[validas].mean())]
+    mapa = folium.Map(location=centro, zoom_start=zoom_start)
+    if len(posicoes):
+        pontos = np.column_stack([coordenadas.latitudes[posicoes], coordenadas.longitudes[posicoes],
+                                  pesos / max(pesos.max(), 1e-12)])
+        HeatMap(pontos.round(6).tolist(), name='Cobertura das recomendações', radius=raio).add_to(mapa)
+    if nao_recomendadas.any():
+        folium.GeoJson(
+            colecao_geojson(coordenadas.latitudes[nao_recomendadas], coordenadas.longitudes[nao_recomendadas],
+                            {'nome': df_associacoes['nome'].astype(str)[nao_recomendadas].tolist()}),
+            name='Associações não recomendadas',
+            marker=folium.CircleMarker(radius=4, color='gray', fill=True, fill_opacity=0.6),
+            tooltip=folium.GeoJsonTooltip(fields=['nome'], labels=False),
+        ).add_to(mapa)
+    folium.LayerControl().add_to(mapa)
+    logger.debug("Cobertura: %d associações recomendadas, %d não recomendadas", len(posicoes), int(nao_recomendadas.sum()))
+    return mapa
@@ -0,0 +1,94 @@
+"""
+Perfil nutricional dos produtos e objetivos nutricionais ponderados.
+
+Na inicialização, todas as colunas numéricas de `df_nutrientes` (umidade, energia,
+proteína, lipídios, carboidratos, fibra, cálcio, vitamina C, ...) viram uma matriz
+produtos x nutrientes normalizada pelo máximo de cada nutriente (0-1), sobre o mesmo
+vocabulário de produtos da incidência.
+
+Um objetivo é um dicionário {nutriente: peso}: peso positivo favorece mais do nutriente
+e peso negativo favorece menos (contribui com 1 - valor normalizado). O score de um
+produto é a média ponderada pelos |pesos|, um único produto matriz-vetor
+
+    score = perfil @ (peso / soma|pesos|) + soma(|pesos negativos|) / soma|pesos|
+
+e o custo por requisição não depende de quantos nutrientes o objetivo combina. Os
+objetivos nomeados (`OBJETIVOS_NUTRICIONAIS`) são objetivos de um nutriente e dão os
+mesmos valores das colunas `score_*` de `recomendador.dados.carregar_nutrientes`.
+"""
+from numbers import Real
+
+import numpy as np
+import pandas as pd
+
+# Objetivos nomeados aceitos em `nutritional_goal`
+OBJETIVOS_NUTRICIONAIS = {
+    'alta_vitamina_c': {'vitamina_c_mg': 1.0},
+    'alta_fibra': {'fibra_g': 1.0},
+    'baixa_caloria': {'energia_kcal': -1.0},
+}
+
+# Colunas numéricas de df_nutrientes que não são nutrientes
+COLUNAS_NAO_NUTRIENTES = ('id',)
+
+
+def colunas_nutrientes(df_nutrientes):
+    """Colunas numéricas de `df_nutrientes` que são nutrientes (sem `id` e sem os scores pré-calculados `score_*`)."""
+    return pd.Index([
+        coluna for coluna in df_nutrientes.columns
+        if pd.api.types.is_numeric_dtype(df_nutrientes[coluna]) and not pd.api.types.is_bool_dtype(df_nutrientes[coluna])
+        and coluna not in COLUNAS_NAO_NUTRIENTES and not str(coluna).startswith('score_')
+    ])
+
+
+def matriz_perfil_nutricional(df_nutrientes, produtos, nutrientes):
+    """
+    Matriz produtos x nutrientes com cada nutriente dividido pelo seu máximo em `df_nutrientes`
+    (indexado pelo produto). Retorna (valores, tem_valor): produtos sem informação, nutrientes
+    ausentes e nutrientes com máximo <= 0 ficam com 0 em `valores` e False em `tem_valor`.
+    """
+    tabela = df_nutrientes[list(nutrientes)].astype(float)
+    maximos = tabela.max()
+    normalizada = tabela / maximos.where(maximos > 0)
+    valores = normalizada.reindex(index=produtos).to_numpy(dtype=float)
+    tem_valor = ~np.isnan(valores)
+    return np.where(tem_valor, valores, 0.0), tem_valor
+
+
+def vetor_objetivo(objetivo, nutrientes):
+    """
+    (coeficientes por nutriente, constante) do objetivo: um nome de `OBJETIVOS_NUTRICIONAIS` ou um
+    dicionário {nutriente: peso}. None para objetivo vazio, nome desconhecido ou pesos todos nulos;
+    ValueError para nutrientes fora de `nutrientes` ou pesos não numéricos.
+    """
+    if not objetivo:
+        return None
+    if isinstance(objetivo, str):
+        objetivo = OBJETIVOS_NUTRICIONAIS.get(objetivo)
+        if objetivo is None:
+            return None
+    desconhecidos = [nutriente for nutriente in objetivo if nutriente not in nutrientes]
+    if desconhecidos:
+        raise ValueError(f"Nutrientes desconhecidos no objetivo: {desconhecidos}. Use {list(nutrientes)}.")
+    if not all(isinstance(peso, Real) and not isinstance(peso, bool) for peso in objetivo.values()):
+        raise ValueError(f"Pesos do objetivo nutricional devem ser números: {objetivo!r}.")
+    pesos = np.zeros(len(nutrientes))
+    pesos[pd.Index(nutrientes).get_indexer(list(objetivo))] = list(objetivo.values())
+    total = np.abs(pesos).sum()
+    if total == 0:
+        return None
+    return pesos / total, -pesos[pesos < 0].sum() / total
+
+
+def scores_objetivo(perfil, tem_valor, objetivo, nutrientes):
+    """
+    Score (0-1) de cada produto para o objetivo e a máscara dos produtos que têm todos os
+    nutrientes do objetivo. None se o objetivo é vazio (ver `vetor_objetivo`).
+    """
+    vetor = vetor_objetivo(objetivo, nutrientes)
+    if vetor is None:
+        return None
+    coeficientes, constante = vetor
+    usados = np.flatnonzero(coeficientes)
+    scores = perfil[:, usados] @ coeficientes[usados] + constante
+    return scores, tem_valor[:, usados].all(axis=1)
@@ -0,0 +1,58 @@
+"""
+Índices de produtos das associações para o filtro de produtos desejados e o score nutricional.
+
+Na inicialização, a coluna `produtos` (uma lista por associação) vira uma matriz
+booleana de incidência associações x produtos, sobre o mesmo vocabulário de produtos
+do perfil nutricional (`recomendador.perfil_nutricional`).
+Cada requisição passa a ser uma seleção de colunas e um produto matricial, com
+custo independente de quantos produtos cada associação vende.
+"""
+import numpy as np
+import pandas as pd
+
+
+def matriz_incidencia(listas, vocabulario, normalizar=None):
+    """
+    Matriz booleana (linhas x vocabulário): True se o item do vocabulário está na lista da linha.
+    `normalizar` é aplicado a cada item antes da busca (ex: `str.upper` para as regiões).
+    Itens fora do vocabulário são ignorados.
+    """
+    posicao = {item: j for j, item in enumerate(vocabulario)}
+    incidencia = np.zeros((len(listas), len(vocabulario)), dtype=bool)
+    for i, itens in enumerate(listas):
+        for item in itens:
+            j = posicao.get(normalizar(item) if normalizar else item)
+            if j is not None:
+                incidencia[i, j] = True
+    return incidencia
+
+
+def matriz_incidencia_codigos(offsets, codigos, dicionario, vocabulario):
+    """
+    A mesma matriz de `matriz_incidencia`, a partir de listas codificadas (formato colunar de
+    `recomendador.tabelas`): a linha i tem os códigos `codigos[offsets[i]:offsets[i + 1]]`,
+    que são posições em `dicionario`. Só o dicionário (pequeno) é buscado no vocabulário.
+    """
+    coluna_por_codigo = pd.Index(vocabulario).get_indexer(pd.Index(dicionario))
+    linhas = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    colunas = coluna_por_codigo[np.asarray(codigos)] if len(codigos) else np.zeros(0, dtype=np.intp)
+    validas = colunas >= 0
+    incidencia = np.zeros((len(offsets) - 1, len(vocabulario)), dtype=bool)
+    incidencia[linhas[validas], colunas[validas]] = True
+    return incidencia
+
+
+def oferece_algum(oferta_produtos, posicoes_desejados):
+    """Máscara das linhas de `oferta_produtos` (associações x produtos) com ao menos um dos produtos desejados."""
+    return oferta_produtos[:, posicoes_desejados].any(axis=1)
+
+
+def media_score_produtos(oferta_produtos, posicoes_desejados, valores, tem_valor):
+    """
+    Média de um score por produto (`valores`, com máscara `tem_valor`) sobre os produtos desejados
+    que cada associação oferece e que têm o score; 0 para as associações sem nenhum.
+    """
+    considerados = oferta_produtos[:, posicoes_desejados] & tem_valor[posicoes_desejados]
+    soma = considerados @ valores[posicoes_desejados]
+    contagem = considerados.sum(axis=1)
+    return np.divide(soma, contagem, out=np.zeros(len(contagem)), where=contagem > 0)
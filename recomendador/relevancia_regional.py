@@ -0,0 +1,53 @@
+"""
+Relevância da produção regional (EMATER-DF) pré-calculada em arrays.
+
+Em vez de filtrar `df_producao` para cada (associação, produto, região), são
+montados uma única vez:
+  * uma tabela densa regiões x produtos com `relevancia_regiao_percent`;
+  * a incidência associações x regiões (regiões em que cada associação atua),
+    montada com `recomendador.produtos.matriz_incidencia`.
+O score regional passa a ser um máximo sobre as regiões e uma média sobre os
+produtos desejados, feitos com reduções NumPy.
+"""
+import numpy as np
+import pandas as pd
+
+
+def tabela_relevancia_regional(df_producao, regioes, produtos):
+    """
+    Array denso regiões x produtos com a `relevancia_regiao_percent` de `df_producao`.
+    Pares sem produção ficam com 0; havendo linhas repetidas, vale a primeira.
+    """
+    tabela = np.zeros((len(regioes), len(produtos)))
+    dados = df_producao.drop_duplicates(subset=['regiao', 'produto'], keep='first')
+    linhas = pd.Index(regioes).get_indexer(dados['regiao'])
+    colunas = pd.Index(produtos).get_indexer(dados['produto'])
+    validas = (linhas >= 0) & (colunas >= 0)
+    relevancias = dados['relevancia_regiao_percent'].to_numpy(dtype=float)[validas]
+    # Relevância ausente ou negativa não supera o 0 de "sem produção"
+    tabela[linhas[validas], colunas[validas]] = np.clip(np.nan_to_num(relevancias, nan=0.0), 0.0, None)
+    return tabela
+
+
+def relevancia_por_associacao(incidencia_regioes, tabela_relevancia):
+    """
+    Associações x produtos: maior relevância (0-1) do produto entre as regiões de cada associação.
+    Percorre as regiões (poucas) para não materializar associações x regiões x produtos.
+    """
+    relevancia = np.zeros((incidencia_regioes.shape[0], tabela_relevancia.shape[1]))
+    for regiao in range(incidencia_regioes.shape[1]):
+        atua_na_regiao = incidencia_regioes[:, regiao]
+        if atua_na_regiao.any():
+            relevancia[atua_na_regiao] = np.maximum(relevancia[atua_na_regiao], tabela_relevancia[regiao])
+    return relevancia / 100.0
+
+
+def scores_relevancia_regional(relevancia_associacao_produto, oferta_produtos, posicoes_desejados):
+    """
+    Média da relevância regional sobre os produtos desejados que cada associação oferece (0 se nenhum).
+    `relevancia_associacao_produto` e `oferta_produtos` são associações x produtos, já nas linhas desejadas.
+    """
+    oferecidos = oferta_produtos[:, posicoes_desejados]
+    soma = (relevancia_associacao_produto[:, posicoes_desejados] * oferecidos).sum(axis=1)
+    contagem = oferecidos.sum(axis=1)
+    return np.divide(soma, contagem, out=np.zeros(len(contagem)), where=contagem > 0)
@@ -0,0 +1,73 @@
+"""
+Disponibilidade sazonal dos produtos (Calendário de Comercialização da CEASA-DF).
+
+A tabela produto x mês (`recomendador.dados.carregar_sazonalidade`) traz a intensidade da
+comercialização de cada mês: 3 = forte, 2 = regular, 1 = fraca. Um produto está na época
+no mês em que a intensidade é de pelo menos `INTENSIDADE_MINIMA_EPOCA`; produtos fora do
+calendário são considerados disponíveis o ano todo.
+
+Na inicialização, cada par associação x produto vira uma máscara de 12 bits (bit m-1 = mês m)
+dos meses em que a associação oferece o produto na época. A preferência `mes` troca a
+incidência associações x produtos por um E bit a bit com o bit do mês, com o mesmo custo
+da seleção de linhas de hoje.
+"""
+import datetime
+
+import numpy as np
+import pandas as pd
+
+MESES = ('jan', 'fev', 'mar', 'abr', 'mai', 'jun', 'jul', 'ago', 'set', 'out', 'nov', 'dez')
+INTENSIDADES = {'fraca': 1, 'regular': 2, 'forte': 3}
+
+# Intensidade mínima para o produto estar na época (regular: oferta equilibrada)
+INTENSIDADE_MINIMA_EPOCA = INTENSIDADES['regular']
+
+# Máscara com os 12 meses (produtos fora do calendário)
+TODOS_OS_MESES = (1 << len(MESES)) - 1
+
+
+def mes_da_preferencia(valor):
+    """
+    Mês (1-12) da preferência `mes`: um inteiro 1-12, a abreviação ('jan' ... 'dez'), uma data
+    (`datetime.date`, `pd.Timestamp`) ou um texto ISO ('2025-07-15', '2025-07'). None se ausente;
+    ValueError se inválido.
+    """
+    if valor is None:
+        return None
+    if isinstance(valor, (datetime.date, pd.Timestamp)):
+        return valor.month
+    if isinstance(valor, str):
+        if valor.lower() in MESES:
+            return MESES.index(valor.lower()) + 1
+        try:
+            return pd.Timestamp(valor).month
+        except ValueError:
+            raise ValueError(f"Mês inválido: {valor!r}. Use 1-12, {MESES[0]!r}-{MESES[-1]!r} ou uma data.") from None
+    if isinstance(valor, (int, np.integer)) and not isinstance(valor, bool) and 1 <= valor <= 12:
+        return int(valor)
+    raise ValueError(f"Mês inválido: {valor!r}. Use 1-12, {MESES[0]!r}-{MESES[-1]!r} ou uma data.")
+
+
+def meses_na_epoca(df_sazonalidade, produtos, intensidade_minima=INTENSIDADE_MINIMA_EPOCA):
+    """
+    Máscara de meses (uint16, bit m-1 = mês m) em que cada produto de `produtos` está na época,
+    pelo `df_sazonalidade` (coluna `produto` e uma coluna por mês). Produtos ausentes: `TODOS_OS_MESES`.
+    """
+    mascaras = np.full(len(produtos), TODOS_OS_MESES, dtype=np.uint16)
+    if df_sazonalidade is None or len(df_sazonalidade) == 0:
+        return mascaras
+    na_epoca = df_sazonalidade.set_index('produto')[list(MESES)].to_numpy() >= intensidade_minima
+    bits = na_epoca.astype(np.uint16) @ (np.uint16(1) << np.arange(len(MESES), dtype=np.uint16))
+    linhas = pd.Index(df_sazonalidade['produto']).get_indexer(produtos)
+    mascaras[linhas >= 0] = bits[linhas[linhas >= 0]]
+    return mascaras
+
+
+def matriz_meses_associacoes(oferta_produtos, meses_produtos):
+    """Máscara de meses (associações x produtos, uint16) em que cada associação oferece o produto na época."""
+    return np.where(oferta_produtos, meses_produtos[np.newaxis, :], np.uint16(0)).astype(np.uint16)
+
+
+def oferta_no_mes(meses_associacoes, mes):
+    """Incidência booleana (associações x produtos) dos produtos oferecidos na época no mês `mes` (1-12)."""
+    return (meses_associacoes & np.uint16(1 << (mes - 1))) != 0
@@ -0,0 +1,448 @@
+"""
+Serviço HTTP local do sistema de recomendação (asyncio, sem dependências externas).
+
+O sistema é carregado uma única vez (de um artefato `.npz` ou montado com os dados do
+projeto) e o cálculo das recomendações roda em um pool de threads ou de processos, fora
+do laço de eventos. Pedidos que chegam dentro de uma janela curta são agrupados em um lote
+(`recomendar_lote`); um lote de um único pedido usa `recomendar`. Com o cache ativo, os dois
+caminhos reaproveitam os resultados guardados.
+
+Rotas:
+  * `POST /recomendar`: corpo JSON com `consumer_id`, `latitude`, `longitude` e as chaves de
+    `user_preferences` (no próprio corpo ou em um objeto `user_preferences`);
+    responde `{"consumer_id": ..., "recomendacoes": [...]}`;
+  * `GET /metrics`: métricas no formato texto do Prometheus (histogramas de latência,
+    espera e execução dos lotes, tamanho dos lotes, requisições por status);
+  * `GET /saude`: verificação simples.
+Acima de `max_concorrencia` pedidos em andamento, novos pedidos recebem 503.
+
+    python -m recomendador.servico --artefato artefatos/recomendador.npz --porta 8080
+    curl -X POST localhost:8080/recomendar -d '{"consumer_id": "Consumidor_001",
+         "latitude": -15.83, "longitude": -47.83, "desired_products": ["Alface"]}'
+"""
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import time
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from numbers import Real
+
+import numpy as np
+
+from recomendador.sazonalidade import mes_da_preferencia
+from recomendador.sistema import SistemaRecomendacaoDF
+
+logger = logging.getLogger(__name__)
+
+EXECUTORES = ('thread', 'processo')
+
+# Tipos aceitos para cada chave de user_preferences
+CHAVES_PREFERENCIAS = {
+    'desired_products': list,
+    'max_distance_km': Real,
+    'only_organic': bool,
+    'nutritional_goal': (str, dict, type(None)),
+    'consider_regional_production_relevance': bool,
+    'top_n_results': int,
+    'weight_distance': Real,
+    'weight_rating': Real,
+    'weight_nutritional_goal': Real,
+    'weight_regional_production_relevance': Real,
+    'weight_collaborative_score': Real,
+    'mes': (int, str),
+}
+
+LIMITES_LATENCIA_S = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+LIMITES_TAMANHO_LOTE = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+# Tamanho máximo do corpo de um pedido (bytes)
+MAX_CORPO = 64 * 1024
+
+
+def ler_pedido(corpo, nutrientes=None):
+    """
+    Valida o corpo JSON (já decodificado) de `POST /recomendar`. `nutrientes`: nomes aceitos
+    em um `nutritional_goal` ponderado ({nutriente: peso}); None = não verifica os nomes.
+    Retorna (consumer_id, latitude, longitude, user_preferences); ValueError se inválido.
+    """
+    if not isinstance(corpo, dict):
+        raise ValueError("O corpo deve ser um objeto JSON.")
+    desconhecidas = set(corpo) - {'consumer_id', 'latitude', 'longitude', 'user_preferences'} - set(CHAVES_PREFERENCIAS)
+    if desconhecidas:
+        raise ValueError(f"Chaves desconhecidas: {sorted(desconhecidas)}.")
+    consumer_id = corpo.get('consumer_id')
+    if not isinstance(consumer_id, str) or not consumer_id:
+        raise ValueError("'consumer_id' deve ser um texto não vazio.")
+    coordenadas = []
+    for chave in ('latitude', 'longitude'):
+        valor = corpo.get(chave)
+        if isinstance(valor, bool) or not isinstance(valor, Real) or not np.isfinite(valor):
+            raise ValueError(f"'{chave}' deve ser um número.")
+        coordenadas.append(float(valor))
+
+    aninhadas = corpo.get('user_preferences', {})
+    if not isinstance(aninhadas, dict):
+        raise ValueError("'user_preferences' deve ser um objeto JSON.")
+    preferencias = {**aninhadas, **{chave: corpo[chave] for chave in CHAVES_PREFERENCIAS if chave in corpo}}
+    for chave, valor in preferencias.items():
+        tipo = CHAVES_PREFERENCIAS.get(chave)
+        if tipo is None:
+            raise ValueError(f"Preferência desconhecida: {chave!r}.")
+        # bool é subclasse de int: não vale como número
+        if not isinstance(valor, tipo) or (isinstance(valor, bool) and tipo is not bool):
+            raise ValueError(f"Tipo inválido para a preferência {chave!r}: {valor!r}.")
+    if not all(isinstance(produto, str) for produto in preferencias.get('desired_products', [])):
+        raise ValueError("'desired_products' deve ser uma lista de textos.")
+    if preferencias.get('top_n_results', 0) < 0:
+        raise ValueError("'top_n_results' deve ser >= 0.")
+    mes_da_preferencia(preferencias.get('mes'))
+    objetivo = preferencias.get('nutritional_goal')
+    if isinstance(objetivo, dict):
+        if not all(isinstance(peso, Real) and not isinstance(peso, bool) and np.isfinite(peso) for peso in objetivo.values()):
+            raise ValueError("Os pesos de 'nutritional_goal' devem ser números.")
+        desconhecidos = sorted(set(objetivo) - set(nutrientes)) if nutrientes is not None else []
+        if desconhecidos:
+            raise ValueError(f"Nutrientes desconhecidos em 'nutritional_goal': {desconhecidos}.")
+    return consumer_id, coordenadas[0], coordenadas[1], preferencias
+
+
+def _registros(recomendacoes_df):
+    """Linhas de um DataFrame de recomendações como dicionários serializáveis em JSON."""
+    return recomendacoes_df.to_dict('records')
+
+
+def executar_pedidos(sistema, pedidos):
+    """
+    Recomendações (lista de registros) de cada pedido (consumer_id, latitude, longitude, preferências).
+    Vários pedidos são resolvidos com um único `recomendar_lote`.
+    """
+    if len(pedidos) == 1:
+        return [_registros(sistema.recomendar(*pedidos[0]))]
+    consumer_ids, latitudes, longitudes, preferencias = map(list, zip(*pedidos))
+    recomendacoes_df, tamanhos = sistema.recomendar_lote_com_tamanhos(consumer_ids, latitudes, longitudes, preferencias)
+    registros = _registros(recomendacoes_df.drop(columns=['consumer_id', 'rank']))
+    limites = np.concatenate([[0], np.cumsum(tamanhos)])
+    return [registros[inicio:fim] for inicio, fim in zip(limites[:-1], limites[1:])]
+
+
+# Sistema de cada processo do pool (executor 'processo'), carregado pelo inicializador
+_SISTEMA_PROCESSO = None
+
+
+def _iniciar_processo(caminho_artefato):
+    global _SISTEMA_PROCESSO
+    _SISTEMA_PROCESSO = SistemaRecomendacaoDF.carregar(caminho_artefato)
+    _SISTEMA_PROCESSO.spatial_index  # constrói o índice antes do primeiro pedido
+
+
+def _executar_pedidos_processo(pedidos):
+    return executar_pedidos(_SISTEMA_PROCESSO, pedidos)
+
+
+class Histograma:
+    """Histograma cumulativo no formato do Prometheus."""
+
+    def __init__(self, nome, descricao, limites):
+        self.nome = nome
+        self.descricao = descricao
+        self.limites = tuple(limites)
+        self.contagens = [0] * (len(self.limites) + 1)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.contagens[bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+    def exposicao(self):
+        linhas = [f'# HELP {self.nome} {self.descricao}', f'# TYPE {self.nome} histogram']
+        acumulado = 0
+        for limite, contagem in zip(self.limites + ('+Inf',), self.contagens):
+            acumulado += contagem
+            linhas.append(f'{self.nome}_bucket{{le="{limite}"}} {acumulado}')
+        linhas += [f'{self.nome}_sum {self.soma}', f'{self.nome}_count {self.total}']
+        return linhas
+
+
+class AgrupadorLotes:
+    """
+    Junta os pedidos que chegam em até `janela_s` segundos (ou até `max_lote` pedidos) e
+    executa cada lote com `executar_lote(pedidos)` no `executor`.
+    """
+
+    def __init__(self, executar_lote, executor, max_lote, janela_s, metricas):
+        self.executar_lote = executar_lote
+        self.executor = executor
+        self.max_lote = max_lote
+        self.janela_s = janela_s
+        self.metricas = metricas
+        self._pendentes = []
+        self._temporizador = None
+        self._tarefas = set()
+
+    async def enviar(self, pedido):
+        laco = asyncio.get_running_loop()
+        futuro = laco.create_future()
+        self._pendentes.append((pedido, futuro, time.perf_counter()))
+        if len(self._pendentes) >= self.max_lote:
+            self._despachar()
+        elif self._temporizador is None:
+            self._temporizador = laco.call_later(self.janela_s, self._despachar)
+        return await futuro
+
+    def _despachar(self):
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        lote, self._pendentes = self._pendentes, []
+        if lote:
+            tarefa = asyncio.ensure_future(self._executar(lote))
+            self._tarefas.add(tarefa)
+            tarefa.add_done_callback(self._tarefas.discard)
+
+    async def _executar(self, lote):
+        inicio = time.perf_counter()
+        for _, _, chegada in lote:
+            self.metricas['espera_lote'].observar(inicio - chegada)
+        self.metricas['tamanho_lote'].observar(len(lote))
+        try:
+            resultados = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.executar_lote, [pedido for pedido, _, _ in lote]
+            )
+        except Exception as erro:
+            for _, futuro, _ in lote:
+                if not futuro.done():
+                    futuro.set_exception(erro)
+            return
+        finally:
+            self.metricas['execucao_lote'].observar(time.perf_counter() - inicio)
+        for (_, futuro, _), resultado in zip(lote, resultados):
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+
+class ServicoRecomendacao:
+    """
+    Servidor HTTP assíncrono do `SistemaRecomendacaoDF`.
+
+    `executor='thread'` usa `sistema` (ou carrega `caminho_artefato`) no próprio processo;
+    `executor='processo'` exige `caminho_artefato`, carregado uma vez por processo do pool.
+    """
+
+    def __init__(self, sistema=None, caminho_artefato=None, executor='thread', trabalhadores=4,
+                 max_lote=32, janela_lote_ms=2.0, max_concorrencia=256):
+        if executor not in EXECUTORES:
+            raise ValueError(f"Executor desconhecido: {executor!r}. Use um de {EXECUTORES}.")
+        if executor == 'processo':
+            if caminho_artefato is None:
+                raise ValueError("O executor 'processo' precisa de `caminho_artefato`.")
+            self.sistema = None
+            with np.load(caminho_artefato, allow_pickle=False) as artefato:
+                self.nutrientes = frozenset(artefato['arr__nutrient_columns'].tolist())
+            self.executor = ProcessPoolExecutor(trabalhadores, initializer=_iniciar_processo,
+                                                initargs=(caminho_artefato,))
+            executar_lote = _executar_pedidos_processo
+        else:
+            if sistema is None:
+                if caminho_artefato is None:
+                    raise ValueError("Informe `sistema` ou `caminho_artefato`.")
+                sistema = SistemaRecomendacaoDF.carregar(caminho_artefato)
+            sistema.spatial_index  # constrói o índice antes do primeiro pedido
+            self.sistema = sistema
+            self.nutrientes = frozenset(sistema.nutrient_columns)
+            self.executor = ThreadPoolExecutor(trabalhadores, thread_name_prefix='recomendador')
+            executar_lote = functools.partial(executar_pedidos, sistema)
+
+        self.max_concorrencia = max_concorrencia
+        self.em_andamento = 0
+        self.requisicoes = Counter()  # (rota, status) -> quantidade
+        self.metricas = {
+            'requisicao': Histograma('recomendador_requisicao_segundos',
+                                     'Latencia de POST /recomendar (chegada ate a resposta)', LIMITES_LATENCIA_S),
+            'espera_lote': Histograma('recomendador_espera_lote_segundos',
+                                      'Espera de cada pedido ate o despacho do seu lote', LIMITES_LATENCIA_S),
+            'execucao_lote': Histograma('recomendador_execucao_lote_segundos',
+                                        'Execucao de cada lote no pool (incluindo a fila do pool)', LIMITES_LATENCIA_S),
+            'tamanho_lote': Histograma('recomendador_tamanho_lote', 'Pedidos por lote', LIMITES_TAMANHO_LOTE),
+        }
+        self.agrupador = AgrupadorLotes(executar_lote, self.executor, max_lote, janela_lote_ms / 1000.0, self.metricas)
+        self._servidor = None
+
+    async def iniciar(self, host='127.0.0.1', porta=8080):
+        self._servidor = await asyncio.start_server(self._tratar_conexao, host, porta)
+        return self._servidor
+
+    async def encerrar(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        self.executor.shutdown(wait=True)
+
+    def executar(self, host='127.0.0.1', porta=8080):
+        """Executa o servidor até ser interrompido (Ctrl+C)."""
+        async def principal():
+            servidor = await self.iniciar(host, porta)
+            logger.info("Servindo em http://%s:%d", host, porta)
+            try:
+                async with servidor:
+                    await servidor.serve_forever()
+            finally:
+                await self.encerrar()
+        try:
+            asyncio.run(principal())
+        except KeyboardInterrupt:
+            pass
+
+    async def _tratar_conexao(self, leitor, escritor):
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                partes = linha.decode('latin-1').split()
+                if len(partes) != 3:
+                    await self._responder(escritor, 400, {'erro': 'Linha de requisição inválida.'}, manter_conexao=False)
+                    break
+                metodo, caminho, versao = partes
+                cabecalhos = {}
+                while True:
+                    linha = await leitor.readline()
+                    if linha in (b'\r\n', b'\n', b''):
+                        break
+                    nome, _, valor = linha.decode('latin-1').partition(':')
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+                try:
+                    tamanho = int(cabecalhos.get('content-length', 0) or 0)
+                except ValueError:
+                    tamanho = -1
+                if tamanho < 0:
+                    await self._responder(escritor, 400, {'erro': 'Content-Length inválido.'}, manter_conexao=False)
+                    break
+                if tamanho > MAX_CORPO:
+                    await self._responder(escritor, 413, {'erro': 'Corpo muito grande.'}, manter_conexao=False)
+                    break
+                corpo = await leitor.readexactly(tamanho) if tamanho else b''
+
+                conexao = cabecalhos.get('connection', '').lower()
+                manter_conexao = conexao == 'keep-alive' or (versao == 'HTTP/1.1' and conexao != 'close')
+                status, resposta, extras = await self._rotear(metodo, caminho.split('?', 1)[0], corpo)
+                await self._responder(escritor, status, resposta, manter_conexao, extras)
+                if not manter_conexao:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, escritor, status, resposta, manter_conexao, extras=None):
+        if isinstance(resposta, str):
+            corpo, tipo = resposta.encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            corpo, tipo = json.dumps(resposta, ensure_ascii=False).encode('utf-8'), 'application/json; charset=utf-8'
+        cabecalho = [
+            f'HTTP/1.1 {status} {HTTPStatus(status).phrase}',
+            f'Content-Type: {tipo}',
+            f'Content-Length: {len(corpo)}',
+            f"Connection: {'keep-alive' if manter_conexao else 'close'}",
+            *(f'{nome}: {valor}' for nome, valor in (extras or {}).items()),
+        ]
+        escritor.write(('\r\n'.join(cabecalho) + '\r\n\r\n').encode('latin-1') + corpo)
+        await escritor.drain()
+
+    async def _rotear(self, metodo, caminho, corpo):
+        """Retorna (status, resposta, cabeçalhos extras)."""
+        if caminho == '/recomendar':
+            if metodo != 'POST':
+                status, resposta, extras = 405, {'erro': 'Use POST.'}, {'Allow': 'POST'}
+            else:
+                status, resposta, extras = await self._recomendar(corpo)
+        elif caminho == '/metrics' and metodo == 'GET':
+            status, resposta, extras = 200, self.exposicao_metricas(), None
+        elif caminho == '/saude' and metodo == 'GET':
+            status, resposta, extras = 200, {'status': 'ok'}, None
+        else:
+            status, resposta, extras = 404, {'erro': f'Rota desconhecida: {metodo} {caminho}'}, None
+        self.requisicoes[caminho if status != 404 else 'outras', status] += 1
+        return status, resposta, extras
+
+    async def _recomendar(self, corpo):
+        if self.em_andamento >= self.max_concorrencia:
+            return 503, {'erro': 'Serviço sobrecarregado; tente novamente.'}, {'Retry-After': '1'}
+        inicio = time.perf_counter()
+        self.em_andamento += 1
+        try:
+            try:
+                pedido = ler_pedido(json.loads(corpo or b'null'), self.nutrientes)
+            except ValueError as erro:  # inclui JSON inválido
+                return 400, {'erro': str(erro)}, None
+            try:
+                recomendacoes = await self.agrupador.enviar(pedido)
+            except Exception:
+                logger.exception("Falha ao gerar recomendações para %r", pedido[0])
+                return 500, {'erro': 'Falha interna ao gerar recomendações.'}, None
+            self.metricas['requisicao'].observar(time.perf_counter() - inicio)
+            return 200, {'consumer_id': pedido[0], 'recomendacoes': recomendacoes}, None
+        finally:
+            self.em_andamento -= 1
+
+    def exposicao_metricas(self):
+        """Métricas no formato texto do Prometheus."""
+        linhas = []
+        for histograma in self.metricas.values():
+            linhas += histograma.exposicao()
+        linhas += ['# HELP recomendador_requisicoes_total Requisicoes por rota e status',
+                   '# TYPE recomendador_requisicoes_total counter']
+        linhas += [f'recomendador_requisicoes_total{{rota="{rota}",status="{status}"}} {quantidade}'
+                   for (rota, status), quantidade in sorted(self.requisicoes.items())]
+        linhas += ['# HELP recomendador_em_andamento Pedidos de recomendacao em andamento',
+                   '# TYPE recomendador_em_andamento gauge', f'recomendador_em_andamento {self.em_andamento}']
+        if self.sistema is not None and self.sistema.result_cache is not None:
+            estatisticas = self.sistema.result_cache.estatisticas()
+            linhas += ['# TYPE recomendador_cache_eventos_total counter']
+            linhas += [f'recomendador_cache_eventos_total{{evento="{evento}"}} {estatisticas[evento]}'
+                       for evento in ('acertos', 'falhas', 'expiradas', 'descartadas', 'invalidadas')]
+        return '\n'.join(linhas) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP local do Sistema de Recomendação do DF.")
+    parser.add_argument('--artefato', help="Artefato .npz (sem ele, o sistema é montado com os dados do projeto)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8080)
+    parser.add_argument('--executor', choices=EXECUTORES, default='thread')
+    parser.add_argument('--trabalhadores', type=int, default=4)
+    parser.add_argument('--max-lote', type=int, default=32, help="Pedidos por lote (1 = sem agrupamento)")
+    parser.add_argument('--janela-lote-ms', type=float, default=2.0, help="Espera máxima para completar um lote")
+    parser.add_argument('--max-concorrencia', type=int, default=256, help="Pedidos em andamento antes de responder 503")
+    parser.add_argument('--cache', action='store_true', help="Ativa o cache de resultados (executor thread)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(levelname)s %(message)s')
+
+    sistema = None
+    if args.executor == 'thread':
+        if args.artefato:
+            sistema = SistemaRecomendacaoDF.carregar(args.artefato)
+        else:
+            from recomendador.dados import (
+                carregar_associacoes, carregar_nutrientes, carregar_producao, carregar_sazonalidade, simular_avaliacoes
+            )
+            df_associacoes = carregar_associacoes()
+            sistema = SistemaRecomendacaoDF(df_associacoes, carregar_nutrientes(), carregar_producao(),
+                                            simular_avaliacoes(df_associacoes), seasonality_df=carregar_sazonalidade())
+        if args.cache:
+            sistema.ativar_cache()
+    servico = ServicoRecomendacao(
+        sistema, args.artefato, args.executor, args.trabalhadores, args.max_lote, args.janela_lote_ms,
+        args.max_concorrencia
+    )
+    servico.executar(args.host, args.porta)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Gerador vetorizado da matriz de utilidade simulada (avaliações de consumidores para as associações).
+
+Cada consumidor avalia entre `min_avaliacoes` e `max_avaliacoes` associações distintas; 60% das
+avaliações ficam próximas da `avaliacao_media` da associação (normal com desvio 0,5, arredondada
+e limitada a 1-5) e 40% são uniformes em 1-5. Os consumidores são gerados em blocos, cada um
+com o seu próprio fluxo aleatório derivado da semente: a saída é reprodutível para a mesma
+semente e o mesmo `consumidores_por_bloco`, e os blocos podem ser gravados em disco
+(`.npz` ou Parquet) sem manter a tabela longa inteira na memória.
+
+Para testes de carga:
+
+    python -m recomendador.simulacao avaliacoes/ --consumidores 750000 --formato npz
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from recomendador.colaborativo import COLUNAS_UTILIDADE_LONGA
+
+# Até este número de associações, a amostragem sem reposição ordena chaves aleatórias de todas elas
+MAX_ASSOCIACOES_AMOSTRAGEM_DENSA = 64
+
+FORMATOS_BLOCOS = ('npz', 'parquet')
+
+
+def gerar_avaliacoes(df_associacoes, num_consumidores=500, min_avaliacoes=10, max_avaliacoes=25, semente=101,
+                     consumidores_por_bloco=50_000, prob_proxima_media=0.6, desvio_proxima_media=0.5):
+    """
+    Gera a matriz de utilidade em formato longo (`id_consumidor`, `id_associacao`, `avaliacao`),
+    um DataFrame por bloco de `consumidores_por_bloco` consumidores.
+    """
+    ids_associacoes = df_associacoes['id'].unique()
+    if len(ids_associacoes) == 0:
+        raise ValueError("Nenhuma ID de associação encontrada. Verifique o df_associacoes.")
+    medias = df_associacoes.drop_duplicates('id').set_index('id')['avaliacao_media'].reindex(ids_associacoes).to_numpy(dtype=float)
+
+    max_por_consumidor = min(max_avaliacoes, len(ids_associacoes))
+    min_por_consumidor = min(max(min_avaliacoes, 1), max_por_consumidor)
+    largura_id = max(3, len(str(num_consumidores)))
+    inicios = range(0, num_consumidores, consumidores_por_bloco)
+    sementes = np.random.SeedSequence(semente).spawn(len(inicios))
+
+    for inicio, semente_bloco in zip(inicios, sementes):
+        aleatorio = np.random.default_rng(semente_bloco)
+        num_no_bloco = min(consumidores_por_bloco, num_consumidores - inicio)
+        quantidades = aleatorio.integers(min_por_consumidor, max_por_consumidor + 1, size=num_no_bloco)
+        posicoes = _amostrar_sem_reposicao(aleatorio, len(ids_associacoes), quantidades)
+
+        proxima_media = aleatorio.random(len(posicoes)) < prob_proxima_media
+        avaliacoes_proximas = np.clip(np.round(aleatorio.normal(medias[posicoes], desvio_proxima_media)), 1, 5)
+        avaliacoes_uniformes = aleatorio.integers(1, 6, size=len(posicoes))
+        avaliacoes = np.where(proxima_media, avaliacoes_proximas, avaliacoes_uniformes).astype(np.int8)
+
+        nomes = np.char.add('Consumidor_', np.char.zfill(np.arange(inicio + 1, inicio + num_no_bloco + 1).astype(str), largura_id))
+        yield pd.DataFrame({
+            'id_consumidor': np.repeat(nomes, quantidades),
+            'id_associacao': ids_associacoes[posicoes],
+            'avaliacao': avaliacoes,
+        }, columns=list(COLUNAS_UTILIDADE_LONGA))
+
+
+def _amostrar_sem_reposicao(aleatorio, num_itens, quantidades):
+    """
+    Para cada linha i, `quantidades[i]` posições distintas em [0, num_itens), concatenadas linha a linha.
+    Poucos itens: ordena chaves aleatórias. Muitos itens: sorteia com reposição e fica com os
+    primeiros valores distintos de cada linha (linhas que não completarem são sorteadas de novo).
+    """
+    num_linhas = len(quantidades)
+    maximo = int(quantidades.max()) if num_linhas else 0
+    if num_itens <= MAX_ASSOCIACOES_AMOSTRAGEM_DENSA:
+        ordem = np.argsort(aleatorio.random((num_linhas, num_itens)), axis=1)[:, :maximo]
+        return ordem[np.arange(maximo) < quantidades[:, None]]
+
+    candidatos = aleatorio.integers(0, num_itens, size=(num_linhas, 2 * maximo + 8))
+    ordem = np.argsort(candidatos, axis=1, kind='stable')
+    ordenados = np.take_along_axis(candidatos, ordem, axis=1)
+    primeira_ocorrencia_ordenada = np.ones_like(ordenados, dtype=bool)
+    primeira_ocorrencia_ordenada[:, 1:] = ordenados[:, 1:] != ordenados[:, :-1]
+    primeira_ocorrencia = np.empty_like(primeira_ocorrencia_ordenada)
+    np.put_along_axis(primeira_ocorrencia, ordem, primeira_ocorrencia_ordenada, axis=1)
+
+    selecionados = primeira_ocorrencia & (np.cumsum(primeira_ocorrencia, axis=1) <= quantidades[:, None])
+    incompletas = np.flatnonzero(selecionados.sum(axis=1) < quantidades)
+    if len(incompletas) == 0:
+        return candidatos[selecionados]
+    # Raro: refaz as linhas incompletas uma a uma, preservando a ordem das linhas
+    por_linha = [candidatos[i, selecionados[i]] for i in range(num_linhas)]
+    for i in incompletas:
+        por_linha[i] = aleatorio.choice(num_itens, size=quantidades[i], replace=False)
+    return np.concatenate(por_linha)
+
+
+def salvar_blocos_avaliacoes(blocos, diretorio, formato='npz'):
+    """Grava cada bloco (DataFrame) em `diretorio` como `avaliacoes_NNNNN.<formato>`. Retorna os caminhos."""
+    if formato not in FORMATOS_BLOCOS:
+        raise ValueError(f"Formato desconhecido: {formato!r}. Use um de {FORMATOS_BLOCOS}.")
+    os.makedirs(diretorio, exist_ok=True)
+    caminhos = []
+    for numero, bloco in enumerate(blocos):
+        caminho = os.path.join(diretorio, f'avaliacoes_{numero:05d}.{formato}')
+        if formato == 'parquet':
+            bloco.to_parquet(caminho, index=False)  # requer pyarrow ou fastparquet
+        else:
+            np.savez(caminho, **{
+                coluna: (np.array(bloco[coluna].tolist(), dtype=str) if coluna == 'id_consumidor' else bloco[coluna].to_numpy())
+                for coluna in COLUNAS_UTILIDADE_LONGA
+            })
+        caminhos.append(caminho)
+    return caminhos
+
+
+def ler_blocos_avaliacoes(diretorio):
+    """Lê, em ordem, os blocos gravados por `salvar_blocos_avaliacoes` (um DataFrame por arquivo)."""
+    for nome in sorted(os.listdir(diretorio)):
+        caminho = os.path.join(diretorio, nome)
+        if not nome.startswith('avaliacoes_'):
+            continue
+        if nome.endswith('.parquet'):
+            yield pd.read_parquet(caminho)
+        elif nome.endswith('.npz'):
+            with np.load(caminho, allow_pickle=False) as arquivo:
+                yield pd.DataFrame({coluna: arquivo[coluna] for coluna in COLUNAS_UTILIDADE_LONGA})
+
+
+def main(argv=None):
+    from recomendador.dados import carregar_associacoes
+
+    parser = argparse.ArgumentParser(description="Gera avaliações simuladas em blocos (.npz ou Parquet).")
+    parser.add_argument('diretorio', help="Diretório de saída")
+    parser.add_argument('--consumidores', type=int, default=500)
+    parser.add_argument('--min-avaliacoes', type=int, default=10)
+    parser.add_argument('--max-avaliacoes', type=int, default=25)
+    parser.add_argument('--semente', type=int, default=101)
+    parser.add_argument('--consumidores-por-bloco', type=int, default=50_000)
+    parser.add_argument('--formato', choices=FORMATOS_BLOCOS, default='npz')
+    args = parser.parse_args(argv)
+    blocos = gerar_avaliacoes(
+        carregar_associacoes(), args.consumidores, args.min_avaliacoes, args.max_avaliacoes,
+        args.semente, args.consumidores_por_bloco
+    )
+    caminhos = salvar_blocos_avaliacoes(blocos, args.diretorio, args.formato)
+    print(f"{len(caminhos)} blocos gravados em {args.diretorio}")
+
+
+if __name__ == '__main__':
+    main()
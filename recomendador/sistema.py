@@ -0,0 +1,844 @@
+"""
+Sistema de recomendação híbrido de associações/cooperativas do DF (`SistemaRecomendacaoDF`).
+
+Combina distância, avaliação média, objetivo nutricional, relevância da produção regional
+e filtragem colaborativa. O sistema pode ser montado a partir dos DataFrames de entrada ou
+carregado pronto de um artefato `.npz` (`SistemaRecomendacaoDF.carregar`), gravado pela
+etapa de build (`python -m recomendador.construir`).
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+from recomendador.artefato import salvar_artefato, carregar_artefato
+from recomendador.cache import CacheRecomendacoes, preferencias_canonicas
+from recomendador.cesta import planejar
+from recomendador.colaborativo import (
+    COLUNAS_UTILIDADE_LONGA, BACKENDS_COLABORATIVOS, MODELOS_COLABORATIVOS,
+    utilidade_pivot_para_longa, ModeloItemItem, ModeloFatoresLatentes
+)
+from recomendador.distancia import matriz_distancias_km
+from recomendador.indice_espacial import IndiceEspacialAssociacoes
+from recomendador.instrumentacao import MEDICAO_DESATIVADA, Instrumentacao, EstatisticasInstrumentacao
+from recomendador.produtos import (
+    matriz_incidencia, matriz_incidencia_codigos, oferece_algum, media_score_produtos
+)
+from recomendador.perfil_nutricional import (
+    OBJETIVOS_NUTRICIONAIS, colunas_nutrientes, matriz_perfil_nutricional, scores_objetivo
+)
+from recomendador.relevancia_regional import tabela_relevancia_regional, relevancia_por_associacao, scores_relevancia_regional
+from recomendador.sazonalidade import mes_da_preferencia, meses_na_epoca, matriz_meses_associacoes, oferta_no_mes
+
+logger = logging.getLogger(__name__)
+
+# Com Copy-on-Write (sempre ativo no pandas >= 3), uma cópia rasa já isola o sistema de
+# mudanças posteriores nos DataFrames de entrada, sem duplicar os dados
+_COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3 or pd.get_option('mode.copy_on_write') is True
+
+
+def _snapshot(df):
+    return df.copy(deep=not _COPY_ON_WRITE)
+
+
+class SistemaRecomendacaoDF:
+    # Colunas retornadas por recomendar (e, após consumer_id/rank, por recomendar_lote)
+    RECOMMENDATION_COLUMNS = [
+        'id', 'nome', 'distance_km', 'avaliacao_media', 'produtos', 'final_score',
+        'normalized_distance_score', 'normalized_rating_score',
+        'normalized_nutritional_score', 'normalized_regional_production_score', 'normalized_collaborative_score'
+    ]
+
+    # Pesos padrão de cada sub-score no final_score, na ordem em que são somados
+    DEFAULT_WEIGHTS = {
+        'weight_distance': 0.25,
+        'weight_rating': 0.20,
+        'weight_nutritional_goal': 0.15,
+        'weight_regional_production_relevance': 0.20,
+        'weight_collaborative_score': 0.20,
+    }
+
+    # Valores das preferências ausentes em `recomendar` (a chave do cache os preenche)
+    DEFAULT_PREFERENCES = {
+        'desired_products': [],
+        'max_distance_km': 30,
+        'only_organic': False,
+        'nutritional_goal': None,
+        'consider_regional_production_relevance': True,
+        'mes': None,
+        'top_n_results': 5,
+        **DEFAULT_WEIGHTS,
+    }
+
+    # recomendar_lote: consumidores por bloco (limita a memória das matrizes consumidores x associações)
+    # e faixa de latitude (graus) usada para pôr consumidores próximos no mesmo bloco
+    BATCH_BLOCK_SIZE = 256
+    BATCH_BLOCK_LATITUDE_BAND = 0.05
+
+    # Colunas das paradas retornadas por planejar_cesta
+    BASKET_STOP_COLUMNS = ['ordem', 'id', 'nome', 'produtos_comprados', 'distancia_trecho_km', 'distancia_acumulada_km']
+
+    # Objetivos nutricionais nomeados ({nutriente: peso}); nutritional_goal também aceita um
+    # dicionário {nutriente: peso} com qualquer coluna de nutrient_columns
+    NUTRITIONAL_GOALS = OBJETIVOS_NUTRICIONAIS
+
+    # Arrays pré-calculados na inicialização e gravados no artefato
+    PRECOMPUTED_ARRAYS = (
+        'product_vocabulary', 'association_products', 'nutrient_columns',
+        'product_nutrient_profile', 'product_has_nutrient', 'regional_relevance', 'association_product_months'
+    )
+
+    # Instrumentação opcional (ativar_instrumentacao); None = desativada
+    instrumentation = None
+    # Cache opcional dos resultados de recomendar (ativar_cache); None = desativado
+    result_cache = None
+    # Tabelas colunares (recomendador.tabelas) de onde vieram as associações; None = usar as listas do DataFrame
+    tables = None
+    # Calendário de comercialização (produto x mês, recomendador.dados.carregar_sazonalidade); None = sem sazonalidade
+    seasonality_df = None
+
+    def __init__(self, associations_data_df, nutritional_info_df, regional_production_df, consumer_ratings_df,
+                 distance_method='elipsoidal', similarity_top_k=50,
+                 collaborative_backend='item_item', latent_factors=20, collaborative_model=None, tables=None,
+                 seasonality_df=None):
+        self.associations_df = _snapshot(associations_data_df)
+        # tables: TabelasColunares com as mesmas associações (na mesma ordem); as incidências de
+        # produtos e regiões saem dos códigos dos dicionários compartilhados
+        self.tables = tables
+        self.nutritional_info_df = _snapshot(nutritional_info_df)
+        self.regional_production_df = _snapshot(regional_production_df)
+        # seasonality_df: intensidade da oferta de cada produto por mês; com ela, a preferência `mes`
+        # restringe o filtro de produtos e os scores por produto aos produtos na época
+        if seasonality_df is not None:
+            self.seasonality_df = _snapshot(seasonality_df)
+
+        # distance_method: 'elipsoidal' (WGS-84, mesmos resultados da geodésica do geopy no limite do raio)
+        # ou 'haversine' (esfera, um pouco mais rápido; erro de até ~0,6% muda candidatas na borda do raio)
+        self.distance_method = distance_method
+        self._build_indices()
+
+        # Avaliações em formato longo (id_consumidor, id_associacao, avaliacao)
+        # Aceita a matriz de utilidade em formato longo (df_utility_long) ou pivotada (df_utility_pivot)
+        if set(COLUNAS_UTILIDADE_LONGA).issubset(consumer_ratings_df.columns):
+            consumer_ratings_long_df = consumer_ratings_df[list(COLUNAS_UTILIDADE_LONGA)]
+        else:
+            consumer_ratings_long_df = utilidade_pivot_para_longa(consumer_ratings_df)
+
+        # Modelo colaborativo (collaborative_backend):
+        # 'item_item': avaliações esparsas (consumidores x associações) e similaridade do cosseno
+        #   Associação-Associação guardando só os top-k vizinhos; aceita novas avaliações incrementalmente
+        # 'svd': fatores latentes (SVD truncada da matriz centrada), score por produto escalar em O(k)
+        # collaborative_model: um modelo já treinado (ex: ModeloFatoresLatentes.carregar(...)), usado no lugar do treino
+        if collaborative_backend not in BACKENDS_COLABORATIVOS:
+            raise ValueError(f"Backend colaborativo desconhecido: {collaborative_backend!r}. Use um de {BACKENDS_COLABORATIVOS}.")
+        self.similarity_top_k = similarity_top_k
+        self.collaborative_backend = collaborative_backend
+        if collaborative_model is not None:
+            self.collaborative_model = collaborative_model
+            logger.info("Modelo colaborativo fornecido: %s.", type(collaborative_model).__name__)
+        elif collaborative_backend == 'svd':
+            self.collaborative_model = ModeloFatoresLatentes(consumer_ratings_long_df, k=latent_factors)
+            if self.collaborative_model.disponivel:
+                logger.info("Fatores latentes calculados (SVD truncada, k=%d, %d consumidores x %d associações).",
+                            self.collaborative_model.fatores_associacoes.shape[1],
+                            self.collaborative_model.fatores_consumidores.shape[0],
+                            self.collaborative_model.fatores_associacoes.shape[0])
+            else:
+                logger.info("Matriz de utilidade vazia ou com poucos itens. Fatores latentes não calculados.")
+        else:
+            self.collaborative_model = ModeloItemItem(consumer_ratings_long_df, k=similarity_top_k)
+            if self.collaborative_model.disponivel:
+                logger.info("Matriz de similaridade Associação-Associação calculada (%s, top-%d vizinhos, %d pares armazenados).",
+                            self.collaborative_model.vizinhos.shape, similarity_top_k,
+                            self.collaborative_model.vizinhos.base.nnz)
+            else:
+                logger.info("Matriz de utilidade vazia ou com poucos itens. Similaridade Associação-Associação não calculada.")
+        logger.info("SistemaRecomendacaoDF inicializado.")
+
+    def _build_indices(self):
+        """Pré-calcula as estruturas que dependem só das associações, nutrientes e produção regional."""
+        self._set_association_arrays()
+
+        # Índices de produtos: incidência associações x produtos (produtos oferecidos) e
+        # matriz produtos x scores nutricionais, sobre o mesmo vocabulário de produtos
+        coded_lists = self._coded_association_lists()
+        if coded_lists is None:
+            association_product_names = set().union(*self.associations_df['produtos'])
+        else:
+            offsets, codes = coded_lists['produtos']
+            association_product_names = set(self.tables.dicionarios['produtos'][np.unique(codes)].tolist())
+        self.product_vocabulary = pd.Index(sorted(set(self.regional_production_df['produto']) | association_product_names))
+        if coded_lists is None:
+            self.association_products = matriz_incidencia(self.associations_df['produtos'], self.product_vocabulary)
+        else:
+            self.association_products = matriz_incidencia_codigos(
+                offsets, codes, self.tables.dicionarios['produtos'], self.product_vocabulary
+            )
+        # Sazonalidade: meses (bits) em que cada associação oferece cada produto na época
+        self.association_product_months = matriz_meses_associacoes(
+            self.association_products, meses_na_epoca(self.seasonality_df, self.product_vocabulary)
+        )
+        # Perfil nutricional: produtos x nutrientes (todas as colunas numéricas), normalizado pelo máximo
+        self.nutrient_columns = colunas_nutrientes(self.nutritional_info_df)
+        self.product_nutrient_profile, self.product_has_nutrient = matriz_perfil_nutricional(
+            self.nutritional_info_df, self.product_vocabulary, self.nutrient_columns
+        )
+
+        # Relevância regional pré-calculada: a maior relevância de cada produto entre as
+        # regiões da associação (associações x produtos, 0-1)
+        region_vocabulary = pd.Index(self.regional_production_df['regiao'].unique())
+        if coded_lists is None:
+            association_regions = matriz_incidencia(self.associations_df['regioes'], region_vocabulary, normalizar=str.upper)
+        else:
+            # O dicionário de regiões já está em maiúsculas
+            association_regions = matriz_incidencia_codigos(
+                *coded_lists['regioes'], self.tables.dicionarios['regioes'], region_vocabulary
+            )
+        self.regional_relevance = relevancia_por_associacao(
+            association_regions,
+            tabela_relevancia_regional(self.regional_production_df, region_vocabulary, self.product_vocabulary)
+        )
+
+    def _coded_association_lists(self):
+        """(offsets, códigos) de `produtos` e `regioes` das tabelas colunares, se elas forem as das associações atuais."""
+        if self.tables is None:
+            return None
+        table_ids = self.tables.coluna('associacoes', 'id')
+        if len(table_ids) != len(self.associations_df) or not np.array_equal(table_ids, self.association_ids):
+            logger.warning("Tabelas colunares não correspondem às associações; usando as listas do DataFrame.")
+            return None
+        return {column: self.tables.coluna('associacoes', column) for column in ('produtos', 'regioes')}
+
+    def _set_association_arrays(self):
+        # Colunas das associações como arrays: o pipeline de recomendar trabalha com posições
+        # e máscaras sobre eles e só materializa um DataFrame com as linhas do top N
+        self.association_ids = self.associations_df['id'].to_numpy()
+        self.association_latitudes = self.associations_df['latitude'].to_numpy(dtype=float)
+        self.association_longitudes = self.associations_df['longitude'].to_numpy(dtype=float)
+        self.association_rating_scores = self.associations_df['avaliacao_media'].to_numpy(dtype=float) / 5.0
+        self.association_is_organic = (self.associations_df['organico_principal'] == True).to_numpy(dtype=bool)
+        self._spatial_index = None
+
+    @property
+    def spatial_index(self):
+        """Índice espacial (BallTree haversine) para o filtro de raio, construído uma única vez, no primeiro uso."""
+        if self._spatial_index is None:
+            self._spatial_index = IndiceEspacialAssociacoes(self.association_latitudes, self.association_longitudes)
+        return self._spatial_index
+
+    def salvar(self, path):
+        """
+        Grava o sistema pronto em um único artefato `.npz`: DataFrames de entrada, arrays
+        pré-calculados, modelo colaborativo (com as avaliações adicionadas depois) e configuração.
+        """
+        salvar_artefato(
+            path,
+            dataframes={
+                'associations': self.associations_df,
+                'nutritional_info': self.nutritional_info_df,
+                'regional_production': self.regional_production_df,
+                **({} if self.seasonality_df is None else {'seasonality': self.seasonality_df}),
+            },
+            arrays={name: getattr(self, name) for name in self.PRECOMPUTED_ARRAYS},
+            arrays_colaborativos=self.collaborative_model.para_arrays(),
+            config={
+                'distance_method': self.distance_method,
+                'similarity_top_k': self.similarity_top_k,
+                'collaborative_backend': self.collaborative_model.BACKEND,
+            }
+        )
+
+    @classmethod
+    def carregar(cls, path):
+        """Constrói um sistema pronto a partir de um artefato gravado por `salvar` (sem refazer o pré-processamento)."""
+        dataframes, arrays, collaborative_arrays, config = carregar_artefato(path)
+        system = cls.__new__(cls)
+        system.associations_df = dataframes['associations']
+        system.nutritional_info_df = dataframes['nutritional_info']
+        system.regional_production_df = dataframes['regional_production']
+        system.seasonality_df = dataframes.get('seasonality')
+        system.distance_method = config['distance_method']
+        system.similarity_top_k = config['similarity_top_k']
+        system.collaborative_backend = config['collaborative_backend']
+        system._set_association_arrays()
+        for name in cls.PRECOMPUTED_ARRAYS:
+            setattr(system, name, arrays[name])
+        system.product_vocabulary = pd.Index(system.product_vocabulary.tolist())
+        system.nutrient_columns = pd.Index(system.nutrient_columns.tolist())
+        system.collaborative_model = MODELOS_COLABORATIVOS[config['collaborative_backend']].de_arrays(collaborative_arrays)
+        return system
+
+    def ativar_instrumentacao(self, hooks=()):
+        """
+        Ativa a medição por etapa de `recomendar`, `recomendar_lote` e `planejar_cesta`. Os eventos vão para
+        `hooks` (callables `gancho(tipo, nome, valor)`, ver `recomendador.instrumentacao`) e para
+        um `EstatisticasInstrumentacao`, que é retornado com os tempos e contadores agregados.
+        """
+        statistics = EstatisticasInstrumentacao()
+        self.instrumentation = Instrumentacao([statistics, *hooks])
+        return statistics
+
+    def desativar_instrumentacao(self):
+        self.instrumentation = None
+
+    def ativar_cache(self, capacity=1024, ttl_s=300.0, grid_degrees=0.005):
+        """
+        Ativa o cache LRU dos resultados de `recomendar` (chave: consumidor, coordenadas na grade de
+        `grid_degrees` graus e hash das preferências; validade de `ttl_s` segundos, None = sem expiração).
+        Retorna o `CacheRecomendacoes`, que expõe as estatísticas de acertos e falhas.
+        """
+        self.result_cache = CacheRecomendacoes(capacity, ttl_s, grid_degrees, self.DEFAULT_PREFERENCES)
+        return self.result_cache
+
+    def desativar_cache(self):
+        self.result_cache = None
+
+    def _invalidate_cache(self, consumer_id=None):
+        """Invalida os resultados de um consumidor, ou todos (consumer_id=None)."""
+        if self.result_cache is None:
+            return
+        if consumer_id is None:
+            self.result_cache.limpar()
+        else:
+            self.result_cache.invalidar_consumidor(consumer_id)
+
+    def atualizar_dados(self, associations_data_df=None, nutritional_info_df=None, regional_production_df=None,
+                        seasonality_df=None):
+        """
+        Substitui associações, nutrientes, produção regional e/ou sazonalidade (os não informados são mantidos),
+        refaz os índices pré-calculados e invalida o cache. O modelo colaborativo é mantido.
+        """
+        if associations_data_df is not None:
+            self.associations_df = _snapshot(associations_data_df)
+            # As listas codificadas eram das associações anteriores
+            self.tables = None
+        if nutritional_info_df is not None:
+            self.nutritional_info_df = _snapshot(nutritional_info_df)
+        if regional_production_df is not None:
+            self.regional_production_df = _snapshot(regional_production_df)
+        if seasonality_df is not None:
+            self.seasonality_df = _snapshot(seasonality_df)
+        self._build_indices()
+        self._invalidate_cache()
+
+    def _start_measurement(self, operation):
+        if self.instrumentation is None:
+            return MEDICAO_DESATIVADA
+        return self.instrumentation.iniciar(operation)
+
+    def _calculate_distance_km(self, lat1, lon1, lat2, lon2):
+        """Calcula a distância entre dois pontos em km (mantido por compatibilidade; usa o cálculo vetorizado)."""
+        # Retorna infinito se alguma coordenada for inválida
+        return float(matriz_distancias_km(lat1, lon1, [lat2], [lon2], metodo=self.distance_method)[0, 0])
+
+    def _get_association_collaborative_score(self, consumer_id, candidate_association_id):
+        """Calcula o score colaborativo para uma associação candidata (mantido por compatibilidade; usa o cálculo matricial)."""
+        return float(self._collaborative_score_matrix([consumer_id], [candidate_association_id])[0, 0])
+
+    def _collaborative_score_matrix(self, consumer_ids, association_ids):
+        """
+        Scores colaborativos brutos (consumidores x associações) do modelo colaborativo.
+        'item_item': para cada candidata, média de similaridade x avaliação sobre as associações que o
+        consumidor avaliou bem (>= 3.5), excluindo a própria candidata.
+        'svd': avaliação prevista (média do consumidor + produto escalar dos fatores latentes).
+        """
+        return self.collaborative_model.scores(consumer_ids, association_ids)
+
+    def adicionar_avaliacoes(self, consumer_id, ratings):
+        """
+        Registra avaliações de um consumidor (novo ou existente) sem reconstruir o sistema
+        (no backend 'svd', o fator do consumidor é recalculado por folding-in).
+        `ratings`: dicionário {id_associacao: avaliacao} ou lista de {'id_associacao': ..., 'avaliacao': ...}.
+        Uma nova avaliação da mesma associação substitui a anterior.
+        """
+        if not isinstance(ratings, dict):
+            ratings = {rating['id_associacao']: rating['avaliacao'] for rating in ratings}
+        for association_id, rating in ratings.items():
+            if rating is None or not rating > 0:
+                raise ValueError(f"Avaliação inválida para a associação {association_id}: {rating!r} (deve ser > 0).")
+        self.collaborative_model.atualizar_avaliacoes(consumer_id, ratings)
+        self._invalidate_cache_after_rating_update(consumer_id)
+
+    def remover_avaliacao(self, consumer_id, association_id):
+        """Remove a avaliação de um consumidor para uma associação (se existir)."""
+        if self.collaborative_model.conhece_consumidor(consumer_id):
+            self.collaborative_model.atualizar_avaliacoes(consumer_id, {association_id: None})
+            self._invalidate_cache_after_rating_update(consumer_id)
+
+    def _invalidate_cache_after_rating_update(self, consumer_id):
+        # Item-item: a similaridade entre associações muda para todos; SVD: só o fator do consumidor
+        if self.collaborative_model.ATUALIZACAO_AFETA_OUTROS_CONSUMIDORES:
+            self._invalidate_cache()
+        else:
+            self._invalidate_cache(consumer_id)
+
+    def _desired_product_positions(self, desired_products_list):
+        """Colunas de self.product_vocabulary dos produtos desejados (produtos desconhecidos são ignorados)."""
+        positions = self.product_vocabulary.get_indexer(pd.unique(pd.Series(desired_products_list, dtype=object)))
+        return positions[positions >= 0]
+
+    def _association_offers(self, positions, month=None):
+        """
+        Incidência (associações `positions` x produtos) dos produtos oferecidos; com `month` (1-12),
+        só os que estão na época no mês (bit do mês em association_product_months).
+        """
+        if month is None:
+            return self.association_products[positions]
+        return oferta_no_mes(self.association_product_months[positions], month)
+
+    def _offers_desired_products_mask(self, positions, desired_product_positions, month=None):
+        """Máscara das associações (posições `positions`) que oferecem ao menos um dos produtos desejados."""
+        return oferece_algum(self._association_offers(positions, month), desired_product_positions)
+
+    def _product_goal_scores(self, nutritional_goal):
+        """
+        (score por produto, tem score) do objetivo nutricional: um nome de NUTRITIONAL_GOALS ou um
+        dicionário {nutriente: peso}. None se não há objetivo (ou o nome é desconhecido).
+        """
+        if isinstance(nutritional_goal, str):
+            nutritional_goal = self.NUTRITIONAL_GOALS.get(nutritional_goal)
+        return scores_objetivo(
+            self.product_nutrient_profile, self.product_has_nutrient, nutritional_goal, self.nutrient_columns
+        )
+
+    def _nutritional_scores(self, positions, desired_product_positions, nutritional_goal, month=None):
+        """Média do score do objetivo nutricional sobre os produtos desejados oferecidos por cada associação."""
+        if not nutritional_goal or len(desired_product_positions) == 0:
+            return np.zeros(len(positions))
+        product_scores = self._product_goal_scores(nutritional_goal)
+        if product_scores is None:
+            return np.zeros(len(positions))
+        return media_score_produtos(self._association_offers(positions, month), desired_product_positions, *product_scores)
+
+    def _regional_production_scores(self, positions, desired_product_positions, month=None):
+        """Média, sobre os produtos desejados oferecidos, da maior relevância regional (0-1) entre as regiões de cada associação."""
+        return scores_relevancia_regional(
+            self.regional_relevance[positions], self._association_offers(positions, month), desired_product_positions
+        )
+
+    def recomendar(self, consumer_id, user_latitude, user_longitude, user_preferences):
+        """
+        Gera recomendações de associações com base nas preferências do usuário e filtros.
+        Com o cache ativo (ativar_cache), reaproveita o resultado de um pedido equivalente.
+        """
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = self.result_cache.chave(consumer_id, user_latitude, user_longitude, user_preferences)
+        if cache_key is None:
+            return self._recommend(consumer_id, user_latitude, user_longitude, user_preferences)
+        cache_generation = self.result_cache.geracao
+        recommendations_df = self.result_cache.obter(cache_key)
+        if recommendations_df is None:
+            recommendations_df = self._recommend(consumer_id, user_latitude, user_longitude, user_preferences)
+            self.result_cache.guardar(cache_key, recommendations_df, cache_generation)
+        return recommendations_df
+
+    def _recommend(self, consumer_id, user_latitude, user_longitude, user_preferences):
+        measurement = self._start_measurement('recomendar')
+        logger.debug("Gerando recomendações para '%s' em (%.4f, %.4f)", consumer_id, user_latitude, user_longitude)
+        logger.debug("Preferências: %s, Dist. Max: %skm",
+                     user_preferences.get('desired_products', 'N/A'), user_preferences.get('max_distance_km', 'N/A'))
+
+        # Mês da preferência `mes`: produtos fora da época não contam no filtro nem nos scores por produto
+        month = mes_da_preferencia(user_preferences.get('mes'))
+
+        # 1. Filtro de Distância
+        # O índice espacial devolve só as associações dentro do raio; a distância exata é medida apenas para elas
+        max_dist_km_pref = user_preferences.get('max_distance_km', 30) # Padrão de 30km
+        candidate_positions = self.spatial_index.consultar_raio(user_latitude, user_longitude, max_dist_km_pref)
+        measurement.contar('candidatas_raio', len(candidate_positions))
+        distances = matriz_distancias_km(
+            user_latitude, user_longitude,
+            self.association_latitudes[candidate_positions], self.association_longitudes[candidate_positions],
+            metodo=self.distance_method
+        )[0]
+        within_distance = distances <= max_dist_km_pref
+        candidate_positions, distances = candidate_positions[within_distance], distances[within_distance]
+        measurement.contar('candidatas_distancia', len(candidate_positions))
+        measurement.etapa('distancia')
+
+        # 2. Filtro de Orgânicos
+        if user_preferences.get('only_organic', False):
+            organic = self.association_is_organic[candidate_positions]
+            candidate_positions, distances = candidate_positions[organic], distances[organic]
+        measurement.contar('candidatas_organico', len(candidate_positions))
+        measurement.etapa('filtro_organico')
+
+        # 3. Filtro de Produtos Desejados
+        desired_products_list = user_preferences.get('desired_products', [])
+        desired_product_positions = self._desired_product_positions(desired_products_list)
+        if desired_products_list: # Se a lista não estiver vazia
+            offers_desired = self._offers_desired_products_mask(candidate_positions, desired_product_positions, month)
+            candidate_positions, distances = candidate_positions[offers_desired], distances[offers_desired]
+        measurement.contar('candidatas_produtos', len(candidate_positions))
+        measurement.etapa('filtro_produtos')
+
+        if len(candidate_positions) == 0:
+            logger.debug("Nenhuma associação candidata encontrada após filtros iniciais.")
+            measurement.finalizar()
+            return pd.DataFrame()
+        logger.debug("%d associações candidatas após filtros iniciais.", len(candidate_positions))
+
+        # --- Cálculo dos Scores para Ranking (arrays alinhados com candidate_positions) ---
+        final_scores = np.zeros(len(candidate_positions)) # Inicializa o score final
+
+        # Score de Distância (normalizado: 0 a 1, onde 1 é melhor/mais perto)
+        max_dist_found = distances.max()
+        min_dist_found = distances.min()
+        if max_dist_found > min_dist_found: # Evita divisão por zero se todas as distâncias forem iguais
+            distance_scores = 1 - (distances - min_dist_found) / (max_dist_found - min_dist_found)
+        else:
+            distance_scores = np.ones(len(distances)) # Todas têm a "melhor" distância (ou única)
+        final_scores += distance_scores * user_preferences.get('weight_distance', self.DEFAULT_WEIGHTS['weight_distance'])
+
+        # Score de Avaliação da Associação (normalizado: 0 a 1)
+        rating_scores = self.association_rating_scores[candidate_positions]
+        final_scores += rating_scores * user_preferences.get('weight_rating', self.DEFAULT_WEIGHTS['weight_rating'])
+        measurement.etapa('score_distancia_avaliacao')
+
+        # Score Nutricional
+        nutritional_goal_pref = user_preferences.get('nutritional_goal')
+        nutritional_scores = self._nutritional_scores(candidate_positions, desired_product_positions, nutritional_goal_pref, month)
+        final_scores += nutritional_scores * user_preferences.get('weight_nutritional_goal', self.DEFAULT_WEIGHTS['weight_nutritional_goal'])
+        if nutritional_goal_pref and desired_products_list:
+            measurement.contar('produtos_pontuados', len(candidate_positions) * len(desired_products_list))
+        measurement.etapa('score_nutricional')
+
+        # Score de Relevância Produtiva Regional
+        regional_production_scores = np.zeros(len(candidate_positions))
+        if user_preferences.get('consider_regional_production_relevance', True) and desired_products_list:
+            regional_production_scores = self._regional_production_scores(candidate_positions, desired_product_positions, month)
+        final_scores += regional_production_scores * user_preferences.get('weight_regional_production_relevance', self.DEFAULT_WEIGHTS['weight_regional_production_relevance'])
+        measurement.etapa('score_regional')
+
+        # Score Colaborativo (Item-Item)
+        collaborative_scores = np.zeros(len(candidate_positions))
+        if self.collaborative_model.conhece_consumidor(consumer_id) and self.collaborative_model.disponivel:
+            # Um único produto (similaridade das candidatas x avaliações do consumidor) para todas as candidatas
+            raw_collaborative_scores = self._collaborative_score_matrix(
+                [consumer_id], self.association_ids[candidate_positions]
+            )[0]
+            measurement.contar('consultas_similaridade', len(candidate_positions))
+            # Normaliza o score colaborativo (0-1) se houver scores > 0 (senão, nenhum score colaborativo relevante)
+            max_collab_score = raw_collaborative_scores.max()
+            if max_collab_score > 0:
+                collaborative_scores = raw_collaborative_scores / max_collab_score
+        final_scores += collaborative_scores * user_preferences.get('weight_collaborative_score', self.DEFAULT_WEIGHTS['weight_collaborative_score'])
+        measurement.etapa('score_colaborativo')
+
+        # Seleciona as Top N recomendações
+        top_n_recommendations = user_preferences.get('top_n_results', 5)
+        # Ordenação estável: empates mantêm a ordem original das associações (a mesma usada em recomendar_lote)
+        top = np.argsort(-final_scores, kind='stable')[:top_n_recommendations]
+
+        # Só as linhas do top N viram DataFrame
+        top_positions = candidate_positions[top]
+        final_recommendations_df = self.associations_df.iloc[
+            top_positions, self.associations_df.columns.get_indexer(['id', 'nome', 'avaliacao_media', 'produtos'])
+        ]
+        final_recommendations_df.insert(2, 'distance_km', distances[top])
+        final_recommendations_df['final_score'] = final_scores[top]
+        final_recommendations_df['normalized_distance_score'] = distance_scores[top]
+        final_recommendations_df['normalized_rating_score'] = rating_scores[top]
+        final_recommendations_df['normalized_nutritional_score'] = nutritional_scores[top]
+        final_recommendations_df['normalized_regional_production_score'] = regional_production_scores[top]
+        final_recommendations_df['normalized_collaborative_score'] = collaborative_scores[top]
+        measurement.etapa('ranking')
+        measurement.finalizar()
+        return final_recommendations_df
+
+    def recomendar_lote(self, consumer_ids, user_latitudes, user_longitudes, user_preferences):
+        """
+        Gera recomendações para vários consumidores de uma só vez.
+
+        Distâncias, filtros, sub-scores e o top-N são calculados como operações matriciais
+        (consumidores x associações), agrupando os consumidores que compartilham as mesmas preferências.
+        `user_preferences` pode ser um único dicionário (usado para todos) ou uma lista com um por consumidor.
+        Retorna um DataFrame em formato longo (`consumer_id`, `rank` e as colunas de `recomendar`),
+        com os mesmos resultados de chamadas individuais a `recomendar`.
+        Com o cache ativo (ativar_cache), cada consumidor passa pelo cache como em `recomendar`.
+        """
+        return self.recomendar_lote_com_tamanhos(consumer_ids, user_latitudes, user_longitudes, user_preferences)[0]
+
+    def recomendar_lote_com_tamanhos(self, consumer_ids, user_latitudes, user_longitudes, user_preferences):
+        """
+        `recomendar_lote` que também retorna o número de linhas de cada consumidor (na ordem de entrada),
+        para separar o resultado por consumidor. Com o cache ativo, os resultados guardados (também
+        os de `recomendar`) são reaproveitados e só os consumidores restantes são calculados, em um lote.
+        """
+        consumer_ids, user_latitudes, user_longitudes, preferences_per_consumer = self._batch_arguments(
+            consumer_ids, user_latitudes, user_longitudes, user_preferences
+        )
+        if self.result_cache is None:
+            return self._recommend_batch(consumer_ids, user_latitudes, user_longitudes, preferences_per_consumer)[:2]
+
+        cache_generation = self.result_cache.geracao
+        cache_keys = [self.result_cache.chave(*request) for request in
+                      zip(consumer_ids, user_latitudes, user_longitudes, preferences_per_consumer)]
+        results_per_consumer = [None if key is None else self.result_cache.obter(key) for key in cache_keys]
+        missing = [position for position, result in enumerate(results_per_consumer) if result is None]
+        if missing:
+            missing_df, missing_sizes, missing_positions = self._recommend_batch(
+                [consumer_ids[position] for position in missing], user_latitudes[missing], user_longitudes[missing],
+                [preferences_per_consumer[position] for position in missing]
+            )
+            limits = np.concatenate([[0], np.cumsum(missing_sizes)]).astype(int)
+            for position, start, end in zip(missing, limits[:-1], limits[1:]):
+                # No formato de recomendar (índice das associações; vazio sem colunas), compartilhado com ela no cache
+                if start == end:
+                    recommendations_df = pd.DataFrame()
+                else:
+                    recommendations_df = missing_df.iloc[start:end][self.RECOMMENDATION_COLUMNS].set_axis(
+                        self.associations_df.index[missing_positions[start:end]]
+                    )
+                results_per_consumer[position] = recommendations_df
+                if cache_keys[position] is not None:
+                    self.result_cache.guardar(cache_keys[position], recommendations_df, cache_generation)
+            if len(missing) == len(consumer_ids):
+                return missing_df, missing_sizes
+
+        result_sizes = [len(result) for result in results_per_consumer]
+        frames = [result.reset_index(drop=True) for result in results_per_consumer if len(result)]
+        batch_recommendations_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=self.RECOMMENDATION_COLUMNS)
+        batch_recommendations_df.insert(0, 'consumer_id', np.repeat(np.array(consumer_ids, dtype=object), result_sizes))
+        batch_recommendations_df.insert(1, 'rank', np.concatenate([np.arange(1, size + 1) for size in result_sizes] + [np.empty(0, dtype=int)]))
+        return batch_recommendations_df, result_sizes
+
+    def _batch_arguments(self, consumer_ids, user_latitudes, user_longitudes, user_preferences):
+        """Argumentos de `recomendar_lote` como listas/arrays, com um dicionário de preferências por consumidor."""
+        consumer_ids = list(consumer_ids)
+        user_latitudes = np.asarray(user_latitudes, dtype=float)
+        user_longitudes = np.asarray(user_longitudes, dtype=float)
+        if isinstance(user_preferences, dict):
+            preferences_per_consumer = [user_preferences] * len(consumer_ids)
+        else:
+            preferences_per_consumer = list(user_preferences)
+        if not (len(consumer_ids) == len(user_latitudes) == len(user_longitudes) == len(preferences_per_consumer)):
+            raise ValueError("consumer_ids, latitudes, longitudes e preferências devem ter o mesmo tamanho.")
+        return consumer_ids, user_latitudes, user_longitudes, preferences_per_consumer
+
+    def _recommend_batch(self, consumer_ids, user_latitudes, user_longitudes, user_preferences):
+        """
+        Calcula `recomendar_lote` (sem o cache). Retorna (DataFrame, número de linhas de cada consumidor
+        na ordem de entrada, posições das associações de cada linha).
+        """
+        consumer_ids, user_latitudes, user_longitudes, preferences_per_consumer = self._batch_arguments(
+            consumer_ids, user_latitudes, user_longitudes, user_preferences
+        )
+        measurement = self._start_measurement('recomendar_lote')
+        logger.debug("Gerando recomendações em lote para %d consumidores", len(consumer_ids))
+
+        # Agrupa consumidores com preferências idênticas: filtros e scores por associação são calculados uma vez por grupo
+        preference_groups = {}
+        for position, preferences in enumerate(preferences_per_consumer):
+            group_key = preferencias_canonicas(preferences)
+            preference_groups.setdefault(group_key, []).append(position)
+        measurement.contar('consumidores', len(consumer_ids))
+        measurement.contar('grupos_preferencias', len(preference_groups))
+        measurement.etapa('agrupamento')
+
+        association_positions = np.arange(len(self.association_ids))
+        results_per_consumer = [None] * len(consumer_ids)
+
+        for group_positions in preference_groups.values():
+            preferences = preferences_per_consumer[group_positions[0]]
+            month = mes_da_preferencia(preferences.get('mes'))
+
+            # Filtros que dependem apenas da associação
+            association_mask = np.ones(len(association_positions), dtype=bool)
+            if preferences.get('only_organic', False):
+                association_mask &= self.association_is_organic
+            desired_products_list = preferences.get('desired_products', [])
+            desired_product_positions = self._desired_product_positions(desired_products_list)
+            if desired_products_list:
+                association_mask &= self._offers_desired_products_mask(association_positions, desired_product_positions, month)
+            measurement.etapa('filtros')
+
+            # Scores nutricional e regional dependem só da associação e das preferências
+            nutritional_scores = self._nutritional_scores(
+                association_positions, desired_product_positions, preferences.get('nutritional_goal'), month
+            )
+            if preferences.get('nutritional_goal') and desired_products_list:
+                measurement.contar('produtos_pontuados', len(association_positions) * len(desired_products_list))
+            measurement.etapa('score_nutricional')
+            regional_production_scores = np.zeros(len(association_positions))
+            if preferences.get('consider_regional_production_relevance', True) and desired_products_list:
+                regional_production_scores = self._regional_production_scores(association_positions, desired_product_positions, month)
+            measurement.etapa('score_regional')
+
+            # Consumidores em blocos de BATCH_BLOCK_SIZE, os próximos no mapa no mesmo bloco: a memória
+            # de cada bloco é limitada e só as associações no raio de algum consumidor do bloco são medidas
+            group_positions = np.asarray(group_positions)
+            map_order = np.lexsort((user_longitudes[group_positions],
+                                    np.floor(user_latitudes[group_positions] / self.BATCH_BLOCK_LATITUDE_BAND)))
+            for block_start in range(0, len(group_positions), self.BATCH_BLOCK_SIZE):
+                block_positions = group_positions[map_order[block_start:block_start + self.BATCH_BLOCK_SIZE]]
+                block_results = self._rank_batch_block(
+                    [consumer_ids[p] for p in block_positions], user_latitudes[block_positions],
+                    user_longitudes[block_positions], preferences, association_mask,
+                    nutritional_scores, regional_production_scores, measurement
+                )
+                for position, result in zip(block_positions, block_results):
+                    results_per_consumer[position] = result
+
+        # Materializa um único DataFrame com as linhas do top N de todos os consumidores
+        result_sizes = [len(result['association_positions']) for result in results_per_consumer]
+        all_positions = np.concatenate([result['association_positions'] for result in results_per_consumer] + [np.empty(0, dtype=np.intp)])
+        batch_recommendations_df = self.associations_df.iloc[all_positions][['id', 'nome', 'avaliacao_media', 'produtos']].reset_index(drop=True)
+        batch_recommendations_df.insert(0, 'consumer_id', np.repeat(np.array(consumer_ids, dtype=object), result_sizes))
+        batch_recommendations_df.insert(1, 'rank', np.concatenate([np.arange(1, size + 1) for size in result_sizes] + [np.empty(0, dtype=int)]))
+        for column in self.RECOMMENDATION_COLUMNS:
+            if column not in batch_recommendations_df.columns:
+                batch_recommendations_df[column] = np.concatenate([result[column] for result in results_per_consumer] + [np.empty(0)])
+        batch_recommendations_df = batch_recommendations_df[['consumer_id', 'rank'] + self.RECOMMENDATION_COLUMNS]
+        logger.debug("%d recomendações geradas para %d consumidores.", len(batch_recommendations_df), len(consumer_ids))
+        measurement.etapa('materializacao')
+        measurement.finalizar()
+        return batch_recommendations_df, result_sizes, all_positions
+
+    def _rank_batch_block(self, block_consumer_ids, block_latitudes, block_longitudes, preferences, association_mask,
+                          nutritional_scores, regional_production_scores, measurement):
+        """
+        Top N de um bloco de consumidores com as mesmas preferências (ver `_recommend_batch`).
+        As matrizes (consumidores do bloco x associações) só têm as colunas das associações que
+        passam em `association_mask` e estão no raio de algum consumidor do bloco (índice espacial).
+        """
+        max_dist_km_pref = preferences.get('max_distance_km', 30)
+        columns = self.spatial_index.consultar_raio_varios(block_latitudes, block_longitudes, max_dist_km_pref)
+        columns = columns[association_mask[columns]]
+        empty_result = {'association_positions': np.empty(0, dtype=np.intp),
+                        **{column: np.empty(0) for column in self.RECOMMENDATION_COLUMNS}}
+        if len(columns) == 0:
+            measurement.etapa('distancia')
+            return [empty_result] * len(block_consumer_ids)
+
+        # Distância (consumidores x colunas) e máscara final de candidatas
+        distances = matriz_distancias_km(
+            block_latitudes, block_longitudes,
+            self.association_latitudes[columns], self.association_longitudes[columns], metodo=self.distance_method
+        )
+        # Associações sem coordenadas (distância inf) ficam de fora, como no índice espacial
+        candidate_mask = np.isfinite(distances) & (distances <= max_dist_km_pref)
+        measurement.contar('candidatas', candidate_mask.sum())
+
+        # Score de Distância (normalizado por consumidor sobre as suas candidatas)
+        max_dist_found = np.where(candidate_mask, distances, -np.inf).max(axis=1, keepdims=True)
+        min_dist_found = np.where(candidate_mask, distances, np.inf).min(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            distance_scores = np.where(
+                max_dist_found > min_dist_found,
+                1 - (distances - min_dist_found) / (max_dist_found - min_dist_found),
+                1.0
+            )
+        measurement.etapa('distancia')
+
+        # Score Colaborativo, normalizado pelo máximo entre as candidatas de cada consumidor
+        raw_collaborative_scores = self._collaborative_score_matrix(block_consumer_ids, self.association_ids[columns])
+        max_collab_score = np.where(candidate_mask, raw_collaborative_scores, -np.inf).max(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            collaborative_scores = np.where(max_collab_score > 0, raw_collaborative_scores / max_collab_score, 0.0)
+        measurement.contar('consultas_similaridade', raw_collaborative_scores.size)
+        measurement.etapa('score_colaborativo')
+
+        rating_scores = self.association_rating_scores[columns]
+        nutritional_scores = nutritional_scores[columns]
+        regional_production_scores = regional_production_scores[columns]
+        final_scores = np.zeros(distances.shape)
+        final_scores += distance_scores * preferences.get('weight_distance', self.DEFAULT_WEIGHTS['weight_distance'])
+        final_scores += rating_scores * preferences.get('weight_rating', self.DEFAULT_WEIGHTS['weight_rating'])
+        final_scores += nutritional_scores * preferences.get('weight_nutritional_goal', self.DEFAULT_WEIGHTS['weight_nutritional_goal'])
+        final_scores += regional_production_scores * preferences.get('weight_regional_production_relevance', self.DEFAULT_WEIGHTS['weight_regional_production_relevance'])
+        final_scores += collaborative_scores * preferences.get('weight_collaborative_score', self.DEFAULT_WEIGHTS['weight_collaborative_score'])
+
+        # Top N por consumidor (ordenação estável sobre as colunas em ordem crescente de posição, como em recomendar)
+        top_n_recommendations = preferences.get('top_n_results', 5)
+        block_results = []
+        for row in range(len(block_consumer_ids)):
+            candidate_columns = np.flatnonzero(candidate_mask[row])
+            ranking = np.argsort(-final_scores[row, candidate_columns], kind='stable')
+            top_columns = candidate_columns[ranking][:top_n_recommendations]
+            block_results.append({
+                'association_positions': columns[top_columns],
+                'distance_km': distances[row, top_columns],
+                'final_score': final_scores[row, top_columns],
+                'normalized_distance_score': distance_scores[row, top_columns],
+                'normalized_rating_score': rating_scores[top_columns],
+                'normalized_nutritional_score': nutritional_scores[top_columns],
+                'normalized_regional_production_score': regional_production_scores[top_columns],
+                'normalized_collaborative_score': collaborative_scores[row, top_columns],
+            })
+        measurement.etapa('ranking')
+        return block_results
+
+    def planejar_cesta(self, user_latitude, user_longitude, user_preferences):
+        """
+        Planeja onde comprar a cesta inteira (`desired_products`) com o menor deslocamento:
+        quais associações visitar, em que ordem e o que comprar em cada uma (ver `recomendador.cesta`).
+
+        Usa os filtros `max_distance_km`, `only_organic` e `mes` de `recomendar` e as chaves
+        `stop_cost_km` (km equivalentes a cada parada a mais, padrão 2), `return_home`
+        (soma a volta ao ponto de partida, padrão False) e `time_budget_ms` (orçamento do
+        plano exato, padrão 50; ao estourar, fica o plano guloso).
+        Retorna um dicionário com 'paradas' (DataFrame com as colunas BASKET_STOP_COLUMNS, na ordem
+        do percurso), 'distancia_total_km', 'produtos_nao_encontrados' (nenhuma candidata oferece)
+        e 'metodo' ('exato' ou 'guloso').
+        """
+        measurement = self._start_measurement('planejar_cesta')
+        basket = list(pd.unique(pd.Series(user_preferences.get('desired_products', []), dtype=object)))
+        max_dist_km_pref = user_preferences.get('max_distance_km', 30)
+        month = mes_da_preferencia(user_preferences.get('mes'))
+        return_home = user_preferences.get('return_home', False)
+
+        # Candidatas: raio, orgânicos e ao menos um item da cesta
+        candidate_positions = self.spatial_index.consultar_raio(user_latitude, user_longitude, max_dist_km_pref)
+        distances = matriz_distancias_km(
+            user_latitude, user_longitude,
+            self.association_latitudes[candidate_positions], self.association_longitudes[candidate_positions],
+            metodo=self.distance_method
+        )[0]
+        keep = distances <= max_dist_km_pref
+        if user_preferences.get('only_organic', False):
+            keep &= self.association_is_organic[candidate_positions]
+        candidate_positions, distances = candidate_positions[keep], distances[keep]
+        basket_positions = self.product_vocabulary.get_indexer(pd.Index(basket, dtype=object))
+        offers = np.zeros((len(candidate_positions), len(basket)), dtype=bool)
+        known = basket_positions >= 0
+        offers[:, known] = self._association_offers(candidate_positions, month)[:, basket_positions[known]]
+        offers_any = offers.any(axis=1)
+        candidate_positions, distances, offers = candidate_positions[offers_any], distances[offers_any], offers[offers_any]
+        available = offers.any(axis=0)
+        offers = offers[:, available]
+        measurement.contar('candidatas_cesta', len(candidate_positions))
+        measurement.etapa('candidatas')
+
+        latitudes = self.association_latitudes[candidate_positions]
+        longitudes = self.association_longitudes[candidate_positions]
+
+        def distances_between(origins, destinations):
+            return matriz_distancias_km(
+                latitudes[origins], longitudes[origins], latitudes[destinations], longitudes[destinations],
+                metodo=self.distance_method
+            )
+
+        plan = planejar(
+            offers, distances, distances_between,
+            custo_parada_km=user_preferences.get('stop_cost_km', 2.0), ida_e_volta=return_home,
+            orcamento_ms=user_preferences.get('time_budget_ms', 50.0)
+        )
+        measurement.etapa('plano')
+
+        available_products = np.array(basket, dtype=object)[available]
+        stop_positions = candidate_positions[plan['ordem']]
+        stops_df = self.associations_df.iloc[stop_positions][['id', 'nome']].reset_index(drop=True)
+        stops_df.insert(0, 'ordem', np.arange(1, len(stops_df) + 1))
+        stops_df['produtos_comprados'] = [available_products[items].tolist() for items in plan['itens']]
+        stops_df['distancia_trecho_km'] = plan['trechos_km']
+        stops_df['distancia_acumulada_km'] = np.cumsum(plan['trechos_km'])
+        measurement.etapa('materializacao')
+        measurement.finalizar()
+        return {
+            'paradas': stops_df[self.BASKET_STOP_COLUMNS],
+            'distancia_total_km': plan['distancia_km'],
+            'produtos_nao_encontrados': [product for product, found in zip(basket, available) if not found],
+            'metodo': plan['metodo'],
+        }
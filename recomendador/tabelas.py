@@ -0,0 +1,240 @@
+"""
+Formato colunar binário das tabelas de `tabelas/` (associações, produção EMATER, dados
+nutricionais, mapeamento e escopo de produtos).
+
+Nos CSVs, as colunas de lista (`regioes`, `produtos_originais`, `produtos`) são listas Python
+em texto, avaliadas linha a linha na leitura, e os nomes de produtos e regiões se repetem em
+todas as tabelas. No formato colunar:
+  * produtos e regiões são dicionários compartilhados (`dicionarios/produtos.npy`,
+    `dicionarios/regioes.npy`, em ordem alfabética) e as colunas guardam códigos int32;
+    regiões ficam em maiúsculas, como na produção EMATER (o sistema já as compara assim);
+  * cada coluna de lista vira `offsets` (int64, linhas + 1) e `codigos`;
+  * as demais colunas são arrays NumPy (texto com largura fixa, sem objetos Python).
+Cada coluna é um `.npy` sem compressão, aberto com memory-map: abrir as tabelas não lê os
+dados, e vários processos compartilham as mesmas páginas do arquivo. O `manifesto.json`
+descreve tabelas, colunas e dicionários.
+
+`SistemaRecomendacaoDF(..., tables=tabelas)` monta as incidências associações x produtos e
+associações x regiões direto dos códigos.
+
+Uso: python -m recomendador.tabelas [diretorio_csv] [diretorio_saida]
+"""
+import argparse
+import ast
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+VERSAO_TABELAS = 1
+
+ARQUIVO_MANIFESTO = 'manifesto.json'
+
+# Tabelas convertidas (nome -> arquivo CSV)
+ARQUIVOS_CSV = {
+    'associacoes': 'associacoes.csv',
+    'producao_emater': 'producao_emater.csv',
+    'dados_nutricionais': 'dados_nutricionais.csv',
+    'mapeamento_produtos': 'mapeamento_produtos.csv',
+    'produtos_escopo': 'produtos_escopo.csv',
+}
+
+# Colunas codificadas em um dicionário compartilhado (tabela -> {coluna: dicionário})
+COLUNAS_CODIFICADAS = {
+    'associacoes': {'regioes': 'regioes', 'produtos_originais': 'produtos', 'produtos': 'produtos'},
+    'producao_emater': {'regiao': 'regioes', 'produto': 'produtos'},
+    'dados_nutricionais': {'nome': 'produtos'},
+    'mapeamento_produtos': {'produto_original': 'produtos', 'produto_escopo': 'produtos'},
+    'produtos_escopo': {'produto': 'produtos'},
+}
+
+# Colunas com uma lista por linha (texto "['a', 'b']" nos CSVs)
+COLUNAS_LISTA = {'associacoes': ('regioes', 'produtos_originais', 'produtos')}
+
+# Normalização dos nomes antes da codificação, por dicionário
+NORMALIZACAO_DICIONARIOS = {'produtos': str.strip, 'regioes': lambda nome: nome.strip().upper()}
+
+# Tipos de coluna no manifesto
+COLUNA_VALOR, COLUNA_TEXTO, COLUNA_CODIGO, COLUNA_LISTA_CODIGOS = 'valor', 'texto', 'codigo', 'lista_codigos'
+
+
+def ler_tabelas_csv(diretorio):
+    """DataFrames dos CSVs de `diretorio` (os ausentes são ignorados), com as colunas de lista já avaliadas."""
+    tabelas = {}
+    for nome, arquivo in ARQUIVOS_CSV.items():
+        caminho = os.path.join(diretorio, arquivo)
+        if not os.path.exists(caminho):
+            continue
+        df = pd.read_csv(caminho)
+        for coluna in COLUNAS_LISTA.get(nome, ()):
+            df[coluna] = df[coluna].map(ast.literal_eval)
+        tabelas[nome] = df
+    return tabelas
+
+
+def montar_dicionarios(tabelas):
+    """Dicionários compartilhados: {nome: array ordenado com os valores normalizados de todas as tabelas}."""
+    valores = {dicionario: set() for dicionario in NORMALIZACAO_DICIONARIOS}
+    for nome, df in tabelas.items():
+        for coluna, dicionario in COLUNAS_CODIFICADAS.get(nome, {}).items():
+            normalizar = NORMALIZACAO_DICIONARIOS[dicionario]
+            if coluna in COLUNAS_LISTA.get(nome, ()):
+                valores[dicionario].update(normalizar(item) for itens in df[coluna] for item in itens)
+            else:
+                valores[dicionario].update(normalizar(item) for item in df[coluna].dropna())
+    return {dicionario: np.array(sorted(itens), dtype=str) for dicionario, itens in valores.items()}
+
+
+def _codificar(itens, dicionario, normalizar):
+    codigos = pd.Index(dicionario).get_indexer([normalizar(item) for item in itens])
+    return codigos.astype(np.int32)
+
+
+def converter_tabelas(tabelas, diretorio_saida):
+    """
+    Grava `tabelas` ({nome: DataFrame}, listas já avaliadas) no formato colunar em
+    `diretorio_saida`. Retorna o manifesto.
+    """
+    dicionarios = montar_dicionarios(tabelas)
+    os.makedirs(os.path.join(diretorio_saida, 'dicionarios'), exist_ok=True)
+    for dicionario, valores in dicionarios.items():
+        np.save(os.path.join(diretorio_saida, 'dicionarios', f'{dicionario}.npy'), valores)
+
+    manifesto = {'versao': VERSAO_TABELAS, 'dicionarios': {d: len(v) for d, v in dicionarios.items()}, 'tabelas': {}}
+    for nome, df in tabelas.items():
+        os.makedirs(os.path.join(diretorio_saida, nome), exist_ok=True)
+        colunas = {}
+        for coluna in df.columns:
+            base = os.path.join(diretorio_saida, nome, coluna)
+            dicionario = COLUNAS_CODIFICADAS.get(nome, {}).get(coluna)
+            if dicionario is not None and coluna in COLUNAS_LISTA.get(nome, ()):
+                tamanhos = df[coluna].map(len).to_numpy(dtype=np.int64)
+                itens = [item for lista in df[coluna] for item in lista]
+                np.save(f'{base}.offsets.npy', np.concatenate([[0], np.cumsum(tamanhos)]).astype(np.int64))
+                np.save(f'{base}.codigos.npy', _codificar(itens, dicionarios[dicionario], NORMALIZACAO_DICIONARIOS[dicionario]))
+                colunas[coluna] = {'tipo': COLUNA_LISTA_CODIGOS, 'dicionario': dicionario}
+            elif dicionario is not None:
+                np.save(f'{base}.npy', _codificar(df[coluna], dicionarios[dicionario], NORMALIZACAO_DICIONARIOS[dicionario]))
+                colunas[coluna] = {'tipo': COLUNA_CODIGO, 'dicionario': dicionario}
+            elif pd.api.types.is_numeric_dtype(df[coluna]) or pd.api.types.is_bool_dtype(df[coluna]):
+                np.save(f'{base}.npy', df[coluna].to_numpy())
+                colunas[coluna] = {'tipo': COLUNA_VALOR}
+            else:
+                np.save(f'{base}.npy', np.array(df[coluna].fillna('').astype(str).tolist(), dtype=str))
+                colunas[coluna] = {'tipo': COLUNA_TEXTO}
+        manifesto['tabelas'][nome] = {'linhas': len(df), 'colunas': colunas}
+
+    with open(os.path.join(diretorio_saida, ARQUIVO_MANIFESTO), 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False, indent=2)
+    return manifesto
+
+
+def converter_csv(diretorio_csv, diretorio_saida):
+    """Converte os CSVs de `diretorio_csv` para o formato colunar em `diretorio_saida`."""
+    return converter_tabelas(ler_tabelas_csv(diretorio_csv), diretorio_saida)
+
+
+class TabelasColunares:
+    """
+    Tabelas no formato colunar, com os arrays abertos por memory-map (somente leitura).
+    `coluna(tabela, coluna)` dá os arrays brutos (códigos, ou (offsets, códigos) nas listas);
+    `dataframe(tabela)` decodifica a tabela como nos CSVs (listas Python, nomes em texto).
+    """
+
+    def __init__(self, diretorio, manifesto, dicionarios, colunas):
+        self.diretorio = diretorio
+        self.manifesto = manifesto
+        self.dicionarios = dicionarios    # nome -> array de nomes (posição = código)
+        self._colunas = colunas           # (tabela, coluna) -> array ou (offsets, codigos)
+
+    @classmethod
+    def abrir(cls, diretorio, mmap=True):
+        """Abre as tabelas gravadas por `converter_tabelas` (`mmap=False` lê tudo para a memória)."""
+        with open(os.path.join(diretorio, ARQUIVO_MANIFESTO), encoding='utf-8') as arquivo:
+            manifesto = json.load(arquivo)
+        if manifesto['versao'] != VERSAO_TABELAS:
+            raise ValueError(f"Versão das tabelas não suportada: {manifesto['versao']} (esperada {VERSAO_TABELAS}).")
+        modo = 'r' if mmap else None
+
+        def carregar(*partes):
+            return np.load(os.path.join(diretorio, *partes), mmap_mode=modo, allow_pickle=False)
+
+        dicionarios = {nome: carregar('dicionarios', f'{nome}.npy') for nome in manifesto['dicionarios']}
+        colunas = {}
+        for tabela, descricao in manifesto['tabelas'].items():
+            for coluna, info in descricao['colunas'].items():
+                if info['tipo'] == COLUNA_LISTA_CODIGOS:
+                    colunas[tabela, coluna] = (carregar(tabela, f'{coluna}.offsets.npy'), carregar(tabela, f'{coluna}.codigos.npy'))
+                else:
+                    colunas[tabela, coluna] = carregar(tabela, f'{coluna}.npy')
+        return cls(diretorio, manifesto, dicionarios, colunas)
+
+    @property
+    def produtos(self):
+        return pd.Index(self.dicionarios['produtos'].tolist())
+
+    @property
+    def regioes(self):
+        return pd.Index(self.dicionarios['regioes'].tolist())
+
+    def tabelas(self):
+        return list(self.manifesto['tabelas'])
+
+    def coluna(self, tabela, coluna):
+        return self._colunas[tabela, coluna]
+
+    def dataframe(self, tabela):
+        """A tabela decodificada: códigos viram nomes e listas codificadas viram listas Python."""
+        dados = {}
+        for coluna, info in self.manifesto['tabelas'][tabela]['colunas'].items():
+            valores = self._colunas[tabela, coluna]
+            if info['tipo'] == COLUNA_LISTA_CODIGOS:
+                offsets, codigos = valores
+                nomes = self.dicionarios[info['dicionario']][codigos].tolist()
+                dados[coluna] = [nomes[inicio:fim] for inicio, fim in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+            elif info['tipo'] == COLUNA_CODIGO:
+                dados[coluna] = self.dicionarios[info['dicionario']][valores].tolist()
+            elif info['tipo'] == COLUNA_TEXTO:
+                dados[coluna] = valores.tolist()
+            else:
+                dados[coluna] = np.array(valores)
+        return pd.DataFrame(dados)
+
+    def dataframes_sistema(self, semente=101):
+        """
+        (df_associacoes, df_nutrientes, df_producao) prontos para `SistemaRecomendacaoDF`, montados
+        pelas funções de `recomendador.dados` a partir destas tabelas (as listas `produtos` gravadas são mantidas).
+        """
+        from recomendador.dados import carregar_associacoes, carregar_nutrientes, carregar_producao
+
+        df_associacoes = carregar_associacoes(self.dataframe('associacoes'), semente=semente)
+
+        nutricionais = self.dataframe('dados_nutricionais').set_index('nome')
+        categorias = nutricionais.groupby('categoria').groups
+        df_nutrientes = carregar_nutrientes(
+            nutricionais.drop(columns='categoria').to_dict('index'),
+            {categoria: list(produtos) for categoria, produtos in categorias.items()},
+        )
+
+        producao = {}
+        for linha in self.dataframe('producao_emater').itertuples(index=False):
+            producao.setdefault(linha.regiao, {})[linha.produto] = {'area_ha': linha.area_ha, 'producao_t': linha.producao_t}
+        df_producao = carregar_producao(producao)
+        return df_associacoes, df_nutrientes, df_producao
+
+
+def main(argv=None):
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Converte os CSVs de tabelas/ para o formato colunar.")
+    parser.add_argument('diretorio_csv', nargs='?', default=os.path.join(raiz, 'tabelas'))
+    parser.add_argument('diretorio_saida', nargs='?', default=os.path.join(raiz, 'tabelas', 'colunar'))
+    args = parser.parse_args(argv)
+    manifesto = converter_csv(args.diretorio_csv, args.diretorio_saida)
+    for nome, descricao in manifesto['tabelas'].items():
+        print(f"{nome}: {descricao['linhas']} linhas, {len(descricao['colunas'])} colunas")
+    print(f"Dicionários: {manifesto['dicionarios']} -> {args.diretorio_saida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Casamento de nomes de produtos com as descrições da TACO por um índice invertido de tokens.
+
+As descrições são normalizadas uma única vez (sem acentos, minúsculas, tokens alfanuméricos)
+e indexadas por token. Para cada produto, o primeiro token é o alimento ("Limão Tahiti" ->
+"limao") e os demais são a variedade ("tahiti"). As candidatas são as descrições que citam o
+alimento, ordenadas por:
+  1. alimento como primeira palavra da descrição ("Abóbora, moranga, crua" antes de "Doce, de abóbora");
+  2. mais tokens da variedade presentes (ou os nomes alternativos de `VARIEDADES_TACO`);
+  3. sem palavras de `PALAVRAS_EXCLUIDAS_TACO` (polpa, suco, doce, ...) que não estejam no próprio produto;
+  4. forma crua;
+  5. descrição mais curta e, no empate, a primeira na tabela.
+As regras de refinamento são dados (`VARIEDADES_TACO`), não condições no código, e o
+resultado é determinístico.
+"""
+import re
+import unicodedata
+
+import pandas as pd
+
+# Palavras que indicam uma forma processada (evitadas, a menos que façam parte do nome do produto)
+PALAVRAS_EXCLUIDAS_TACO = (
+    'polpa', 'suco', 'extrato', 'salada', 'doce', 'pasta', 'mistura', 'curau', 'biscoito', 'iogurte',
+    'queijo', 'molho', 'purê', 'desidratada', 'folhas desidratadas', 'industrializado',
+)
+
+FORMAS_CRUAS = frozenset({'cru', 'crua', 'crus', 'cruas'})
+
+PALAVRAS_VAZIAS = frozenset({'de', 'da', 'do', 'das', 'dos', 'e', 'com', 'em'})
+
+# Variedades com outro nome na TACO: (alimento, variedade no nome do produto) -> nomes aceitos na descrição
+VARIEDADES_TACO = {
+    ('abobora', 'japonesa'): ('cabotian', 'cabotia', 'kabocha'),
+    ('limao', 'tahiti'): ('taiti',),
+    ('tangerina', 'ponkan'): ('ponca',),
+    ('repolho', 'verde'): ('branco',),
+}
+
+
+def dobrar_acentos(texto):
+    """Texto em minúsculas e sem acentos ("Limão, Poncã" -> "limao, ponca")."""
+    decomposto = unicodedata.normalize('NFKD', str(texto))
+    return ''.join(caractere for caractere in decomposto if not unicodedata.combining(caractere)).lower()
+
+
+def tokens_texto(texto):
+    """Tokens alfanuméricos sem acentos, sem as palavras vazias ("Couve-flor, crua" -> ['couve', 'flor', 'crua'])."""
+    return [token for token in re.findall(r'[a-z0-9]+', dobrar_acentos(texto)) if token not in PALAVRAS_VAZIAS]
+
+
+class IndiceTaco:
+    """
+    Índice invertido (token -> posições) sobre as descrições da TACO.
+    `descricoes`: Series (o índice dela identifica as linhas nos resultados) ou lista de textos.
+    """
+
+    def __init__(self, descricoes, palavras_excluidas=PALAVRAS_EXCLUIDAS_TACO):
+        descricoes = pd.Series(descricoes) if not isinstance(descricoes, pd.Series) else descricoes
+        self.rotulos = descricoes.index
+        self.descricoes = descricoes.fillna('').astype(str).tolist()
+        self.tokens = [tuple(tokens_texto(descricao)) for descricao in self.descricoes]
+        self.conjuntos = [frozenset(tokens) for tokens in self.tokens]
+        self.crua = [bool(conjunto & FORMAS_CRUAS) for conjunto in self.conjuntos]
+        self.palavras_excluidas = [frozenset(tokens_texto(palavra)) for palavra in palavras_excluidas]
+        self.indice = {}
+        for posicao, conjunto in enumerate(self.conjuntos):
+            for token in conjunto:
+                self.indice.setdefault(token, []).append(posicao)
+
+    def candidatos(self, produto, variedades=VARIEDADES_TACO, exigir_crua=True):
+        """
+        Descrições candidatas para `produto`, da melhor para a pior, como
+        (posição, tokens da variedade encontrados). `exigir_crua` descarta as formas não cruas.
+        """
+        termos = tokens_texto(produto)
+        if not termos:
+            return []
+        alimento, termos_variedade = termos[0], termos[1:]
+        aceitos_variedade = [frozenset({termo, *variedades.get((alimento, termo), ())}) for termo in termos_variedade]
+        palavras_excluidas = [palavras for palavras in self.palavras_excluidas if not palavras & set(termos)]
+
+        ordenados = []
+        for posicao in self.indice.get(alimento, ()):
+            if exigir_crua and not self.crua[posicao]:
+                continue
+            conjunto = self.conjuntos[posicao]
+            casados = sum(1 for aceitos in aceitos_variedade if aceitos & conjunto)
+            excluida = any(palavras <= conjunto for palavras in palavras_excluidas)
+            chave = (self.tokens[posicao][0] != alimento, -casados, excluida, not self.crua[posicao],
+                     len(self.tokens[posicao]), posicao)
+            ordenados.append((chave, casados))
+        ordenados.sort()
+        return [(chave[-1], casados) for chave, casados in ordenados]
+
+    def resolver(self, produtos, termos_busca=None, variedades=VARIEDADES_TACO, exigir_crua=True):
+        """
+        Melhor descrição da TACO para cada produto. `termos_busca` ({produto: termo}) troca o nome
+        usado na busca quando a TACO usa outro nome. Retorna um DataFrame com `produto`,
+        `rotulo_taco` (índice da linha na TACO; None se não encontrado), `descricao_taco`,
+        `variedade_casada` e `variedade_total` (tokens da variedade encontrados / buscados).
+        """
+        termos_busca = termos_busca or {}
+        linhas, rotulos = [], []
+        for produto in produtos:
+            termo = termos_busca.get(produto, produto)
+            candidatos = self.candidatos(termo, variedades, exigir_crua)
+            total_variedade = max(len(tokens_texto(termo)) - 1, 0)
+            if candidatos:
+                posicao, casados = candidatos[0]
+                rotulos.append(self.rotulos[posicao])
+                linhas.append({'produto': produto, 'descricao_taco': self.descricoes[posicao],
+                               'variedade_casada': casados, 'variedade_total': total_variedade})
+            else:
+                rotulos.append(None)
+                linhas.append({'produto': produto, 'descricao_taco': None,
+                               'variedade_casada': 0, 'variedade_total': total_variedade})
+        resultado = pd.DataFrame(linhas, columns=['produto', 'descricao_taco', 'variedade_casada', 'variedade_total'])
+        # object: mantém os rótulos inteiros mesmo com produtos não encontrados (None)
+        resultado.insert(1, 'rotulo_taco', pd.Series(rotulos, index=resultado.index, dtype=object))
+        return resultado
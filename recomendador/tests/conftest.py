@@ -0,0 +1,51 @@
+"""
+Dados compartilhados pelos testes: os dados do projeto (`recomendador.dados`) com uma matriz de
+utilidade simulada menor, para que cada sistema seja montado em poucos milissegundos.
+"""
+import numpy as np
+import pytest
+
+from recomendador.dados import (
+    PRODUTOS_ESCOPO, carregar_associacoes, carregar_nutrientes, carregar_producao, carregar_sazonalidade,
+    simular_avaliacoes
+)
+from recomendador.sistema import SistemaRecomendacaoDF
+
+# Retângulo aproximado do DF (latitude, longitude)
+LIMITES_DF = ((-16.05, -15.50), (-48.28, -47.31))
+
+
+@pytest.fixture(scope='session')
+def dados():
+    """(df_associacoes, df_nutrientes, df_producao, df_utility_long, df_sazonalidade) do projeto."""
+    df_associacoes = carregar_associacoes()
+    return (df_associacoes, carregar_nutrientes(), carregar_producao(),
+            simular_avaliacoes(df_associacoes, num_consumidores=120), carregar_sazonalidade())
+
+
+@pytest.fixture
+def montar_sistema(dados):
+    """Monta um `SistemaRecomendacaoDF` com os dados do projeto; kwargs vão para o construtor."""
+    df_associacoes, df_nutrientes, df_producao, df_utility_long, _ = dados
+
+    def montar(**opcoes):
+        return SistemaRecomendacaoDF(df_associacoes, df_nutrientes, df_producao, df_utility_long, **opcoes)
+    return montar
+
+
+def pontos_df(quantidade, semente=0):
+    """(latitudes, longitudes) uniformes no retângulo do DF."""
+    aleatorio = np.random.default_rng(semente)
+    (lat_min, lat_max), (lon_min, lon_max) = LIMITES_DF
+    return aleatorio.uniform(lat_min, lat_max, quantidade), aleatorio.uniform(lon_min, lon_max, quantidade)
+
+
+def preferencias_aleatorias(aleatorio):
+    """Preferências sorteadas (produtos, raio, orgânicos, objetivo nutricional, top N)."""
+    return {
+        'desired_products': list(aleatorio.choice(PRODUTOS_ESCOPO, aleatorio.integers(0, 4), replace=False)),
+        'max_distance_km': float(aleatorio.choice([10, 25, 40, 80])),
+        'only_organic': bool(aleatorio.random() < 0.3),
+        'nutritional_goal': [None, 'alta_vitamina_c', 'alta_fibra', 'baixa_caloria'][aleatorio.integers(4)],
+        'top_n_results': int(aleatorio.integers(1, 8)),
+    }
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from recomendador import artefato
+from recomendador.artefato import dataframe_de_arrays, dataframe_para_arrays
+from recomendador.sistema import SistemaRecomendacaoDF
+from recomendador.tests.conftest import pontos_df, preferencias_aleatorias
+
+
+def test_dataframe_ida_e_volta():
+    df = pd.DataFrame({
+        'id': [3, 1, 2], 'nome': ['a', 'ç', ''], 'lista': [['x', 'y'], [], ['z']],
+        'valor': [1.5, np.nan, 2.0], 'flag': [True, False, True],
+    }, index=['i', 'j', 'k'])
+    pd.testing.assert_frame_equal(dataframe_de_arrays('t', dataframe_para_arrays('t', df)), df, check_dtype=False)
+
+
+@pytest.mark.parametrize('backend', ['item_item', 'svd'])
+def test_sistema_carregado_igual_ao_construido(montar_sistema, dados, backend, tmp_path):
+    construido = montar_sistema(collaborative_backend=backend, seasonality_df=dados[4])
+    caminho = tmp_path / 'sistema.npz'
+    construido.salvar(caminho)
+    carregado = SistemaRecomendacaoDF.carregar(caminho)
+    pd.testing.assert_frame_equal(carregado.associations_df, construido.associations_df, check_dtype=False)
+
+    consumidores = dados[3]['id_consumidor'].unique()[:3].tolist() + ['novo']
+    associacoes = construido.association_ids.tolist()
+    # Atualizar depois de carregar dá o mesmo que atualizar o sistema construído
+    for sistema in (construido, carregado):
+        sistema.adicionar_avaliacoes(consumidores[0], {associacoes[0]: 5.0, associacoes[2]: 1.0})
+        sistema.remover_avaliacao(consumidores[1], associacoes[1])
+        sistema.adicionar_avaliacoes('novo', {associacoes[4]: 4.0})
+
+    aleatorio = np.random.default_rng(2)
+    latitudes, longitudes = pontos_df(len(consumidores), semente=2)
+    for consumidor, latitude, longitude in zip(consumidores, latitudes, longitudes):
+        preferencias = {**preferencias_aleatorias(aleatorio), 'mes': 7}
+        pd.testing.assert_frame_equal(
+            carregado.recomendar(consumidor, latitude, longitude, preferencias),
+            construido.recomendar(consumidor, latitude, longitude, preferencias)
+        )
+
+
+def test_versao_diferente_e_recusada(montar_sistema, tmp_path, monkeypatch):
+    caminho = tmp_path / 'antigo.npz'
+    monkeypatch.setattr(artefato, 'VERSAO_ARTEFATO', artefato.VERSAO_ARTEFATO - 1)
+    montar_sistema().salvar(caminho)
+    monkeypatch.undo()
+    with pytest.raises(ValueError, match='Versão do artefato'):
+        SistemaRecomendacaoDF.carregar(caminho)
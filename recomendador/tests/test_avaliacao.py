@@ -0,0 +1,102 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from recomendador.avaliacao import (
+    PREFERENCIAS_AVALIACAO, _ler_grade, avaliar, avaliar_bloco, dividir_treino_teste, grade_pesos, main
+)
+from recomendador.tests.conftest import pontos_df
+
+
+def test_divisao_treino_teste_por_consumidor(dados):
+    df_utility_long = dados[3]
+    unica = pd.DataFrame({'id_consumidor': ['unico'], 'id_associacao': [1], 'avaliacao': [5.0]})
+    avaliacoes = pd.concat([df_utility_long, unica], ignore_index=True)
+    treino, teste = dividir_treino_teste(avaliacoes, fracao_teste=0.3, semente=2)
+
+    chaves = ['id_consumidor', 'id_associacao']
+    juntas = pd.concat([treino, teste]).sort_values(chaves).reset_index(drop=True)
+    pd.testing.assert_frame_equal(juntas, avaliacoes.sort_values(chaves).reset_index(drop=True))
+    quantidades = avaliacoes['id_consumidor'].value_counts()
+    no_teste = teste['id_consumidor'].value_counts().reindex(quantidades.index, fill_value=0)
+    esperado = np.minimum(np.maximum(np.round(quantidades * 0.3), 1), quantidades - 1)
+    np.testing.assert_array_equal(no_teste.to_numpy(), esperado.to_numpy())
+    assert 'unico' in set(treino['id_consumidor']) and 'unico' not in set(teste['id_consumidor'])
+
+
+def test_grade_de_pesos():
+    assert grade_pesos(weight_distance=[0.1, 0.2], weight_rating=[0.5]) == [
+        {'weight_distance': 0.1, 'weight_rating': 0.5}, {'weight_distance': 0.2, 'weight_rating': 0.5}
+    ]
+    assert _ler_grade(['weight_distance=0,1', 'weight_collaborative_score=0.5']) == [
+        {'weight_distance': 0.0, 'weight_collaborative_score': 0.5},
+        {'weight_distance': 1.0, 'weight_collaborative_score': 0.5},
+    ]
+    assert _ler_grade([]) == [{}]
+    for invalida in ('peso_inexistente=1', 'weight_distance', 'weight_distance=', 'weight_distance=0.1,a'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            _ler_grade([invalida])
+
+
+def test_grade_invalida_e_erro_de_uso(capsys):
+    for invalida in ('foo=1', 'weight_distance'):
+        with pytest.raises(SystemExit) as saida:
+            main(['--grade', invalida])
+        assert saida.value.code == 2
+        assert 'error:' in capsys.readouterr().err
+
+
+def test_bloco_igual_as_metricas_de_recomendar(montar_sistema, dados):
+    df_utility_long = dados[3]
+    sistema = montar_sistema()
+    num_associacoes = len(sistema.association_ids)
+    aleatorio = np.random.default_rng(3)
+    consumidores = list(pd.unique(df_utility_long['id_consumidor'])[:12])
+    latitudes, longitudes = pontos_df(len(consumidores), semente=3)
+    treino = [sorted(aleatorio.choice(num_associacoes, aleatorio.integers(0, 4), replace=False)) for _ in consumidores]
+    relevantes = [sorted(aleatorio.choice(num_associacoes, aleatorio.integers(1, 5), replace=False)) for _ in consumidores]
+    configuracoes = [{}, {'weight_distance': 0.0, 'weight_collaborative_score': 1.0}, {'weight_rating': 0.7}]
+    k = 3
+
+    resultados = avaliar_bloco(
+        sistema, consumidores, latitudes, longitudes, treino, relevantes, configuracoes, PREFERENCIAS_AVALIACAO, k
+    )
+    for configuracao, resultado in zip(configuracoes, resultados):
+        precisao = revocacao = ndcg = 0.0
+        recomendadas = np.zeros(num_associacoes, dtype=bool)
+        for i, consumidor in enumerate(consumidores):
+            ranking_df = sistema.recomendar(
+                consumidor, latitudes[i], longitudes[i],
+                {**PREFERENCIAS_AVALIACAO, **configuracao, 'top_n_results': num_associacoes}
+            )
+            posicoes = pd.Index(sistema.association_ids).get_indexer(ranking_df['id'])
+            ranking = [posicao for posicao in posicoes if posicao not in treino[i]][:k]
+            recomendadas[ranking] = True
+            acertos = [posicao in relevantes[i] for posicao in ranking]
+            precisao += sum(acertos) / k
+            revocacao += sum(acertos) / len(relevantes[i])
+            dcg = sum(1 / np.log2(posicao + 2) for posicao, acerto in enumerate(acertos) if acerto)
+            ideal = sum(1 / np.log2(posicao + 2) for posicao in range(min(len(relevantes[i]), k)))
+            ndcg += dcg / ideal
+        assert resultado['precisao'] == pytest.approx(precisao)
+        assert resultado['revocacao'] == pytest.approx(revocacao)
+        assert resultado['ndcg'] == pytest.approx(ndcg)
+        np.testing.assert_array_equal(resultado['recomendadas'], recomendadas)
+
+
+def test_avaliar_independe_dos_blocos_e_do_pool(dados):
+    df_associacoes, df_nutrientes, df_producao, df_utility_long, _ = dados
+    configuracoes = grade_pesos(weight_distance=[0.1, 0.4], weight_collaborative_score=[0.0, 0.3])
+    resultados = [
+        avaliar(df_associacoes, df_nutrientes, df_producao, df_utility_long, configuracoes, k=3,
+                trabalhadores=trabalhadores, tamanho_bloco=tamanho_bloco)
+        for trabalhadores, tamanho_bloco in [(1, 1000), (1, 7), (2, 16)]
+    ]
+    assert len(resultados[0]) == len(configuracoes)
+    assert (resultados[0]['consumidores'] > 0).all()
+    for coluna in ('precisao@3', 'revocacao@3', 'ndcg@3', 'cobertura'):
+        assert resultados[0][coluna].between(0, 1).all()
+    for resultado in resultados[1:]:
+        pd.testing.assert_frame_equal(resultado, resultados[0])
@@ -0,0 +1,25 @@
+import json
+
+from recomendador.benchmark import comparar, executar_configuracao, gerar_mundo_sintetico
+
+
+def test_mundo_sintetico():
+    df_associacoes, _, _, df_utility_long = gerar_mundo_sintetico(50, 40, 400, 10, semente=1)
+    assert len(df_associacoes) == 50 and df_associacoes['id'].is_unique
+    assert df_associacoes['produtos'].map(len).between(3, 10).all()
+    assert df_utility_long['id_consumidor'].nunique() == 40
+    assert df_utility_long['id_associacao'].isin(df_associacoes['id']).all()
+
+
+def test_configuracao_pequena_gera_relatorio_serializavel():
+    configuracao = {'associacoes': 60, 'consumidores': 50, 'avaliacoes': 500, 'produtos': 12, 'consultas': 10, 'lote': 8}
+    resultado = executar_configuracao('mini', configuracao)
+    json.dumps(resultado)
+    assert resultado['associacoes'] == 60 and resultado['recomendar_lote']['consumidores'] == 8
+    assert 0 < resultado['recomendar']['p50_ms'] <= resultado['recomendar']['p99_ms']
+    assert resultado['recomendar']['etapas_media_ms']
+
+    relatorio = {'commit': 'abc', 'resultados': [resultado]}
+    linhas = comparar(relatorio, relatorio)
+    assert len(linhas) == 1 and linhas[0].startswith('mini (vs abc)') and '1.00x' in linhas[0]
+    assert comparar(relatorio, {'commit': 'x', 'resultados': []}) == []
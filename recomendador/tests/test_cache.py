@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from recomendador import cache
+from recomendador.cache import CacheRecomendacoes, hash_preferencias
+
+
+def test_chave_por_celula_e_preferencias_canonicas():
+    cache_resultados = CacheRecomendacoes(grade_graus=0.01)
+    chave = cache_resultados.chave('c', -15.801, -47.899, {'a': 1, 'b': [1, 2]})
+    assert chave == cache_resultados.chave('c', -15.799, -47.901, {'b': [1, 2], 'a': 1})
+    assert chave != cache_resultados.chave('c', -15.83, -47.899, {'a': 1, 'b': [1, 2]})
+    assert hash_preferencias({'a': 1}) != hash_preferencias({'a': 2})
+    for latitude, longitude in ((np.nan, -47.9), (-15.8, float('inf')), (float('-inf'), np.nan)):
+        assert cache_resultados.chave('c', latitude, longitude, {}) is None
+    with pytest.raises(ValueError):
+        CacheRecomendacoes(capacidade=0)
+
+
+def test_preferencias_equivalentes_tem_a_mesma_chave(montar_sistema):
+    sistema = montar_sistema()
+    cache_resultados = sistema.ativar_cache()
+    base = {'desired_products': ['Alface', 'Tomate'], 'max_distance_km': 25, 'nutritional_goal': {'fibra_g': 1}}
+    equivalentes = [
+        {'desired_products': ['Tomate', 'Alface', 'Tomate'], 'max_distance_km': 25.0, 'nutritional_goal': {'fibra_g': 1.0}},
+        {**base, 'top_n_results': 5, 'only_organic': False, 'mes': None, **sistema.DEFAULT_WEIGHTS},
+        {**base, 'desired_products': ('Tomate', 'Alface')},
+    ]
+    chave = cache_resultados.chave('c', -15.79, -47.88, base)
+    for preferencias in equivalentes:
+        assert cache_resultados.chave('c', -15.79, -47.88, preferencias) == chave
+    assert cache_resultados.chave('c', -15.79, -47.88, {}) == cache_resultados.chave('c', -15.79, -47.88, {'max_distance_km': 30})
+    assert cache_resultados.chave('c', -15.79, -47.88, {'mes': 'jul'}) == cache_resultados.chave('c', -15.79, -47.88, {'mes': 7})
+    for diferente in ({**base, 'max_distance_km': 26}, {**base, 'desired_products': ['Alface']}, {**base, 'weight_distance': 0.3}):
+        assert cache_resultados.chave('c', -15.79, -47.88, diferente) != chave
+
+    primeiro = sistema.recomendar('c', -15.79, -47.88, base)
+    for preferencias in equivalentes:
+        pd.testing.assert_frame_equal(sistema.recomendar('c', -15.79, -47.88, preferencias), primeiro)
+    assert cache_resultados.estatisticas()['acertos'] == len(equivalentes) and len(cache_resultados) == 1
+
+
+def test_lru_validade_e_invalidacao(monkeypatch):
+    relogio = [100.0]
+    monkeypatch.setattr(cache.time, 'monotonic', lambda: relogio[0])
+    cache_resultados = CacheRecomendacoes(capacidade=2, validade_s=10.0)
+    resultado = pd.DataFrame({'x': [1]})
+    cache_resultados.guardar(('a', 0, 0, 'h'), resultado)
+    cache_resultados.guardar(('b', 0, 0, 'h'), resultado)
+    assert cache_resultados.obter(('a', 0, 0, 'h')) is not None  # 'a' passa a ser o mais recente
+    cache_resultados.guardar(('c', 0, 0, 'h'), resultado)
+    assert cache_resultados.obter(('b', 0, 0, 'h')) is None and len(cache_resultados) == 2
+
+    # Cópias: alterar o resultado obtido não altera o guardado
+    obtido = cache_resultados.obter(('a', 0, 0, 'h'))
+    obtido.loc[0, 'x'] = 99
+    assert cache_resultados.obter(('a', 0, 0, 'h')).loc[0, 'x'] == 1
+
+    relogio[0] += 11
+    assert cache_resultados.obter(('a', 0, 0, 'h')) is None
+    cache_resultados.guardar(('c', 1, 1, 'h'), resultado)
+    cache_resultados.invalidar_consumidor('c')
+    assert len(cache_resultados) == 0
+    # Resultado calculado antes de uma invalidação não é guardado
+    geracao = cache_resultados.geracao
+    cache_resultados.limpar()
+    cache_resultados.guardar(('d', 0, 0, 'h'), resultado, geracao)
+    assert len(cache_resultados) == 0
+    estatisticas = cache_resultados.estatisticas()
+    assert (estatisticas['descartadas'], estatisticas['expiradas'], estatisticas['invalidadas']) == (1, 1, 2)
+
+
+def test_recomendar_com_cache(montar_sistema, dados):
+    sistema = montar_sistema()
+    cache_resultados = sistema.ativar_cache(capacity=8)
+    consumidor = dados[3]['id_consumidor'].iloc[0]
+    preferencias = {'desired_products': ['Alface'], 'max_distance_km': 40}
+    primeiro = sistema.recomendar(consumidor, -15.79, -47.88, preferencias)
+    pd.testing.assert_frame_equal(sistema.recomendar(consumidor, -15.7901, -47.8801, preferencias), primeiro)
+    assert cache_resultados.acertos == 1
+
+    # Coordenadas não finitas não passam pelo cache (e não têm candidatas)
+    assert len(sistema.recomendar(consumidor, np.nan, -47.88, preferencias)) == 0
+    assert len(cache_resultados) == 1
+
+    sistema.adicionar_avaliacoes(consumidor, {int(sistema.association_ids[0]): 5.0})
+    assert len(cache_resultados) == 0
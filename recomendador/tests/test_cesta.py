@@ -0,0 +1,100 @@
+from itertools import combinations, permutations
+
+import numpy as np
+import pytest
+
+from recomendador.cesta import custo_percurso, planejar, plano_exato, plano_guloso
+from recomendador.tests.conftest import pontos_df
+
+
+def _instancia(semente, num_candidatas=6, num_itens=4):
+    """(oferta, distâncias do consumidor, distâncias entre candidatas) em um plano euclidiano."""
+    aleatorio = np.random.default_rng(semente)
+    pontos = aleatorio.uniform(-10, 10, (num_candidatas + 1, 2))
+    distancias = np.linalg.norm(pontos[:, np.newaxis] - pontos[np.newaxis], axis=2)
+    oferta = aleatorio.random((num_candidatas, num_itens)) < 0.35
+    oferta[np.arange(num_candidatas), aleatorio.integers(0, num_itens, num_candidatas)] = True
+    return oferta, distancias[0, 1:], distancias[1:, 1:]
+
+
+def _forca_bruta(oferta, distancias_consumidor, distancias_candidatas, custo_parada_km, ida_e_volta):
+    melhor = np.inf
+    for tamanho in range(1, len(oferta) + 1):
+        for paradas in combinations(range(len(oferta)), tamanho):
+            if not oferta[list(paradas)].any(axis=0).all():
+                continue
+            for ordem in permutations(paradas):
+                ordem = list(ordem)
+                custo = custo_percurso(
+                    distancias_consumidor[ordem], distancias_candidatas[np.ix_(ordem, ordem)], ida_e_volta
+                )
+                melhor = min(melhor, custo + custo_parada_km * tamanho)
+    return melhor
+
+
+def _custo_plano(ordem, distancias_consumidor, distancias_candidatas, custo_parada_km, ida_e_volta):
+    distancia = custo_percurso(distancias_consumidor[ordem], distancias_candidatas[np.ix_(ordem, ordem)], ida_e_volta)
+    return distancia + custo_parada_km * len(ordem)
+
+
+@pytest.mark.parametrize('ida_e_volta', [False, True])
+@pytest.mark.parametrize('custo_parada_km', [0.0, 2.0, 15.0])
+def test_exato_igual_a_forca_bruta_e_guloso_valido(custo_parada_km, ida_e_volta):
+    for semente in range(6):
+        oferta, distancias_consumidor, distancias_candidatas = _instancia(semente)
+
+        def distancias_entre(origens, destinos):
+            return distancias_candidatas[np.ix_(origens, destinos)]
+
+        esperado = _forca_bruta(oferta, distancias_consumidor, distancias_candidatas, custo_parada_km, ida_e_volta)
+        ordem, custo = plano_exato(oferta, distancias_consumidor, distancias_candidatas, custo_parada_km, ida_e_volta)
+        assert custo == pytest.approx(esperado)
+        assert oferta[ordem].any(axis=0).all()
+        assert _custo_plano(ordem, distancias_consumidor, distancias_candidatas, custo_parada_km, ida_e_volta) \
+            == pytest.approx(custo)
+
+        ordem_gulosa, custo_guloso = plano_guloso(
+            oferta, distancias_consumidor, distancias_entre, custo_parada_km, ida_e_volta
+        )
+        assert oferta[ordem_gulosa].any(axis=0).all()
+        assert len(set(ordem_gulosa)) == len(ordem_gulosa)
+        assert _custo_plano(ordem_gulosa, distancias_consumidor, distancias_candidatas, custo_parada_km, ida_e_volta) \
+            == pytest.approx(custo_guloso)
+        assert custo_guloso >= esperado - 1e-9
+
+        plano = planejar(oferta, distancias_consumidor, distancias_entre, custo_parada_km, ida_e_volta)
+        assert plano['metodo'] == 'exato'
+        assert plano['custo'] == pytest.approx(esperado)
+        compras = np.concatenate(plano['itens'])
+        assert sorted(compras) == list(range(oferta.shape[1]))
+        assert all(oferta[parada, itens].all() for parada, itens in zip(plano['ordem'], plano['itens']))
+        assert plano['trechos_km'].sum() + (distancias_consumidor[plano['ordem'][-1]] if ida_e_volta else 0.0) \
+            == pytest.approx(plano['distancia_km'])
+
+
+def test_exato_desiste_no_prazo_e_planejar_fica_com_o_guloso():
+    oferta, distancias_consumidor, distancias_candidatas = _instancia(0)
+    assert plano_exato(oferta, distancias_consumidor, distancias_candidatas, prazo=0.0) is None
+
+    def distancias_entre(origens, destinos):
+        return distancias_candidatas[np.ix_(origens, destinos)]
+
+    plano = planejar(oferta, distancias_consumidor, distancias_entre, max_itens_exato=2)
+    assert plano['metodo'] == 'guloso'
+    assert plano_guloso(oferta, distancias_consumidor, distancias_entre)[0] == plano['ordem']
+
+
+def test_planejar_cesta_do_sistema(montar_sistema):
+    sistema = montar_sistema()
+    latitudes, longitudes = pontos_df(5, semente=4)
+    cesta = ['Alface', 'Tomate', 'Banana', 'Inexistente']
+    for latitude, longitude in zip(latitudes, longitudes):
+        resultado = sistema.planejar_cesta(latitude, longitude, {'desired_products': cesta, 'max_distance_km': 40})
+        paradas = resultado['paradas']
+        assert list(paradas.columns) == sistema.BASKET_STOP_COLUMNS
+        assert 'Inexistente' in resultado['produtos_nao_encontrados']
+        comprados = [produto for produtos in paradas['produtos_comprados'] for produto in produtos]
+        assert sorted(comprados) == sorted(set(cesta) - set(resultado['produtos_nao_encontrados']))
+        np.testing.assert_allclose(paradas['distancia_acumulada_km'], np.cumsum(paradas['distancia_trecho_km']))
+        if len(paradas):
+            assert resultado['distancia_total_km'] == pytest.approx(paradas['distancia_acumulada_km'].iloc[-1])
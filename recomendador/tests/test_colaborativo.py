@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+from recomendador import colaborativo
+from recomendador.colaborativo import (
+    ModeloFatoresLatentes, ModeloItemItem, matriz_avaliacoes_esparsa, scores_colaborativos, similaridade_cosseno_top_k,
+    utilidade_pivot_para_longa
+)
+
+
+def avaliacoes_aleatorias(num_consumidores=40, num_associacoes=25, densidade=0.3, semente=0):
+    """Matriz de utilidade longa sorteada (notas de 1 a 5)."""
+    aleatorio = np.random.default_rng(semente)
+    linhas, colunas = np.nonzero(aleatorio.random((num_consumidores, num_associacoes)) < densidade)
+    return pd.DataFrame({
+        'id_consumidor': [f'c{linha}' for linha in linhas],
+        'id_associacao': colunas + 100,
+        'avaliacao': aleatorio.integers(1, 6, len(linhas)).astype(float),
+    })
+
+
+def score_de_referencia(densa, similaridade, consumidor, candidata, limiar=3.5):
+    """Score colaborativo por associação candidata, no laço original sobre a matriz densa."""
+    soma, contagem = 0.0, 0
+    for associacao, avaliacao in enumerate(densa[consumidor]):
+        if associacao != candidata and avaliacao >= limiar:
+            soma += similaridade[candidata, associacao] * avaliacao
+            contagem += 1
+    return soma / contagem if contagem else 0.0
+
+
+def similaridade_densa(densa):
+    normas = np.linalg.norm(densa, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        similaridade = np.nan_to_num((densa.T @ densa) / np.outer(normas, normas))
+    np.fill_diagonal(similaridade, 0.0)
+    return similaridade
+
+
+def matriz_para_longa(matriz, consumidores, associacoes):
+    coo = matriz.tocoo()
+    return pd.DataFrame({
+        'id_consumidor': consumidores[coo.row], 'id_associacao': associacoes[coo.col], 'avaliacao': coo.data,
+    }).sort_values(['id_consumidor', 'id_associacao'], ignore_index=True)
+
+
+def test_scores_matriciais_iguais_ao_laco():
+    matriz, _, _ = matriz_avaliacoes_esparsa(avaliacoes_aleatorias())
+    densa = matriz.toarray()
+    similaridade = similaridade_densa(densa)
+    candidatas = np.array([0, 3, 7, 8, 20])
+    consumidores = np.arange(0, matriz.shape[0], 3)
+    scores = scores_colaborativos(matriz[consumidores], csr_matrix(similaridade[candidatas]), candidatas)
+    for i, consumidor in enumerate(consumidores):
+        for j, candidata in enumerate(candidatas):
+            assert np.isclose(scores[i, j], score_de_referencia(densa, similaridade, consumidor, candidata))
+
+
+def test_modelo_sem_avaliacoes_suficientes_pontua_zero():
+    modelo = ModeloItemItem(avaliacoes_aleatorias(num_associacoes=1, densidade=1.0))
+    assert not modelo.disponivel
+    assert np.all(modelo.scores(['c0', 'desconhecido'], [100, 999]) == 0)
+
+
+def test_matriz_esparsa_igual_ao_pivot():
+    df_longo = avaliacoes_aleatorias()
+    repetida = df_longo.iloc[[0]].assign(avaliacao=4.5)  # a última avaliação do par vale
+    zerada = df_longo.iloc[[1]].assign(avaliacao=0.0)  # 0 equivale a "sem avaliação"
+    matriz, consumidores, associacoes = matriz_avaliacoes_esparsa(pd.concat([df_longo, repetida, zerada]))
+    pivot = df_longo.pivot_table(index='id_consumidor', columns='id_associacao', values='avaliacao')
+    pivot.loc[repetida['id_consumidor'].iloc[0], repetida['id_associacao'].iloc[0]] = 4.5
+    pivot.loc[zerada['id_consumidor'].iloc[0], zerada['id_associacao'].iloc[0]] = np.nan
+    np.testing.assert_array_equal(matriz.toarray(), pivot.loc[consumidores, associacoes].fillna(0).to_numpy())
+    assert matriz.nnz == pivot.notna().sum().sum()
+    pd.testing.assert_frame_equal(
+        utilidade_pivot_para_longa(pivot).sort_values(['id_consumidor', 'id_associacao'], ignore_index=True),
+        matriz_para_longa(matriz, consumidores, associacoes), check_dtype=False
+    )
+
+
+def test_similaridade_top_k_igual_ao_cosseno_denso(monkeypatch):
+    # Blocos de poucas linhas, para passar por várias partes do cálculo
+    monkeypatch.setattr(colaborativo, 'ELEMENTOS_POR_BLOCO', 60)
+    matriz, _, _ = matriz_avaliacoes_esparsa(avaliacoes_aleatorias())
+    completa = similaridade_densa(matriz.toarray())
+    for k in (1, 5, 24, 50):
+        top_k = similaridade_cosseno_top_k(matriz, k=k).toarray()
+        assert np.all(top_k.diagonal() == 0)
+        assert np.all((top_k > 0).sum(axis=1) <= k)
+        # Cada valor guardado é o cosseno exato, e nenhum vizinho fora do top-k é mais similar
+        guardados = top_k > 0
+        np.testing.assert_allclose(top_k[guardados], completa[guardados])
+        for linha in range(len(completa)):
+            if guardados[linha].any():
+                assert completa[linha][~guardados[linha]].max(initial=0) <= top_k[linha][guardados[linha]].min() + 1e-12
+            else:
+                assert completa[linha].max() <= 0
+
+
+def aplicar_atualizacoes(df_longo, atualizacoes):
+    """Matriz longa com as atualizações {(consumidor, associação): avaliação} (0/None remove)."""
+    avaliacoes = {(c, a): r for c, a, r in df_longo.itertuples(index=False)}
+    for par, avaliacao in atualizacoes.items():
+        if avaliacao:
+            avaliacoes[par] = avaliacao
+        else:
+            avaliacoes.pop(par, None)
+    return pd.DataFrame([(c, a, r) for (c, a), r in avaliacoes.items()], columns=list(df_longo.columns))
+
+
+def test_atualizacao_incremental_igual_a_reconstrucao():
+    df_longo = avaliacoes_aleatorias(semente=4)
+    # Notas contínuas: sem empates no top-k, que poderiam escolher vizinhos diferentes
+    df_longo['avaliacao'] = np.random.default_rng(4).uniform(1, 5, len(df_longo)).round(3)
+    aleatorio = np.random.default_rng(5)
+    consumidores = df_longo['id_consumidor'].unique().tolist() + ['novo_1', 'novo_2']
+    associacoes = df_longo['id_associacao'].unique().tolist() + [900, 901]
+    for k in (3, 50):
+        modelo = ModeloItemItem(df_longo, k=k)
+        todas = {}
+        for _ in range(30):
+            consumidor = consumidores[aleatorio.integers(len(consumidores))]
+            lote = {associacoes[i]: (None if aleatorio.random() < 0.25 else round(aleatorio.uniform(1, 5), 3))
+                    for i in aleatorio.choice(len(associacoes), 3, replace=False)}
+            modelo.atualizar_avaliacoes(consumidor, lote)
+            todas.update({(consumidor, a): r for a, r in lote.items()})
+
+        reconstruido = ModeloItemItem(aplicar_atualizacoes(df_longo, todas), k=k)
+        np.testing.assert_allclose(
+            modelo.scores(consumidores, associacoes), reconstruido.scores(consumidores, associacoes), atol=1e-9
+        )
+        assert modelo.num_avaliacoes == reconstruido.num_avaliacoes
+
+
+def test_folding_in_de_consumidor_do_treino_reproduz_o_fator():
+    df_longo = avaliacoes_aleatorias(semente=6)
+    modelo = ModeloFatoresLatentes(df_longo, k=5)
+    consumidor = 'c3'
+    fator, media = modelo.dobrar_consumidor(modelo._avaliacoes_do_consumidor(consumidor))
+    posicao = modelo.posicao_consumidor[consumidor]
+    # Fator do treino (U S) = r_centrado V, pois V tem colunas ortonormais
+    np.testing.assert_allclose(fator, modelo.fatores_consumidores[posicao], atol=1e-9)
+    assert np.isclose(media, modelo.medias_consumidores[posicao])
+    assert np.all(modelo.scores([consumidor, 'desconhecido'], [100, 999])[1] == 0)
+
+
+def test_atualizacao_depois_de_carregar_igual_a_em_memoria(tmp_path):
+    df_longo = avaliacoes_aleatorias(semente=7)
+    em_memoria = ModeloFatoresLatentes(df_longo, k=5)
+    # Antes de salvar: um consumidor do treino e um novo já passaram por folding-in
+    em_memoria.atualizar_avaliacoes('c1', {100: 5.0, 101: None})
+    em_memoria.atualizar_avaliacoes('novo', {102: 4.0, 103: 2.0})
+    em_memoria.atualizar_avaliacoes('c2', {a: None for a in em_memoria._avaliacoes_do_consumidor('c2')})
+    em_memoria.salvar(tmp_path)
+    carregados = [ModeloFatoresLatentes.de_arrays(em_memoria.para_arrays()), ModeloFatoresLatentes.carregar(tmp_path, mmap_mode='r')]
+
+    atualizacoes = [('c0', {104: 3.0}), ('c1', {105: 4.5}), ('novo', {100: 1.0}), ('c2', {106: 5.0}), ('outro', {107: 2.0})]
+    for modelo in [em_memoria] + carregados:
+        for consumidor, avaliacoes in atualizacoes:
+            modelo.atualizar_avaliacoes(consumidor, avaliacoes)
+    consumidores = ['c0', 'c1', 'c2', 'c5', 'novo', 'outro']
+    associacoes = sorted(df_longo['id_associacao'].unique())
+    for carregado in carregados:
+        for consumidor in consumidores:
+            assert carregado._avaliacoes_do_consumidor(consumidor) == em_memoria._avaliacoes_do_consumidor(consumidor)
+        np.testing.assert_allclose(carregado.scores(consumidores, associacoes), em_memoria.scores(consumidores, associacoes))
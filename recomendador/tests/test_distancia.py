@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from geopy.distance import geodesic
+
+from recomendador.distancia import matriz_distancias_km
+from recomendador.tests.conftest import pontos_df
+
+
+def _geodesicas(latitudes_a, longitudes_a, latitudes_b, longitudes_b):
+    return np.array([[geodesic((lat_a, lon_a), (lat_b, lon_b)).km for lat_b, lon_b in zip(latitudes_b, longitudes_b)]
+                     for lat_a, lon_a in zip(latitudes_a, longitudes_a)])
+
+
+def test_elipsoidal_e_haversine_proximas_da_geodesica():
+    latitudes, longitudes = pontos_df(40)
+    referencia = _geodesicas(latitudes[:20], longitudes[:20], latitudes[20:], longitudes[20:])
+    elipsoidal = matriz_distancias_km(latitudes[:20], longitudes[:20], latitudes[20:], longitudes[20:], metodo='elipsoidal')
+    haversine = matriz_distancias_km(latitudes[:20], longitudes[:20], latitudes[20:], longitudes[20:], metodo='haversine')
+    np.testing.assert_allclose(elipsoidal, referencia, atol=1e-3)
+    np.testing.assert_allclose(haversine, referencia, rtol=6e-3)
+
+
+def test_coordenadas_invalidas_e_pontos_coincidentes():
+    distancias = matriz_distancias_km([-15.8, np.nan], [-47.9, -47.9], [-15.8, -15.7], [-47.9, np.nan])
+    assert distancias[0, 0] == 0.0
+    assert np.isinf(distancias[0, 1]) and np.isinf(distancias[1]).all()
+    with pytest.raises(ValueError):
+        matriz_distancias_km(-15.8, -47.9, [-15.7], [-47.8], metodo='vincenty')
+
+
+def test_raio_padrao_igual_ao_da_geodesica(montar_sistema, dados):
+    """Na borda do raio, o método padrão seleciona as mesmas associações que `geodesic`."""
+    sistema = montar_sistema()
+    assert sistema.distance_method == 'elipsoidal'
+    df_associacoes = dados[0]
+    latitudes, longitudes = pontos_df(30, semente=1)
+    referencia = _geodesicas(latitudes, longitudes, df_associacoes['latitude'], df_associacoes['longitude'])
+    aleatorio = np.random.default_rng(1)
+    for latitude, longitude, geodesicas in zip(latitudes, longitudes, referencia):
+        alvo = aleatorio.integers(len(df_associacoes))
+        for folga_km in (0.005, -0.005):
+            raio = geodesicas[alvo] + folga_km
+            recomendacoes = sistema.recomendar('desconhecido', latitude, longitude,
+                                               {'max_distance_km': raio, 'top_n_results': len(df_associacoes)})
+            esperadas = set(df_associacoes['id'][geodesicas <= raio])
+            assert set(recomendacoes.get('id', [])) == esperadas
@@ -0,0 +1,44 @@
+import numpy as np
+
+from recomendador.distancia import matriz_distancias_km
+from recomendador.indice_espacial import FOLGA_RAIO, IndiceEspacialAssociacoes
+from recomendador.tests.conftest import pontos_df
+
+
+def test_consulta_cobre_o_raio_exato():
+    latitudes, longitudes = pontos_df(500)
+    latitudes[::50] = np.nan  # associações sem coordenadas nunca entram
+    indice = IndiceEspacialAssociacoes(latitudes, longitudes)
+    consultas_lat, consultas_lon = pontos_df(30, semente=1)
+    for latitude, longitude, raio in zip(consultas_lat, consultas_lon, np.linspace(1, 60, 30)):
+        posicoes = indice.consultar_raio(latitude, longitude, raio)
+        distancias = matriz_distancias_km(latitude, longitude, latitudes, longitudes)[0]
+        distancias_esfera = matriz_distancias_km(latitude, longitude, latitudes, longitudes, metodo='haversine')[0]
+        assert np.all(np.diff(posicoes) > 0)
+        # Todas as associações no raio estão entre as candidatas; a folga é medida na esfera do índice
+        assert set(np.flatnonzero(distancias <= raio)) <= set(posicoes.tolist())
+        assert set(np.flatnonzero(distancias_esfera <= raio)) <= set(posicoes.tolist())
+        assert np.all(distancias_esfera[posicoes] <= raio * (1 + FOLGA_RAIO) + 1e-9)
+
+
+def test_raio_infinito_e_coordenadas_invalidas():
+    latitudes, longitudes = pontos_df(20)
+    latitudes[3] = np.nan
+    indice = IndiceEspacialAssociacoes(latitudes, longitudes)
+    assert indice.consultar_raio(-15.8, -47.9, float('inf')).tolist() == [p for p in range(20) if p != 3]
+    assert len(indice.consultar_raio(np.nan, -47.9, 30)) == 0
+    assert len(IndiceEspacialAssociacoes([np.nan], [np.nan]).consultar_raio(-15.8, -47.9, 30)) == 0
+
+
+def test_consulta_varios_pontos_igual_a_uniao():
+    latitudes, longitudes = pontos_df(300)
+    latitudes[7] = np.nan
+    indice = IndiceEspacialAssociacoes(latitudes, longitudes)
+    consultas_lat, consultas_lon = pontos_df(12, semente=2)
+    consultas_lat[4] = np.nan
+    for raio in (0.5, 5, 25, float('inf')):
+        uniao = set()
+        for latitude, longitude in zip(consultas_lat, consultas_lon):
+            uniao.update(indice.consultar_raio(latitude, longitude, raio).tolist())
+        assert indice.consultar_raio_varios(consultas_lat, consultas_lon, raio).tolist() == sorted(uniao)
+    assert len(indice.consultar_raio_varios([np.nan], [np.nan], 10)) == 0
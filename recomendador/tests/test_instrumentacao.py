@@ -0,0 +1,49 @@
+import json
+
+import pandas as pd
+
+from recomendador.instrumentacao import MEDICAO_DESATIVADA, EstatisticasInstrumentacao, Instrumentacao
+
+
+def test_estatisticas_agregam_eventos():
+    estatisticas = EstatisticasInstrumentacao()
+    eventos = []
+    instrumentacao = Instrumentacao([estatisticas, lambda *evento: eventos.append(evento)])
+    for _ in range(3):
+        medicao = instrumentacao.iniciar('op')
+        medicao.contar('itens', 4)
+        medicao.etapa('a')
+        medicao.etapa('b')
+        medicao.finalizar()
+    assert [tipo for tipo, _, _ in eventos[:4]] == ['contador', 'etapa', 'etapa', 'chamada']
+    tempos = estatisticas.tempos()
+    assert tempos.loc[['op', 'op.a', 'op.b'], 'ocorrencias'].tolist() == [3, 3, 3]
+    assert (tempos['maximo_ms'] >= tempos['media_ms']).all()
+    assert estatisticas.contadores['op.itens'] == 12
+    json.dumps(estatisticas.resumo())
+    estatisticas.reiniciar()
+    assert estatisticas.tempos().empty and not estatisticas.contadores
+
+    MEDICAO_DESATIVADA.etapa('a')
+    MEDICAO_DESATIVADA.contar('b', 1)
+    MEDICAO_DESATIVADA.finalizar()
+
+
+def test_recomendar_instrumentado(montar_sistema):
+    sistema = montar_sistema()
+    preferencias = {'desired_products': ['Alface', 'Tomate'], 'nutritional_goal': 'alta_fibra', 'max_distance_km': 40}
+    sem_instrumentacao = sistema.recomendar('c', -15.79, -47.88, preferencias)
+    estatisticas = sistema.ativar_instrumentacao()
+    pd.testing.assert_frame_equal(sistema.recomendar('c', -15.79, -47.88, preferencias), sem_instrumentacao)
+    sistema.recomendar_lote(['c', 'd'], [-15.79, -15.6], [-47.88, -47.7], preferencias)
+    sistema.desativar_instrumentacao()
+    sistema.recomendar('c', -15.79, -47.88, preferencias)
+
+    tempos = estatisticas.tempos()
+    assert tempos.loc['recomendar', 'ocorrencias'] == 1 and tempos.loc['recomendar_lote', 'ocorrencias'] == 1
+    assert {'recomendar.distancia', 'recomendar.ranking', 'recomendar_lote.materializacao'} <= set(tempos.index)
+    contadores = estatisticas.contadores
+    # Cada filtro só remove candidatas
+    assert (contadores['recomendar.candidatas_raio'] >= contadores['recomendar.candidatas_distancia']
+            >= contadores['recomendar.candidatas_organico'] >= contadores['recomendar.candidatas_produtos'])
+    assert contadores['recomendar_lote.consumidores'] == 2
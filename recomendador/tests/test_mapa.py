@@ -0,0 +1,122 @@
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip('folium')
+
+from recomendador.mapa import (
+    MapaBase, SUBSCORES_POPUP, colecao_geojson, criar_mapa_cobertura, criar_mapa_recomendacoes, gerar_mapas_lote
+)
+from recomendador.tests.conftest import pontos_df
+
+
+def _dados_do_html(html):
+    """Objeto passado a `desenhar_recomendacoes` no HTML de um mapa."""
+    return json.JSONDecoder().raw_decode(html, html.rindex('{"usuario"'))[0]
+
+
+def _conferir_recomendacoes(dados, recomendacoes_df, df_associacoes):
+    associacoes = df_associacoes.set_index('id')
+    features = dados['recomendacoes']['features']
+    assert len(features) == len(recomendacoes_df)
+    for feature, (_, linha) in zip(features, recomendacoes_df.iterrows()):
+        associacao = associacoes.loc[linha['id']]
+        assert feature['geometry']['coordinates'] == pytest.approx([associacao['longitude'], associacao['latitude']])
+        propriedades = feature['properties']
+        assert propriedades['nome'] == linha['nome']
+        assert propriedades['score'] == pytest.approx(linha['final_score'], abs=1e-4)
+        assert propriedades['distancia_km'] == pytest.approx(linha['distance_km'], abs=1e-2)
+        assert propriedades['organico'] == bool(associacao['organico_principal'])
+        assert propriedades['subscores'] == pytest.approx([linha[coluna] for coluna, _ in SUBSCORES_POPUP], abs=1e-4)
+
+
+def test_colecao_geojson():
+    colecao = colecao_geojson([-15.1234567, -15.5], [-47.9, -48.0], {'nome': ['a', 'b'], 'x': [1, None]})
+    assert colecao['type'] == 'FeatureCollection'
+    assert [feature['geometry']['coordinates'] for feature in colecao['features']] == [[-47.9, -15.123457], [-48.0, -15.5]]
+    assert [feature['properties'] for feature in colecao['features']] == [{'nome': 'a', 'x': 1}, {'nome': 'b', 'x': None}]
+
+
+def test_mapa_de_um_usuario(montar_sistema, dados):
+    df_associacoes = dados[0]
+    sistema = montar_sistema()
+    preferencias = {'max_distance_km': 40, 'top_n_results': 5}
+    recomendacoes_df = sistema.recomendar('c', -15.79, -47.88, preferencias)
+    assert len(recomendacoes_df)
+
+    html = MapaBase(df_associacoes).renderizar(-15.79, -47.88, recomendacoes_df, preferencias)
+    dados_usuario = _dados_do_html(html)
+    assert dados_usuario['usuario'] == [-15.79, -47.88] and dados_usuario['raio_km'] == 40
+    assert dados_usuario['rotulos_subscores'] == [rotulo for _, rotulo in SUBSCORES_POPUP]
+    _conferir_recomendacoes(dados_usuario, recomendacoes_df, df_associacoes)
+    assert _dados_do_html(MapaBase(df_associacoes).renderizar(
+        -15.79, -47.88, recomendacoes_df.iloc[:0], {'max_distance_km': float('inf')}
+    )) == {**dados_usuario, 'raio_km': None, 'recomendacoes': {'type': 'FeatureCollection', 'features': []}}
+
+    mapa = criar_mapa_recomendacoes(-15.79, -47.88, recomendacoes_df, df_associacoes, preferencias)
+    _conferir_recomendacoes(_dados_do_html(mapa.get_root().render()), recomendacoes_df, df_associacoes)
+    assert criar_mapa_recomendacoes(np.nan, -47.88, recomendacoes_df, df_associacoes, preferencias) is None
+    assert criar_mapa_recomendacoes(-15.79, -47.88, recomendacoes_df.iloc[:0], df_associacoes, preferencias) is None
+
+
+def test_nome_com_fim_de_script_e_associacao_sem_coordenadas(montar_sistema, dados):
+    df_associacoes = dados[0].copy()
+    df_associacoes.loc[0, 'nome'] = 'Associação </script><b>'
+    recomendacoes_df = montar_sistema().recomendar('c', -15.79, -47.88, {'max_distance_km': 200, 'top_n_results': 20})
+    recomendacoes_df.loc[recomendacoes_df['id'] == df_associacoes.loc[0, 'id'], 'nome'] = df_associacoes.loc[0, 'nome']
+    sem_coordenadas = recomendacoes_df['id'].iloc[-1]
+    df_associacoes.loc[df_associacoes['id'] == sem_coordenadas, 'latitude'] = np.nan
+
+    html = MapaBase(df_associacoes).renderizar(-15.79, -47.88, recomendacoes_df, {})
+    assert '</script><b>' not in html[html.rindex('{"usuario"'):]
+    dados_usuario = _dados_do_html(html)
+    _conferir_recomendacoes(dados_usuario, recomendacoes_df.iloc[:-1], df_associacoes)
+    assert 'Associação </script><b>' in [feature['properties']['nome'] for feature in dados_usuario['recomendacoes']['features']]
+
+
+def test_mapas_do_lote_iguais_aos_individuais(montar_sistema, dados, tmp_path):
+    df_associacoes = dados[0]
+    sistema = montar_sistema()
+    mapa_base = MapaBase(df_associacoes)
+    consumidores = ['a', 'b', 'c', 'd']
+    latitudes, longitudes = pontos_df(len(consumidores), semente=6)
+    preferencias = [{'max_distance_km': raio, 'top_n_results': 4} for raio in (5, 20, 40, float('inf'))]
+    lote_df = sistema.recomendar_lote(consumidores, latitudes, longitudes, preferencias)
+
+    mapas = gerar_mapas_lote(mapa_base, lote_df, consumidores, latitudes, longitudes, preferencias)
+    for consumidor, latitude, longitude, preferencia in zip(consumidores, latitudes, longitudes, preferencias):
+        individual = sistema.recomendar(consumidor, latitude, longitude, preferencia)
+        assert mapas[consumidor] == mapa_base.renderizar(latitude, longitude, individual, preferencia)
+
+    caminhos = gerar_mapas_lote(mapa_base, lote_df, consumidores, latitudes, longitudes, preferencias, tmp_path / 'mapas')
+    for consumidor, caminho in caminhos.items():
+        assert open(caminho, encoding='utf-8').read() == mapas[consumidor]
+    with pytest.raises(ValueError):
+        gerar_mapas_lote(mapa_base, lote_df, ['a', 'a', 'b', 'c'], latitudes, longitudes, preferencias)
+    with pytest.raises(ValueError):
+        gerar_mapas_lote(mapa_base, lote_df, consumidores, latitudes[:2], longitudes, preferencias)
+
+
+def test_mapa_de_cobertura(montar_sistema, dados):
+    df_associacoes = dados[0]
+    latitudes, longitudes = pontos_df(20, semente=7)
+    lote_df = montar_sistema().recomendar_lote(
+        [f'c{i}' for i in range(20)], latitudes, longitudes, {'max_distance_km': 15, 'top_n_results': 2}
+    )
+    associacoes = df_associacoes.set_index('id')
+    for coluna_peso in (None, 'final_score'):
+        html = criar_mapa_cobertura(lote_df, df_associacoes, coluna_peso=coluna_peso).get_root().render()
+        inicio = html.index('[', html.index('L.heatLayer('))
+        pontos = json.JSONDecoder().raw_decode(html, inicio)[0]
+        por_associacao = lote_df.groupby('id', sort=False)
+        pesos = por_associacao.size() if coluna_peso is None else por_associacao[coluna_peso].sum()
+        esperados = [
+            [associacoes.loc[id_associacao, 'latitude'], associacoes.loc[id_associacao, 'longitude'], peso / pesos.max()]
+            for id_associacao, peso in pesos.items()
+        ]
+        np.testing.assert_allclose(pontos, esperados, atol=1e-6)
+
+    nao_recomendadas = df_associacoes.loc[~df_associacoes['id'].isin(set(lote_df['id'])), 'nome']
+    assert len(nao_recomendadas)
+    assert all(json.dumps(nome)[1:-1] in html or nome in html for nome in nao_recomendadas)
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from recomendador.perfil_nutricional import (
+    OBJETIVOS_NUTRICIONAIS, colunas_nutrientes, matriz_perfil_nutricional, scores_objetivo, vetor_objetivo
+)
+
+# Objetivo nomeado -> coluna `score_*` equivalente de `carregar_nutrientes`
+COLUNAS_SCORE = {
+    'alta_vitamina_c': 'score_vitamina_c',
+    'alta_fibra': 'score_fibras',
+    'baixa_caloria': 'score_baixa_caloria',
+}
+
+
+def _perfil(df_nutrientes):
+    nutrientes = colunas_nutrientes(df_nutrientes)
+    return (nutrientes, *matriz_perfil_nutricional(df_nutrientes, df_nutrientes.index, nutrientes))
+
+
+def test_objetivos_nomeados_iguais_as_colunas_score(dados):
+    df_nutrientes = dados[1]
+    nutrientes, perfil, tem_valor = _perfil(df_nutrientes)
+    assert 'id' not in nutrientes and not any(coluna.startswith('score_') for coluna in nutrientes)
+    assert set(OBJETIVOS_NUTRICIONAIS) == set(COLUNAS_SCORE)
+
+    for objetivo, coluna in COLUNAS_SCORE.items():
+        scores, mascara = scores_objetivo(perfil, tem_valor, objetivo, nutrientes)
+        esperados = df_nutrientes[coluna].to_numpy(dtype=float)
+        np.testing.assert_array_equal(mascara, ~np.isnan(esperados))
+        np.testing.assert_allclose(scores[mascara], esperados[mascara])
+
+
+def test_objetivo_ponderado_igual_a_media_manual():
+    df_nutrientes = pd.DataFrame(
+        {'id': [1, 2, 3, 4], 'fibra_g': [2.0, 4.0, np.nan, 1.0], 'energia_kcal': [50.0, 100.0, 20.0, 0.0],
+         'proteina_g': [0.0, 0.0, 0.0, 0.0], 'score_fibras': [0.5, 1.0, np.nan, 0.25]},
+        index=['A', 'B', 'C', 'D'],
+    )
+    nutrientes = colunas_nutrientes(df_nutrientes)
+    assert list(nutrientes) == ['fibra_g', 'energia_kcal', 'proteina_g']
+    perfil, tem_valor = matriz_perfil_nutricional(df_nutrientes, ['B', 'A', 'Fora', 'C', 'D'], nutrientes)
+    # Produto fora da tabela e nutriente com máximo 0 ficam sem valor
+    np.testing.assert_array_equal(tem_valor[:, 2], False)
+    np.testing.assert_array_equal(tem_valor[2], False)
+
+    objetivo = {'fibra_g': 3, 'energia_kcal': -1.0}
+    scores, mascara = scores_objetivo(perfil, tem_valor, objetivo, nutrientes)
+    fibra = {'A': 0.5, 'B': 1.0, 'D': 0.25}
+    energia = {'A': 0.5, 'B': 1.0, 'C': 0.2, 'D': 0.0}
+    esperados = [(3 * fibra[p] + 1 * (1 - energia[p])) / 4 for p in ['B', 'A', 'D']]
+    np.testing.assert_array_equal(mascara, [True, True, False, False, True])
+    np.testing.assert_allclose(scores[mascara], esperados)
+
+    coeficientes, constante = vetor_objetivo(objetivo, nutrientes)
+    np.testing.assert_allclose(coeficientes, [0.75, -0.25, 0.0])
+    assert constante == pytest.approx(0.25)
+
+
+def test_objetivos_vazios_e_invalidos():
+    nutrientes = pd.Index(['fibra_g', 'energia_kcal'])
+    for objetivo in (None, '', {}, 'desconhecido', {'fibra_g': 0, 'energia_kcal': 0.0}):
+        assert vetor_objetivo(objetivo, nutrientes) is None
+    with pytest.raises(ValueError, match='desconhecidos'):
+        vetor_objetivo({'vitamina_x': 1}, nutrientes)
+    for peso in ('1', True, None):
+        with pytest.raises(ValueError, match='números'):
+            vetor_objetivo({'fibra_g': peso}, nutrientes)
+
+
+def test_sistema_com_objetivo_ponderado(montar_sistema, dados):
+    df_nutrientes = dados[1]
+    sistema = montar_sistema()
+    objetivo = {'vitamina_c_mg': 2, 'energia_kcal': -1}
+    scores, mascara = sistema._product_goal_scores(objetivo)
+    tabela = df_nutrientes.reindex(sistema.product_vocabulary)
+    esperados = (2 * tabela['score_vitamina_c'] + tabela['score_baixa_caloria']).to_numpy(dtype=float) / 3
+    np.testing.assert_array_equal(mascara, ~np.isnan(esperados))
+    np.testing.assert_allclose(scores[mascara], esperados[mascara])
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from recomendador.produtos import matriz_incidencia, matriz_incidencia_codigos, media_score_produtos, oferece_algum
+
+
+def test_incidencia_das_listas_e_dos_codigos():
+    listas = [['Alface', 'Tomate'], [], ['tomate', 'Banana', 'Alface'], ['Fora']]
+    vocabulario = pd.Index(['Alface', 'Banana', 'Tomate'])
+    esperada = [[True, False, True], [False, False, False], [True, True, False], [False, False, False]]
+    np.testing.assert_array_equal(matriz_incidencia(listas, vocabulario), esperada)
+    np.testing.assert_array_equal(
+        matriz_incidencia([['alface'], ['TOMATE']], ['ALFACE', 'TOMATE'], normalizar=str.upper), [[True, False], [False, True]]
+    )
+
+    dicionario, codigos = np.unique(np.concatenate([np.array(lista, dtype=str) for lista in listas]), return_inverse=True)
+    offsets = np.concatenate([[0], np.cumsum([len(lista) for lista in listas])])
+    np.testing.assert_array_equal(matriz_incidencia_codigos(offsets, codigos, dicionario, vocabulario), esperada)
+
+
+def test_filtro_e_media_iguais_ao_laco(montar_sistema, dados):
+    df_associacoes = dados[0]
+    sistema = montar_sistema()
+    aleatorio = np.random.default_rng(1)
+    valores = aleatorio.random(len(sistema.product_vocabulary))
+    tem_valor = aleatorio.random(len(sistema.product_vocabulary)) < 0.7
+    score_produto = {p: v for p, v, tem in zip(sistema.product_vocabulary, valores, tem_valor) if tem}
+    for _ in range(5):
+        desejados = list(aleatorio.choice(sistema.product_vocabulary, 3, replace=False))
+        posicoes_desejados = sistema._desired_product_positions(desejados + ['Inexistente'])
+        oferta = sistema.association_products
+
+        mascara = oferece_algum(oferta, posicoes_desejados)
+        np.testing.assert_array_equal(mascara, [any(p in desejados for p in lista) for lista in df_associacoes['produtos']])
+
+        esperadas = []
+        for lista in df_associacoes['produtos']:
+            scores = [score_produto[p] for p in lista if p in desejados and p in score_produto]
+            esperadas.append(np.mean(scores) if scores else 0.0)
+        np.testing.assert_allclose(media_score_produtos(oferta, posicoes_desejados, valores, tem_valor), esperadas)
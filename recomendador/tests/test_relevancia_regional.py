@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from recomendador.relevancia_regional import relevancia_por_associacao, tabela_relevancia_regional
+
+
+def score_de_referencia(associacao, desejados, df_producao):
+    """Score regional de uma associação no laço original sobre `df_producao`."""
+    soma, contagem = 0.0, 0
+    for produto in [p for p in associacao['produtos'] if p in desejados]:
+        maior_relevancia = 0
+        for regiao in associacao['regioes']:
+            linhas = df_producao[(df_producao['regiao'] == regiao.upper()) & (df_producao['produto'] == produto)]
+            if not linhas.empty:
+                maior_relevancia = max(maior_relevancia, linhas['relevancia_regiao_percent'].iloc[0])
+        soma += maior_relevancia / 100.0
+        contagem += 1
+    return soma / contagem if contagem else 0.0
+
+
+def test_tabela_mantem_a_primeira_linha_e_ignora_ausentes():
+    df_producao = pd.DataFrame({
+        'regiao': ['A', 'A', 'B', 'B', 'C'],
+        'produto': ['x', 'x', 'y', 'x', 'y'],
+        'relevancia_regiao_percent': [30.0, 90.0, np.nan, -5.0, 50.0],
+    })
+    tabela = tabela_relevancia_regional(df_producao, ['A', 'B'], ['x', 'y', 'z'])
+    np.testing.assert_array_equal(tabela, [[30.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+    incidencia = np.array([[True, True], [False, False]])
+    np.testing.assert_array_equal(relevancia_por_associacao(incidencia, tabela), [[0.3, 0.0, 0.0], [0.0, 0.0, 0.0]])
+
+
+def test_scores_iguais_ao_laco(montar_sistema, dados):
+    df_associacoes, _, df_producao, _, _ = dados
+    sistema = montar_sistema()
+    aleatorio = np.random.default_rng(0)
+    produtos = sorted({p for lista in df_associacoes['produtos'] for p in lista} | {'Inexistente'})
+    posicoes = np.arange(len(df_associacoes))
+    for _ in range(5):
+        desejados = list(aleatorio.choice(produtos, 4, replace=False))
+        scores = sistema._regional_production_scores(posicoes, sistema._desired_product_positions(desejados))
+        esperados = [score_de_referencia(associacao, desejados, df_producao) for _, associacao in df_associacoes.iterrows()]
+        np.testing.assert_allclose(scores, esperados, atol=1e-12)
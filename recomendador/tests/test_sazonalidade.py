@@ -0,0 +1,74 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from recomendador.sazonalidade import (
+    MESES, TODOS_OS_MESES, matriz_meses_associacoes, mes_da_preferencia, meses_na_epoca, oferta_no_mes
+)
+from recomendador.tests.conftest import pontos_df
+
+
+def _ids(recomendacoes_df):
+    return set(recomendacoes_df['id']) if len(recomendacoes_df) else set()
+
+
+def test_mes_da_preferencia():
+    assert mes_da_preferencia(None) is None
+    assert mes_da_preferencia(7) == mes_da_preferencia(np.int64(7)) == 7
+    assert mes_da_preferencia('Jul') == mes_da_preferencia('2025-07-15') == mes_da_preferencia('2025-07') == 7
+    assert mes_da_preferencia(datetime.date(2025, 12, 1)) == mes_da_preferencia(pd.Timestamp('2025-12-31')) == 12
+    for invalido in (0, 13, True, 7.0, 'julho', [7]):
+        with pytest.raises(ValueError):
+            mes_da_preferencia(invalido)
+
+
+def test_mascaras_de_meses_iguais_ao_calendario(dados):
+    df_sazonalidade = dados[4]
+    produtos = list(df_sazonalidade['produto']) + ['Fora do calendário']
+    mascaras = meses_na_epoca(df_sazonalidade, produtos)
+    assert mascaras.dtype == np.uint16 and mascaras[-1] == TODOS_OS_MESES
+    tabela = df_sazonalidade.set_index('produto')
+    for produto, mascara in zip(produtos[:-1], mascaras):
+        for mes, coluna in enumerate(MESES, start=1):
+            assert bool(mascara & (1 << (mes - 1))) == (tabela.loc[produto, coluna] >= 2)
+    assert (meses_na_epoca(None, produtos) == TODOS_OS_MESES).all()
+    np.testing.assert_array_equal(meses_na_epoca(df_sazonalidade, produtos, intensidade_minima=1), TODOS_OS_MESES)
+
+    aleatorio = np.random.default_rng(0)
+    oferta = aleatorio.random((9, len(produtos))) < 0.5
+    meses_associacoes = matriz_meses_associacoes(oferta, mascaras)
+    for mes in range(1, 13):
+        na_epoca = np.array([bool(mascara & (1 << (mes - 1))) for mascara in mascaras])
+        np.testing.assert_array_equal(oferta_no_mes(meses_associacoes, mes), oferta & na_epoca)
+
+
+def test_recomendar_no_mes_ignora_produtos_fora_da_epoca(montar_sistema, dados):
+    df_associacoes, _, _, _, df_sazonalidade = dados
+    sistema = montar_sistema(seasonality_df=df_sazonalidade)
+    sem_sazonalidade = montar_sistema()
+    na_epoca = df_sazonalidade.set_index('produto')
+    latitudes, longitudes = pontos_df(6, semente=5)
+    desejados = ['Alface', 'Tomate', 'Morango']
+    removidas = 0
+    for mes in (1, 7):
+        for latitude, longitude in zip(latitudes, longitudes):
+            preferencias = {'desired_products': desejados, 'max_distance_km': 40, 'top_n_results': 20}
+            resultado = sistema.recomendar('c', latitude, longitude, {**preferencias, 'mes': mes})
+            # Associações que oferecem ao menos um produto desejado na época do mês
+            esperadas = {
+                id_associacao for id_associacao, produtos in zip(df_associacoes['id'], df_associacoes['produtos'])
+                if any(p in desejados and (p not in na_epoca.index or na_epoca.loc[p, MESES[mes - 1]] >= 2)
+                       for p in produtos)
+            }
+            sem_mes = _ids(sem_sazonalidade.recomendar('c', latitude, longitude, preferencias))
+            assert _ids(resultado) == sem_mes & esperadas
+            removidas += len(sem_mes - esperadas)
+    assert removidas > 0
+    # Sem `mes`, o calendário não muda a recomendação
+    preferencias = {'desired_products': desejados, 'max_distance_km': 40}
+    pd.testing.assert_frame_equal(
+        sistema.recomendar('c', latitudes[0], longitudes[0], preferencias),
+        sem_sazonalidade.recomendar('c', latitudes[0], longitudes[0], preferencias)
+    )
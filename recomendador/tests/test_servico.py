@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from recomendador import servico
+from recomendador.servico import ServicoRecomendacao, executar_pedidos, ler_pedido
+
+
+def test_ler_pedido_valida_o_corpo():
+    pedido = ler_pedido({'consumer_id': 'c', 'latitude': -15.8, 'longitude': -47.9, 'desired_products': ['Alface'],
+                         'user_preferences': {'top_n_results': 3}})
+    assert pedido == ('c', -15.8, -47.9, {'top_n_results': 3, 'desired_products': ['Alface']})
+    invalidos = [
+        [], {'latitude': -15.8, 'longitude': -47.9}, {'consumer_id': 'c', 'latitude': float('nan'), 'longitude': 0},
+        {'consumer_id': 'c', 'latitude': True, 'longitude': 0}, {'consumer_id': 'c', 'latitude': 0, 'longitude': 0, 'x': 1},
+        {'consumer_id': 'c', 'latitude': 0, 'longitude': 0, 'top_n_results': -1},
+        {'consumer_id': 'c', 'latitude': 0, 'longitude': 0, 'mes': 13},
+        {'consumer_id': 'c', 'latitude': 0, 'longitude': 0, 'nutritional_goal': {'inexistente': 1}},
+    ]
+    for corpo in invalidos:
+        with pytest.raises(ValueError):
+            ler_pedido(corpo, nutrientes={'fibra_g'})
+
+
+def test_executar_pedidos_separa_por_pedido(montar_sistema):
+    sistema = montar_sistema()
+    sistema.ativar_cache()
+    pedidos = [('a', -15.79, -47.88, {'max_distance_km': 40, 'top_n_results': 3}),
+               ('b', np.nan, -47.88, {}),
+               ('c', -15.6, -47.7, {'desired_products': ['Alface']})]
+    resultados = executar_pedidos(sistema, pedidos)
+    assert [len(registros) for registros in resultados] == [3, 0, len(sistema.recomendar(*pedidos[2]))]
+    assert resultados[0] == sistema.recomendar(*pedidos[0]).to_dict('records')
+    assert executar_pedidos(sistema, pedidos[:1]) == resultados[:1]
+    assert sistema.result_cache.acertos > 0
+
+
+async def _requisicao(porta, dados):
+    leitor, escritor = await asyncio.open_connection('127.0.0.1', porta)
+    escritor.write(dados)
+    await escritor.drain()
+    resposta = await leitor.read()
+    escritor.close()
+    cabecalho, _, corpo = resposta.partition(b'\r\n\r\n')
+    return int(cabecalho.split()[1]), corpo
+
+
+def _post(corpo, content_length=None):
+    corpo = json.dumps(corpo).encode()
+    tamanho = len(corpo) if content_length is None else content_length
+    return f'POST /recomendar HTTP/1.1\r\nContent-Length: {tamanho}\r\nConnection: close\r\n\r\n'.encode() + corpo
+
+
+def test_servico_http(montar_sistema):
+    servico = ServicoRecomendacao(montar_sistema(), trabalhadores=2, janela_lote_ms=5.0)
+
+    async def cenario():
+        servidor = await servico.iniciar(porta=0)
+        porta = servidor.sockets[0].getsockname()[1]
+        try:
+            pedido = {'consumer_id': 'c', 'latitude': -15.79, 'longitude': -47.88, 'max_distance_km': 40}
+            respostas = await asyncio.gather(*[_requisicao(porta, _post(pedido)) for _ in range(5)])
+            assert {status for status, _ in respostas} == {200}
+            assert len({corpo for _, corpo in respostas}) == 1 and json.loads(respostas[0][1])['recomendacoes']
+
+            assert (await _requisicao(porta, _post({'consumer_id': 'c'})))[0] == 400
+            assert (await _requisicao(porta, _post(pedido, content_length='abc')))[0] == 400
+            assert (await _requisicao(porta, _post(pedido, content_length='-5')))[0] == 400
+            assert (await _requisicao(porta, b'GET /recomendar HTTP/1.1\r\nConnection: close\r\n\r\n'))[0] == 405
+            status, metricas = await _requisicao(porta, b'GET /metrics HTTP/1.1\r\nConnection: close\r\n\r\n')
+            assert status == 200 and b'recomendador_requisicoes_total{rota="/recomendar",status="200"} 5' in metricas
+        finally:
+            await servico.encerrar()
+
+    asyncio.run(cenario())
+
+
+def test_main_monta_o_sistema_com_o_calendario(monkeypatch, dados):
+    montados = []
+
+    class ServicoFalso:
+        def __init__(self, sistema, *args):
+            montados.append(sistema)
+
+        def executar(self, host, porta):
+            pass
+
+    monkeypatch.setattr(servico, 'ServicoRecomendacao', ServicoFalso)
+    servico.main(['--cache'])
+    (sistema,) = montados
+    pd.testing.assert_frame_equal(sistema.seasonality_df, dados[4])
+    assert sistema.result_cache is not None
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from recomendador import simulacao
+from recomendador.simulacao import gerar_avaliacoes, ler_blocos_avaliacoes, salvar_blocos_avaliacoes
+
+
+def associacoes_sinteticas(quantidade):
+    return pd.DataFrame({'id': np.arange(1, quantidade + 1), 'avaliacao_media': np.linspace(1.5, 4.8, quantidade)})
+
+
+@pytest.mark.parametrize('num_associacoes', [20, simulacao.MAX_ASSOCIACOES_AMOSTRAGEM_DENSA + 200])
+def test_avaliacoes_validas_e_reprodutiveis(num_associacoes):
+    df_associacoes = associacoes_sinteticas(num_associacoes)
+    blocos = list(gerar_avaliacoes(df_associacoes, num_consumidores=230, semente=5, consumidores_por_bloco=100))
+    assert [bloco['id_consumidor'].nunique() for bloco in blocos] == [100, 100, 30]
+    df = pd.concat(blocos, ignore_index=True)
+    assert list(df.columns) == ['id_consumidor', 'id_associacao', 'avaliacao']
+    assert df['avaliacao'].between(1, 5).all() and df['id_associacao'].isin(df_associacoes['id']).all()
+    por_consumidor = df.groupby('id_consumidor')['id_associacao']
+    assert por_consumidor.size().between(10, 25).all()
+    assert (por_consumidor.nunique() == por_consumidor.size()).all()  # associações distintas
+
+    repetido = pd.concat(gerar_avaliacoes(df_associacoes, num_consumidores=230, semente=5, consumidores_por_bloco=100), ignore_index=True)
+    pd.testing.assert_frame_equal(df, repetido)
+    outro = pd.concat(gerar_avaliacoes(df_associacoes, num_consumidores=230, semente=6, consumidores_por_bloco=100), ignore_index=True)
+    assert not df.equals(outro)
+
+
+def test_poucas_associacoes_e_erro_sem_associacoes():
+    df = pd.concat(gerar_avaliacoes(associacoes_sinteticas(4), num_consumidores=10))
+    assert (df.groupby('id_consumidor').size() == 4).all()
+    with pytest.raises(ValueError):
+        next(gerar_avaliacoes(associacoes_sinteticas(0)))
+
+
+def test_blocos_gravados_e_lidos(tmp_path):
+    blocos = list(gerar_avaliacoes(associacoes_sinteticas(30), num_consumidores=25, consumidores_por_bloco=10))
+    caminhos = salvar_blocos_avaliacoes(blocos, tmp_path, formato='npz')
+    assert len(caminhos) == 3
+    for original, lido in zip(blocos, ler_blocos_avaliacoes(tmp_path)):
+        pd.testing.assert_frame_equal(lido, original, check_dtype=False)
+    with pytest.raises(ValueError):
+        salvar_blocos_avaliacoes(blocos, tmp_path, formato='csv')
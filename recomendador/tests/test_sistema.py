@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from recomendador.sistema import SistemaRecomendacaoDF
+from recomendador.tests.conftest import pontos_df, preferencias_aleatorias
+
+
+def _comparar_lote_com_individuais(sistema, consumidores, latitudes, longitudes, preferencias):
+    lote = sistema.recomendar_lote(consumidores, latitudes, longitudes, preferencias)
+    assert list(lote.columns) == ['consumer_id', 'rank'] + sistema.RECOMMENDATION_COLUMNS
+    inicio = 0
+    for consumidor, latitude, longitude, preferencias_consumidor in zip(consumidores, latitudes, longitudes, preferencias):
+        individual = sistema.recomendar(consumidor, latitude, longitude, preferencias_consumidor)
+        linhas = lote.iloc[inicio:inicio + len(individual)]
+        inicio += len(individual)
+        assert (linhas['consumer_id'] == consumidor).all()
+        assert linhas['rank'].tolist() == list(range(1, len(individual) + 1))
+        if len(individual):
+            pd.testing.assert_frame_equal(
+                linhas[sistema.RECOMMENDATION_COLUMNS].reset_index(drop=True), individual.reset_index(drop=True),
+                check_dtype=False
+            )
+    assert inicio == len(lote)
+
+
+def test_lote_igual_a_recomendar_em_blocos(montar_sistema, dados, monkeypatch):
+    sistema = montar_sistema()
+    # Blocos pequenos: vários blocos por grupo de preferências
+    monkeypatch.setattr(sistema, 'BATCH_BLOCK_SIZE', 7)
+    aleatorio = np.random.default_rng(3)
+    consumidores_conhecidos = dados[3]['id_consumidor'].unique().tolist()
+    quantidade = 120
+    consumidores = [consumidores_conhecidos[i] for i in aleatorio.integers(len(consumidores_conhecidos), size=quantidade - 2)]
+    consumidores += ['novo_1', 'novo_2']
+    latitudes, longitudes = pontos_df(quantidade, semente=3)
+    latitudes[5] = np.nan  # sem coordenadas: nenhuma recomendação
+    compartilhadas = [preferencias_aleatorias(aleatorio) for _ in range(4)] + [{'max_distance_km': float('inf')}]
+    preferencias = [compartilhadas[i] for i in aleatorio.integers(len(compartilhadas), size=quantidade)]
+    _comparar_lote_com_individuais(sistema, consumidores, latitudes, longitudes, preferencias)
+
+
+def test_lote_vazio_e_sem_candidatas(montar_sistema):
+    sistema = montar_sistema()
+    vazio = sistema.recomendar_lote([], [], [], {})
+    assert len(vazio) == 0 and list(vazio.columns) == ['consumer_id', 'rank'] + sistema.RECOMMENDATION_COLUMNS
+    # Longe do DF: nenhuma associação no raio
+    assert len(sistema.recomendar_lote(['a', 'b'], [0.0, 1.0], [0.0, 1.0], {'max_distance_km': 5})) == 0
+
+
+def test_adicionar_avaliacoes_igual_a_reconstruir(montar_sistema, dados):
+    df_associacoes, df_nutrientes, df_producao, df_utility_long, _ = dados
+    associacoes = df_associacoes['id'].tolist()
+    sistema = montar_sistema()
+    sistema.adicionar_avaliacoes('consumidor_novo', {associacoes[0]: 5.0, associacoes[3]: 4.0})
+    sistema.remover_avaliacao('consumidor_novo', associacoes[3])
+    nova_avaliacao = pd.DataFrame({'id_consumidor': ['consumidor_novo'], 'id_associacao': [associacoes[0]], 'avaliacao': [5.0]})
+    reconstruido = SistemaRecomendacaoDF(
+        df_associacoes, df_nutrientes, df_producao, pd.concat([df_utility_long, nova_avaliacao], ignore_index=True)
+    )
+    preferencias = {'max_distance_km': 40, 'top_n_results': 10}
+    for consumidor in ('consumidor_novo', df_utility_long['id_consumidor'].iloc[0]):
+        pd.testing.assert_frame_equal(
+            sistema.recomendar(consumidor, -15.79, -47.88, preferencias),
+            reconstruido.recomendar(consumidor, -15.79, -47.88, preferencias)
+        )
+    with pytest.raises(ValueError):
+        sistema.adicionar_avaliacoes('consumidor_novo', {associacoes[0]: 0})
+
+
+def test_recomendar_filtra_e_ordena_sem_alterar_entradas(montar_sistema, dados):
+    from geopy.distance import geodesic
+
+    df_associacoes = dados[0]
+    copia_entrada = df_associacoes.copy(deep=True)
+    sistema = montar_sistema()
+    aleatorio = np.random.default_rng(8)
+    latitudes, longitudes = pontos_df(10, semente=8)
+    for latitude, longitude in zip(latitudes, longitudes):
+        preferencias = {**preferencias_aleatorias(aleatorio), 'top_n_results': len(df_associacoes)}
+        resultado = sistema.recomendar('c', latitude, longitude, preferencias)
+
+        esperadas = []
+        for _, associacao in df_associacoes.iterrows():
+            distancia = geodesic((latitude, longitude), (associacao['latitude'], associacao['longitude'])).km
+            if (distancia <= preferencias['max_distance_km']
+                    and (not preferencias['only_organic'] or associacao['organico_principal'])
+                    and (not preferencias['desired_products'] or set(associacao['produtos']) & set(preferencias['desired_products']))):
+                esperadas.append(associacao['id'])
+        assert sorted(resultado['id'] if len(resultado) else []) == sorted(esperadas)
+        if len(resultado) == 0:
+            continue
+
+        assert list(resultado.columns) == sistema.RECOMMENDATION_COLUMNS
+        assert resultado['final_score'].is_monotonic_decreasing
+        pesos = sistema.DEFAULT_WEIGHTS
+        np.testing.assert_allclose(resultado['final_score'], (
+            resultado['normalized_distance_score'] * pesos['weight_distance']
+            + resultado['normalized_rating_score'] * pesos['weight_rating']
+            + resultado['normalized_nutritional_score'] * pesos['weight_nutritional_goal']
+            + resultado['normalized_regional_production_score'] * pesos['weight_regional_production_relevance']
+            + resultado['normalized_collaborative_score'] * pesos['weight_collaborative_score']
+        ))
+        # As linhas mantêm o índice das associações de entrada
+        assert (df_associacoes.loc[resultado.index, 'id'].to_numpy() == resultado['id'].to_numpy()).all()
+
+        resultado.loc[resultado.index[0], 'nome'] = 'alterado'
+    pd.testing.assert_frame_equal(df_associacoes, copia_entrada)
+    pd.testing.assert_frame_equal(sistema.associations_df, copia_entrada)
+
+
+def test_lote_com_cache_igual_ao_sem_cache(montar_sistema, dados):
+    sistema = montar_sistema()
+    aleatorio = np.random.default_rng(9)
+    consumidores = dados[3]['id_consumidor'].unique()[:30].tolist()
+    latitudes, longitudes = pontos_df(len(consumidores), semente=9)
+    latitudes[2] = np.nan
+    preferencias = [preferencias_aleatorias(aleatorio) for _ in consumidores]
+    esperado, tamanhos_esperados = sistema.recomendar_lote_com_tamanhos(consumidores, latitudes, longitudes, preferencias)
+
+    cache_resultados = sistema.ativar_cache()
+    # Parte dos pedidos já está no cache, preenchido por recomendar
+    for i in range(0, len(consumidores), 3):
+        sistema.recomendar(consumidores[i], latitudes[i], longitudes[i], preferencias[i])
+    for _ in range(2):
+        lote, tamanhos = sistema.recomendar_lote_com_tamanhos(consumidores, latitudes, longitudes, preferencias)
+        assert tamanhos == tamanhos_esperados
+        pd.testing.assert_frame_equal(lote, esperado, check_dtype=False)
+    assert cache_resultados.acertos == 10 + len(consumidores) - 1  # NaN não passa pelo cache
+
+    # Os resultados guardados pelo lote servem a recomendar como se ela os tivesse calculado
+    for i in range(1, len(consumidores), 3):
+        pd.testing.assert_frame_equal(
+            sistema.recomendar(consumidores[i], latitudes[i], longitudes[i], preferencias[i]),
+            sistema._recommend(consumidores[i], latitudes[i], longitudes[i], preferencias[i])
+        )
@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from recomendador.dados import simular_avaliacoes
+from recomendador.sistema import SistemaRecomendacaoDF
+from recomendador.tabelas import TabelasColunares, converter_csv, ler_tabelas_csv
+
+DIRETORIO_CSV = os.path.join(os.path.dirname(__file__), '..', '..', 'tabelas')
+
+
+@pytest.fixture(scope='module')
+def colunares(tmp_path_factory):
+    diretorio = tmp_path_factory.mktemp('colunar')
+    converter_csv(DIRETORIO_CSV, diretorio)
+    return TabelasColunares.abrir(diretorio)
+
+
+def test_tabelas_decodificadas_iguais_aos_csv(colunares):
+    originais = ler_tabelas_csv(DIRETORIO_CSV)
+    assert sorted(colunares.tabelas()) == sorted(originais)
+    for nome, original in originais.items():
+        if nome == 'associacoes':
+            # O dicionário de regiões fica em maiúsculas, como na produção EMATER
+            original = original.assign(regioes=original['regioes'].map(lambda regioes: [r.upper() for r in regioes]))
+        pd.testing.assert_frame_equal(colunares.dataframe(nome), original, check_dtype=False)
+    offsets, codigos = colunares.coluna('associacoes', 'produtos')
+    assert isinstance(offsets, np.memmap) and codigos.dtype == np.int32
+
+
+def test_sistema_com_tabelas_igual_ao_sem_tabelas(colunares):
+    df_associacoes, df_nutrientes, df_producao = colunares.dataframes_sistema()
+    avaliacoes = simular_avaliacoes(df_associacoes, num_consumidores=60)
+    com_tabelas = SistemaRecomendacaoDF(df_associacoes, df_nutrientes, df_producao, avaliacoes, tables=colunares)
+    sem_tabelas = SistemaRecomendacaoDF(df_associacoes, df_nutrientes, df_producao, avaliacoes)
+    np.testing.assert_array_equal(com_tabelas.association_products, sem_tabelas.association_products)
+    np.testing.assert_array_equal(com_tabelas.regional_relevance, sem_tabelas.regional_relevance)
+    preferencias = {'desired_products': ['Alface', 'Banana', 'Tomate'], 'max_distance_km': 60, 'nutritional_goal': 'alta_fibra'}
+    pd.testing.assert_frame_equal(com_tabelas.recomendar('Consumidor_001', -15.8, -47.9, preferencias),
+                                  sem_tabelas.recomendar('Consumidor_001', -15.8, -47.9, preferencias))
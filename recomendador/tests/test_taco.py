@@ -0,0 +1,44 @@
+import os
+
+import pandas as pd
+
+from recomendador.taco import IndiceTaco, dobrar_acentos, tokens_texto
+
+TABELA_TACO = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'taco', 'taco_tabela1_composicao.csv')
+
+
+def test_normalizacao():
+    assert dobrar_acentos('Limão, Poncã') == 'limao, ponca'
+    assert tokens_texto('Couve-flor, crua') == ['couve', 'flor', 'crua']
+    assert tokens_texto('Doce, de abóbora, em pasta') == ['doce', 'abobora', 'pasta']
+
+
+def test_ordem_das_candidatas():
+    descricoes = pd.Series([
+        'Doce, de abóbora, cremoso',            # 10: alimento não é a primeira palavra
+        'Abóbora, moranga, refogada',           # 11: não crua
+        'Abóbora, menina brasileira, crua',     # 12
+        'Abóbora, moranga, crua',               # 13
+        'Abóbora, pescoço, crua',               # 14
+        'Abóbora, moranga, polpa, crua',        # 15: forma processada
+        'Abobora, crua',                        # 16: sem acento
+    ], index=range(10, 17))
+    indice = IndiceTaco(descricoes)
+    assert [indice.rotulos[p] for p, _ in indice.candidatos('Abóbora Moranga')] == [13, 15, 16, 14, 12]
+    assert [indice.rotulos[p] for p, _ in indice.candidatos('Abóbora Moranga', exigir_crua=False)][:3] == [13, 11, 15]
+    assert indice.rotulos[indice.candidatos('Polpa de abóbora moranga')[0][0]] == 15
+    assert indice.candidatos('') == [] and indice.candidatos('Jiló') == []
+
+
+def test_resolver_com_variedades_da_taco():
+    taco = pd.read_csv(TABELA_TACO)
+    resultado = IndiceTaco(taco['descricao']).resolver(
+        ['Limão Tahiti', 'Abóbora Japonesa', 'Repolho Verde', 'Tangerina Ponkan', 'Couve-flor', 'Mandioquinha', 'Inexistente'],
+        termos_busca={'Mandioquinha': 'Batata baroa'}
+    )
+    assert resultado['descricao_taco'].tolist()[:5] == [
+        'Limão, tahiti, cru', 'Abóbora, cabotian, crua', 'Repolho, branco, cru', 'Tangerina, Poncã, crua', 'Couve-flor, crua'
+    ]
+    assert resultado['descricao_taco'].iloc[5].startswith('Batata, baroa')
+    assert resultado['rotulo_taco'].iloc[-1] is None and resultado['variedade_total'].iloc[0] == 1
+    assert taco.loc[resultado['rotulo_taco'].iloc[0], 'descricao'] == 'Limão, tahiti, cru'